@@ -19,18 +19,49 @@
 """Configuration File Classes."""
 from abc import ABC, abstractmethod
 import os
+import threading
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+from appstore.infrastructure.file.io import IOService
+
 # ------------------------------------------------------------------------------------------------ #
 load_dotenv()
 
 
 # ------------------------------------------------------------------------------------------------ #
 class Config(ABC):
+    """Base class for configurations read from file.
+
+    Each file is read and parsed once per process, and the parsed content is shared by all
+    configuration objects. The mode is read from the environment by each object. Call reload
+    to re-read the files, i.e. after they have been edited.
+    """
+
+    __files = {}  # Maps filepath to its parsed content.
+    __lock = threading.Lock()
+
     def __init__(self) -> None:
         self._mode = os.getenv("MODE")
 
+    @classmethod
+    def read(cls, filepath: str) -> dict:
+        """Returns the parsed content of the configuration file, reading it on first use.
+
+        Args:
+            filepath (str): Path to the configuration file.
+        """
+        with Config.__lock:
+            if filepath not in Config.__files:
+                Config.__files[filepath] = IOService.read(filepath)
+            return Config.__files[filepath]
+
+    @classmethod
+    def reload(cls) -> None:
+        """Discards the parsed files, so that each is read again on next use."""
+        with Config.__lock:
+            Config.__files.clear()
+
     @property
     def mode(self) -> str:
         return self._mode
@@ -26,15 +26,22 @@ from urllib3.util import Retry
 
 from appstore.infrastructure.file.io import IOService
 from appstore.infrastructure.web.adapter import TimeoutHTTPAdapter
-from appstore.infrastructure.web.throttle import LatencyThrottle, AThrottle
+from appstore.infrastructure.web.throttle import (
+    LatencyThrottle,
+    AThrottle,
+    AIMDRate,
+    AIMDThrottle,
+    RateLimiter,
+    AAIMDThrottle,
+)
 from appstore.infrastructure.database.mysql import MySQLDatabase
 from appstore.data.repo.project import AppDataProjectRepo
 from appstore.data.repo.appdata import AppDataRepo
 from appstore.data.repo.review import ReviewRepo
-from appstore.data.repo.rating import RatingRepo
+from appstore.data.repo.rating import RatingRepo, RatingHistoryRepo
 from appstore.data.repo.request import ReviewRequestRepo
 from appstore.data.repo.job import RatingJobRunRepo, ReviewJobRunRepo, JobRepo
-from appstore.infrastructure.web.base import PROXY_SERVERS
+from appstore.data.repo.checkpoint import CheckpointRepo
 from appstore.data.repo.uow import UoW
 from appstore.infrastructure.file.config import FileConfig
 from appstore.infrastructure.file.archive import FileArchiver
@@ -44,6 +51,8 @@ from appstore.infrastructure.database.config import DatabaseConfig
 from appstore.infrastructure.web.headers import BrowserHeader, AppleStoreFrontHeader
 from appstore.infrastructure.web.session import SessionHandler
 from appstore.infrastructure.web.asession import ASessionHandler
+from appstore.infrastructure.web.proxy import ProxyPool
+from appstore.infrastructure.web.cache import ResponseCache
 from appstore.config import ConfigFileDefault, ConfigFileJBook
 
 
@@ -81,6 +90,8 @@ class PersistenceContainer(containers.DeclarativeContainer):
     rating_jobrun_repo = providers.Singleton(RatingJobRunRepo, database=db, config=FileConfig)
     review_jobrun_repo = providers.Singleton(ReviewJobRunRepo, database=db, config=FileConfig)
     review_request_repo = providers.Singleton(ReviewRequestRepo, database=db, config=FileConfig)
+    rating_history_repo = providers.Singleton(RatingHistoryRepo, database=db, config=FileConfig)
+    checkpoint_repo = providers.Singleton(CheckpointRepo, database=db, config=FileConfig)
 
     uow = providers.Singleton(
         UoW,
@@ -93,6 +104,24 @@ class PersistenceContainer(containers.DeclarativeContainer):
         rating_jobrun_repo=RatingJobRunRepo,
         review_jobrun_repo=ReviewJobRunRepo,
         review_request_repo=ReviewRequestRepo,
+        rating_history_repo=RatingHistoryRepo,
+        checkpoint_repo=CheckpointRepo,
+    )
+
+    # The background writer persists on its own connection, apart from the unit of work.
+    writer_uow = providers.Factory(
+        UoW,
+        database=providers.Factory(MySQLDatabase, config=DatabaseConfig),
+        appdata_repo=AppDataRepo,
+        review_repo=ReviewRepo,
+        rating_repo=RatingRepo,
+        appdata_project_repo=AppDataProjectRepo,
+        job_repo=JobRepo,
+        rating_jobrun_repo=RatingJobRunRepo,
+        review_jobrun_repo=ReviewJobRunRepo,
+        review_request_repo=ReviewRequestRepo,
+        rating_history_repo=RatingHistoryRepo,
+        checkpoint_repo=CheckpointRepo,
     )
 
 
@@ -109,53 +138,117 @@ class CloudContainer(containers.DeclarativeContainer):
 class WebSessionContainer(containers.DeclarativeContainer):
     config = providers.Configuration()
 
-    retry = providers.Singleton(
-        Retry,
-        total=config.web.session.retry.total_retries,
-        backoff_factor=config.web.session.retrybackoff_factor,
-        status_forcelist=config.web.session.retry.status_forcelist,
-        allowed_methods=config.web.session.retry.allowed_methods,
-        raise_on_redirect=config.web.session.retry.raise_on_redirect,
-        raise_on_status=config.web.session.retry.raise_on_status,
+    # With the AIMD throttle, overload statuses are not retried by urllib3, even with a
+    # Retry-After header. They are returned to the session handler, which signals the
+    # throttle and honours any Retry-After before retrying.
+    retry = providers.Selector(
+        config.web.session.throttle.type,
+        latency=providers.Singleton(
+            Retry,
+            total=config.web.session.retry.total_retries,
+            backoff_factor=config.web.session.retry.backoff_factor,
+            status_forcelist=config.web.session.retry.status_forcelist,
+            allowed_methods=config.web.session.retry.allowed_methods,
+            raise_on_redirect=config.web.session.retry.raise_on_redirect,
+            raise_on_status=config.web.session.retry.raise_on_status,
+        ),
+        aimd=providers.Singleton(
+            Retry,
+            total=config.web.session.retry.total_retries,
+            backoff_factor=config.web.session.retry.backoff_factor,
+            status_forcelist=config.web.session.retry.aimd.status_forcelist,
+            allowed_methods=config.web.session.retry.allowed_methods,
+            raise_on_redirect=config.web.session.retry.raise_on_redirect,
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        ),
     )
 
     timeout = providers.Resource(
         TimeoutHTTPAdapter,
         timeout=config.web.session.timeout,
         max_retries=retry,
+        pool_connections=config.web.session.pool.connections,
+        pool_maxsize=config.web.session.pool.maxsize,
     )
 
-    throttle = providers.Resource(
-        LatencyThrottle,
-        start_delay=config.web.session.throttle.start_delay,
-        min_delay=config.web.session.throttle.min_delay,
-        max_delay=config.web.session.throttle.max_delay,
-        verbose=config.web.session.throttle.verbose,
+    # The AIMD rate is shared by the synchronous and asynchronous throttles.
+    aimd_rate = providers.Singleton(
+        AIMDRate,
+        rate=config.web.aimd.rate,
+        min_rate=config.web.aimd.min_rate,
+        max_rate=config.web.aimd.max_rate,
+        increase=config.web.aimd.increase,
+        decrease=config.web.aimd.decrease,
+        interval=config.web.aimd.interval,
+        verbose=config.web.aimd.verbose,
     )
-    athrottle = providers.Resource(
-        AThrottle,
-        burnin_period=config.web.async_session.athrottle.burnin_period,
-        burnin_reset=config.web.async_session.athrottle.burnin_reset,
-        burnin_rate=config.web.async_session.athrottle.burnin_rate,
-        burnin_threshold_factor=config.web.async_session.athrottle.burnin_threshold_factor,
-        rolling_window_size=config.web.async_session.athrottle.rolling_window_size,
-        cooldown_factor=config.web.async_session.athrottle.cooldown_factor,
-        cooldown_phase=config.web.async_session.athrottle.cooldown_phase,
-        tolerance=config.web.async_session.athrottle.tolerance,
-        rate=config.web.async_session.athrottle.rate,
-        verbose=config.web.async_session.athrottle.verbose,
+
+    throttle = providers.Selector(
+        config.web.session.throttle.type,
+        latency=providers.Resource(
+            LatencyThrottle,
+            start_delay=config.web.session.throttle.start_delay,
+            min_delay=config.web.session.throttle.min_delay,
+            max_delay=config.web.session.throttle.max_delay,
+            verbose=config.web.session.throttle.verbose,
+        ),
+        aimd=providers.Singleton(AIMDThrottle, rate=aimd_rate),
+    )
+    athrottle = providers.Selector(
+        config.web.async_session.athrottle.type,
+        latency=providers.Resource(
+            AThrottle,
+            burnin_period=config.web.async_session.athrottle.burnin_period,
+            burnin_reset=config.web.async_session.athrottle.burnin_reset,
+            burnin_rate=config.web.async_session.athrottle.burnin_rate,
+            burnin_threshold_factor=config.web.async_session.athrottle.burnin_threshold_factor,
+            rolling_window_size=config.web.async_session.athrottle.rolling_window_size,
+            cooldown_factor=config.web.async_session.athrottle.cooldown_factor,
+            cooldown_phase=config.web.async_session.athrottle.cooldown_phase,
+            tolerance=config.web.async_session.athrottle.tolerance,
+            rate=config.web.async_session.athrottle.rate,
+            verbose=config.web.async_session.athrottle.verbose,
+        ),
+        aimd=providers.Singleton(AAIMDThrottle, rate=aimd_rate),
     )
 
     browser_headers = providers.Resource(BrowserHeader)
 
     storefront_headers = providers.Resource(AppleStoreFrontHeader)
 
+    # The proxy pool and its health statistics are shared by both session handlers.
+    proxies = providers.Singleton(
+        ProxyPool,
+        servers=config.web.proxy.servers,
+        window=config.web.proxy.window,
+        min_requests=config.web.proxy.min_requests,
+        max_error_rate=config.web.proxy.max_error_rate,
+        cooloff=config.web.proxy.cooloff,
+    )
+
+    # The response cache is shared by both session handlers.
+    cache = providers.Singleton(
+        ResponseCache,
+        directory=config.web.cache.directory,
+        ttl=config.web.cache.ttl,
+        max_size=config.web.cache.max_size,
+        enabled=config.web.cache.enabled,
+    )
+
+    # Requests per second across all threads sharing the synchronous session handler.
+    limiter = providers.Singleton(RateLimiter, rate=config.web.session.rate_limit)
+
     session = providers.Resource(
         SessionHandler,
         timeout=timeout,
         throttle=throttle,
         headers=browser_headers,
         session_retries=config.web.session.retries,
+        persistent=config.web.session.pool.persistent,
+        proxies=proxies,
+        cache=cache,
+        limiter=limiter,
     )
 
     asession = providers.Resource(
@@ -165,7 +258,12 @@ class WebSessionContainer(containers.DeclarativeContainer):
         max_concurrency=config.web.async_session.concurrency,
         retries=config.web.async_session.retries,
         timeout=config.web.async_session.timeout,
-        proxies=PROXY_SERVERS,
+        limit=config.web.async_session.connector.limit,
+        limit_per_host=config.web.async_session.connector.limit_per_host,
+        ttl_dns_cache=config.web.async_session.connector.ttl_dns_cache,
+        keepalive_timeout=config.web.async_session.connector.keepalive_timeout,
+        proxies=proxies,
+        cache=cache,
     )
 
 
@@ -20,6 +20,8 @@
 import sys
 import logging
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Union
 
 from dependency_injector.wiring import Provide, inject
@@ -37,6 +39,13 @@ from appstore.container import AppstoreContainer
 class AppDataController:
     """AppStore App Data Controller encapsulates a scraping project.
 
+    Each search term is scraped by its own project. The offset of the next request is saved
+    as a checkpoint with each page persisted, and an interrupted project resumes from it. With
+    max_workers greater than one, the projects of several terms run concurrently in a thread
+    pool. Their requests share the session handler, and thereby its global rate limit, and
+    their writes to the repository are serialized. Duplicates are removed, and the repository
+    is backed up, once all terms have been scraped.
+
     Note: Authorization is required to run controllers.
 
     Args:
@@ -45,6 +54,9 @@ class AppDataController:
         max_pages (int): The maximum number of pages to process.
         verbose (int): Indicates progress reporting verbosity in terms of the number of pages
             between progress reports to the log.
+        backup_to_file (bool): Whether the repository is exported once the terms are scraped.
+        failure_threshold (int): Number of invalid pages after which a project is ended.
+        max_workers (int): Maximum number of terms scraped concurrently. Default = 1
 
     """
 
@@ -58,6 +70,7 @@ class AppDataController:
         verbose: int = 10,
         backup_to_file: bool = True,
         failure_threshold: int = 10,
+        max_workers: int = 1,
     ) -> None:
         self._uow = uow
         self._scraper = scraper
@@ -66,15 +79,10 @@ class AppDataController:
         self._max_results_per_page = max_results_per_page
         self._backup_to_file = backup_to_file
         self._failure_threshold = failure_threshold
+        self._max_workers = max_workers
 
-        # Stats
-        self._page = 0
-        self._pages = 0
-        self._apps = 0
-        self._rate = 0
-        self._started = None
-        self._duration = None
-        self._failures = 0
+        # Serializes access to the unit of work by concurrent projects.
+        self._lock = threading.Lock()
 
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
@@ -87,8 +95,30 @@ class AppDataController:
 
         terms = [terms] if isinstance(terms, str) else terms
 
-        for term in terms:
-            self._execute_project(term)
+        if self._max_workers > 1 and len(terms) > 1:
+            self._execute_projects(terms)
+        else:
+            for term in terms:
+                self._execute_project(term)
+
+        self._finalize()
+
+    def _execute_projects(self, terms: list) -> None:
+        """Executes the projects for the search terms concurrently
+
+        Args:
+            terms (list): Search terms
+        """
+        with ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix=self.__class__.__name__
+        ) as executor:
+            futures = {executor.submit(self._execute_project, term): term for term in terms}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:  # pragma: no cover
+                    msg = f"Exception of type {type(e)} occurred in the project for {futures[future]}.\n{e}"
+                    self._logger.exception(msg)
 
     def _execute_project(self, term: str) -> None:
         """Creates, executes and completes a project for the search term
@@ -96,25 +126,27 @@ class AppDataController:
         Args:
             term (str): Search term
         """
+        started = datetime.datetime.now()
+        failures = 0
 
         project = self._get_or_start_project(term)
         if project is not None:
-            start_page = project.get_start_page()
-            for result in self._scraper(
+            scraper = self._scraper(
                 term=project.term,
-                start_page=start_page,
+                start_page=project.get_start_page(),
                 max_pages=self._max_pages,
                 limit=self._max_results_per_page,
-            ):
+                offset=self._get_checkpoint(term=project.term),
+            )
+            for result in scraper:
                 if result.is_valid():
                     project.update(apps=len(result.content))
-                    self._persist(result, project)
-                    self._update_report_stats(project)
+                    self._persist(result, project, offset=scraper.offset)
+                    self._update_report_stats(project, started)
                 else:
-                    self._failures += 1
+                    failures += 1
 
-                if self._failures >= self._failure_threshold:
-                    self._failures = 0
+                if failures >= self._failure_threshold:
                     break
 
             self._complete_project(project)
@@ -125,12 +157,12 @@ class AppDataController:
         Args:
             term (str): The search term
         """
-        self._started = datetime.datetime.now()
         try:
-            project = self._uow.appdata_project_repo.get_project(
-                controller=self.__class__.__name__,
-                term=term,
-            )
+            with self._lock:
+                project = self._uow.appdata_project_repo.get_project(
+                    controller=self.__class__.__name__,
+                    term=term,
+                )
             msg = f"\nRetrieved Project:\n{str(project)}"
             self._logger.info(msg)
 
@@ -143,8 +175,9 @@ class AppDataController:
                 term=term,
                 page_size=self._max_results_per_page,
             )
-            self._uow.appdata_project_repo.load(project)
-            self._uow.save()
+            with self._lock:
+                self._uow.appdata_project_repo.load(project)
+                self._uow.save()
 
             msg = f"\n\nStarted project for {term.capitalize()} apps."
             self._logger.info(msg)
@@ -160,31 +193,52 @@ class AppDataController:
 
         return project
 
-    def _persist(self, result: AppDataResult, project: AppDataProject) -> None:
-        """Persists the results in the repository, and updates the project."""
-        self._uow.appdata_repo.load(result.content)
-        self._uow.appdata_project_repo.update(data=project)
-        self._uow.save()
+    def _get_checkpoint(self, term: str) -> int:
+        """Returns the offset of the next request for the term, or None if there is none."""
+        try:
+            with self._lock:
+                return self._uow.checkpoint_repo.get_position(
+                    controller=self.__class__.__name__, id=term
+                )
+        except Exception as e:  # pragma: no cover
+            msg = f"Checkpoint for {term} is unavailable. Resuming from the project's app count.\n{e}"
+            self._logger.info(msg)
+            return None
+
+    def _persist(self, result: AppDataResult, project: AppDataProject, offset: int) -> None:
+        """Persists the results, the project and the checkpoint in a single transaction."""
+        with self._lock:
+            self._uow.appdata_repo.load(result.content)
+            self._uow.appdata_project_repo.update(data=project)
+            self._uow.checkpoint_repo.save(
+                controller=self.__class__.__name__,
+                job_id=project.term,
+                id=project.term,
+                position=offset,
+            )
+            self._uow.save()
 
-    def _update_report_stats(self, project: AppDataProject) -> None:
+    def _update_report_stats(self, project: AppDataProject, started: datetime.datetime) -> None:
         """Computes and reports basic performance stats"""
-        seconds = (datetime.datetime.now() - self._started).total_seconds()
-        self._duration = str(datetime.timedelta(seconds=seconds))
-        self._rate = round(project.apps / seconds, 2)
+        seconds = (datetime.datetime.now() - started).total_seconds()
+        duration = str(datetime.timedelta(seconds=seconds))
+        rate = round(project.apps / seconds, 2)
         if project.pages % self._verbose == 0:
-            msg = f"Term: {project.term.capitalize()}\tPages: {project.pages}\tApps: {project.apps}\tElapsed Time: {self._duration}\tRate: {self._rate} apps per second."
+            msg = f"Term: {project.term.capitalize()}\tPages: {project.pages}\tApps: {project.apps}\tElapsed Time: {duration}\tRate: {rate} apps per second."
             self._logger.info(msg)
 
     def _complete_project(self, project: AppDataProject) -> None:
         project.complete()
-        self._uow.appdata_project_repo.update(data=project)
-        self._uow.save()
+        with self._lock:
+            self._uow.appdata_project_repo.update(data=project)
+            self._uow.save()
+        msg = f"Completed AppDataProject: \n{project}\n"
+        self._logger.info(msg)
 
-        # Run dedup
+    def _finalize(self) -> None:
+        """Removes duplicate apps and backs up the repository, once all terms are scraped."""
         self._uow.appdata_repo.dedup()
 
         # If backing up,  save the repo to archive.
         if self._backup_to_file:
-            self._uow.appdata_repo.export()
-        msg = f"Completed AppDataProject: \n{project}\n"
-        self._logger.info(msg)
+            self._uow.appdata_repo.export(format="parquet")
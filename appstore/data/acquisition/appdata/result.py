@@ -21,9 +21,9 @@ from dataclasses import dataclass
 from datetime import datetime
 
 import pandas as pd
-import requests
 
 from appstore.data.acquisition.base import Result
+from appstore.infrastructure.web.response import ParsedResponse
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -35,10 +35,10 @@ class AppDataResult(Result):
     results: int = 0  # The number of records returned
     content: pd.DataFrame = None  # The content of the response.
 
-    def add_response(self, response: requests.Response, page: int, pages: int) -> None:
+    def add_response(self, response: ParsedResponse, page: int, pages: int) -> None:
         """Adds result content to the instance"""
         result_list = []
-        results = response.json()["results"]
+        results = response.content["results"]
         for result in results:
             self.results += 1
             appdata = {}
@@ -39,6 +39,8 @@ class AppDataScraper(Scraper):
     Args:
         session (Handler): Handles the session that performs the request, managing
             retries as defined in the session session object.
+        offset (int): The offset of the first request, from a checkpoint. If None, the
+            first request is for start_page.
 
     """
 
@@ -60,9 +62,11 @@ class AppDataScraper(Scraper):
         start_page: int = 0,
         limit: int = 200,
         max_pages: int = sys.maxsize,
+        offset: int = None,
     ) -> None:
         super().__init__()
         self._page = start_page
+        self._offset = offset
         self._term = term
         self._session = session
         self._limit = limit or self.__limit
@@ -74,6 +78,11 @@ class AppDataScraper(Scraper):
         self._params = None
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
+    @property
+    def offset(self) -> int:
+        """Returns the offset of the next request, from which an interrupted scrape resumes."""
+        return self._params["offset"] + self._results
+
     def __iter__(self) -> AppDataScraper:
         self._setup()
         return self
@@ -86,7 +95,7 @@ class AppDataScraper(Scraper):
             validator = AppDataValidator()
             result = AppDataResult()
 
-            response = self._session.get(url=self._url, params=self._params)
+            response = self._session.fetch(url=self._url, params=self._params)
 
             if validator.is_valid(response=response):
                 self._page += 1
@@ -94,6 +103,8 @@ class AppDataScraper(Scraper):
                 result.add_response(response=response, page=self._page, pages=self._pages)
                 self._results = result.results
             else:
+                # The offset is not advanced past a failed page, so that it is requested again.
+                self._results = 0
                 result.data_errors += validator.data_error
                 result.client_errors += validator.client_error
                 result.server_errors += validator.server_error
@@ -115,7 +126,7 @@ class AppDataScraper(Scraper):
             "lang": self.__lang,
             "explicit": self.__explicit,
             "limit": self._limit,
-            "offset": self._page * self._limit,
+            "offset": self._page * self._limit if self._offset is None else self._offset,
         }
 
     def _set_next_url(self) -> None:
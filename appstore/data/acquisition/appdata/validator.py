@@ -17,9 +17,9 @@
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
 from dataclasses import dataclass
-import requests
 
 from appstore.data.acquisition.base import Validator
+from appstore.infrastructure.web.response import ParsedResponse
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -36,7 +36,7 @@ class AppDataValidator(Validator):
     server_error: bool = False
     """
 
-    def is_valid(self, response: requests.Response) -> bool:
+    def is_valid(self, response: ParsedResponse) -> bool:
         """Validates the response object"""
         self.response = response
         self.valid = True
@@ -56,7 +56,7 @@ class AppDataValidator(Validator):
             self.msg = "No response"
             self._logger.debug(self.msg)
 
-        elif not isinstance(self.response, requests.Response):
+        elif not isinstance(self.response, ParsedResponse):
             self.valid = False
             self.server_error = True
             self.msg = f"Invalid response type: Response is of type {type(self.response)}."
@@ -65,20 +65,21 @@ class AppDataValidator(Validator):
         return self.valid
 
     def _validate_response_content(self) -> bool:  # pragma: no cover
-        try:
-            if not isinstance(self.response.json(), dict):
-                self.data_error = True
-                self.msg = (
-                    f"Invalid Response: Response json is of type {type(self.response.json())}."
-                )
-                self._logger.debug(msg=self.msg)
-                self.valid = False
-            elif len(self.response.json()["results"]) == 0:
-                self.data_error = True
-                self.msg = "Invalid Response: Response json 'results' has zero length."
-                self._logger.debug(msg=self.msg)
-                self.valid = False
-        except requests.JSONDecodeError:
+        content = self.response.content
+        if self.response.error is not None:
+            self.data_error = True
+            self.msg = f"Invalid Response: Response json could not be decoded. {self.response.error}"
+            self._logger.debug(msg=self.msg)
+            self.valid = False
+        elif not isinstance(content, dict):
+            self.data_error = True
+            self.msg = f"Invalid Response: Response json is of type {type(content)}."
+            self._logger.debug(msg=self.msg)
+            self.valid = False
+        elif len(content.get("results", [])) == 0:
+            self.data_error = True
+            self.msg = "Invalid Response: Response json 'results' has zero length."
+            self._logger.debug(msg=self.msg)
             self.valid = False
 
         return self.valid
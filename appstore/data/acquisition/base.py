@@ -18,28 +18,82 @@
 # ================================================================================================ #
 from __future__ import annotations
 import os
+import socket
 from uuid import uuid4
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 from dotenv import load_dotenv
 from abc import ABC, abstractmethod, abstractclassmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterator
 
 import pandas as pd
 
 from appstore.base import Entity
 from appstore.data.repo.uow import UoW
+from appstore.data.repo.writer import BackgroundWriter
+
+
+# ------------------------------------------------------------------------------------------------ #
+class LeaseLostError(Exception):
+    """Raised when a worker no longer holds the lease on the job it is running."""
 
 
 # ------------------------------------------------------------------------------------------------ #
 class Director(ABC):
-    """Iterator serving jobs to the controller."""
+    """Iterator serving jobs to the controller.
+
+    Jobs are claimed with a lease held by this worker, identified by host and process id, so
+    that any number of controllers may run concurrently against the same database. The lease
+    is renewed as the job progresses, and released when the job ends.
 
-    def __init__(self, uow: UoW) -> None:
+    Args:
+        uow (UoW): Unit of Work containing the repositories.
+        lease (int): Number of seconds a claimed job is held without progress before it may
+            be claimed by another worker. Default = 1800
+    """
+
+    def __init__(self, uow: UoW, lease: int = 1800) -> None:
         self._uow = uow
+        self._lease = lease
+        self._worker = f"{socket.gethostname()}:{os.getpid()}"
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
+    @property
+    def worker(self) -> str:
+        return self._worker
+
+    def renew(self, jobrun: JobRun) -> None:
+        """Extends the lease on the job of the job run.
+
+        The renewal is committed immediately, including while the background writer is
+        running, so that a lost lease is known before the job run continues.
+
+        Raises:
+            LeaseLostError: If this worker no longer holds the lease on the job.
+        """
+        renewed = self._uow.job_repo.renew(id=jobrun.jobid, worker=self._worker, lease=self._lease)
+        self._uow.save()
+        if not renewed:
+            msg = f"Worker {self._worker} no longer holds the lease on job {jobrun.jobid}."
+            self._logger.warning(msg)
+            raise LeaseLostError(msg)
+
+    def update_job(self, job: Job) -> None:
+        """Ends a job held by this worker, releasing its lease.
+
+        A job whose lease has passed to another worker is left to that worker.
+
+        Args:
+            job (Job): Job object
+        """
+        ended = self._uow.job_repo.update(job=job, worker=self._worker)
+        self._uow.save()
+        if ended == 0:
+            msg = f"Worker {self._worker} no longer holds the lease on job {job.id}. The job was not updated."
+            self._logger.warning(msg)
+
     @abstractmethod
     def next(self) -> JobRun:  # noqa
         """Sets the next job and returns an instance of this iterator"""
@@ -59,6 +113,25 @@ class Controller(ABC):
         load_dotenv()
         return os.getenv(self.__class__.__name__, False) in (True, "true", "True")
 
+    @contextmanager
+    def _writing(self) -> Iterator[BackgroundWriter]:
+        """Runs the background writer for the duration of the block, if writing behind.
+
+        Subclasses writing behind set the _write_behind, _writer_class, _writer_uow and
+        _flush_interval attributes.
+        """
+        if not self._write_behind:
+            yield None
+            return
+        with self._writer_class(
+            uow=self._writer_uow(), flush_interval=self._flush_interval
+        ) as writer:
+            self._writer = writer
+            try:
+                yield writer
+            finally:
+                self._writer = None
+
     @abstractmethod
     def persist(self, result: Result) -> None:
         """Starts a job run"""
@@ -18,18 +18,29 @@
 # ================================================================================================ #
 """Rating Controller"""
 import logging
+from datetime import datetime, timedelta
+from typing import Callable
 
 import pandas as pd
-from dependency_injector.wiring import Provide, inject
+from dependency_injector.wiring import Provide, Provider, inject
+from sqlalchemy.exc import ProgrammingError
 
 
 from appstore.data.acquisition.rating.scraper import RatingScraper
 from appstore.data.repo.uow import UoW
+from appstore.data.repo.writer import BackgroundWriter
 from appstore.data.acquisition.rating.job import RatingJobRun
 from appstore.data.acquisition.rating.result import RatingResult
-from appstore.data.acquisition.base import Controller
+from appstore.data.acquisition.base import Controller, LeaseLostError
 from appstore.data.acquisition.rating.director import RatingDirector
 from appstore.container import AppstoreContainer
+from appstore.infrastructure.web.asession import ASessionHandler
+
+# ------------------------------------------------------------------------------------------------ #
+# The columns of the appdata repository read by the controller and its scraper.
+APP_COLUMNS = ["id", "name", "category_id", "category"]
+# MySQL error number of a statement on a table that does not exist.
+ER_NO_SUCH_TABLE = 1146
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -41,6 +52,20 @@ class RatingController(Controller):
     Args:
         scraper (ReviewScraper): A scraper object that returns data from the target urls.
         uow (UnitofWork): Unit of Work class containing the appdata repo
+        session_handler (ASessionHandler): Asynchronous session handler shared by the
+            scrapers of all jobs, so that connections are reused for the whole run.
+        streaming (bool): Whether responses are persisted in micro-batches as they complete,
+            rather than batch by batch once every response in the batch has arrived.
+            Default = True
+        flush_interval (float): Maximum number of seconds between micro-batches in
+            streaming mode, and between the batches committed by the background writer.
+            Default = 5
+        writer (BackgroundWriter): The class of the background writer.
+        writer_uow (Callable): Returns a unit of work on a connection of its own, for the
+            background writer.
+        write_behind (bool): Whether ratings and job run metrics are persisted by a background
+            writer while scraping continues, rather than committed after every batch. Refreshes
+            are always persisted immediately. Default = True
         io (IOService): A file IO object.
 
     """
@@ -51,17 +76,30 @@ class RatingController(Controller):
         director: type[RatingDirector] = RatingDirector,
         scraper: type[RatingScraper] = RatingScraper,
         uow: UoW = Provide[AppstoreContainer.data.uow],
+        session_handler: ASessionHandler = Provide[AppstoreContainer.web.asession],
         failure_threshold: int = 10,
         batchsize: int = 100,
         verbose: int = 10,
+        streaming: bool = True,
+        flush_interval: float = 5,
+        writer: type[BackgroundWriter] = BackgroundWriter,
+        writer_uow: Callable[[], UoW] = Provider[AppstoreContainer.data.writer_uow],
+        write_behind: bool = True,
     ) -> None:
         super().__init__()
         self._scraper = scraper
         self._uow = uow
+        self._session_handler = session_handler
         self._failure_threshold = failure_threshold
         self._director = director(uow=uow)
         self._batchsize = batchsize
         self._verbose = verbose
+        self._streaming = streaming
+        self._flush_interval = flush_interval
+        self._writer_class = writer
+        self._writer_uow = writer_uow
+        self._write_behind = write_behind
+        self._writer = None
         self._batch = 0
         self._failures = 0
 
@@ -70,54 +108,113 @@ class RatingController(Controller):
     async def scrape(self) -> None:
         """Entry point for scraping operation"""
         if not super().is_locked():
-            await self._scrape()
+            async with self._session_handler:
+                with self._writing():
+                    await self._scrape()
         else:  # pragma: no cover
             msg = f"Running {self.__class__.__name__} is not authorized at this time."
             self._logger.info(msg)
 
-    async def _scrape(self) -> None:
-        jobrun = self._director.next()
-        while jobrun is not None:
-            jobrun = self.start_jobrun(jobrun=jobrun)
-            apps = self._get_apps(category_id=jobrun.category_id)
-            scraper = self._scraper(apps=apps, batch_size=self._batchsize)
-            # Iterate over results returned from the scraper
-            async for result in scraper.scrape():
+    async def refresh(self, category_ids: list = None, max_age: float = 30) -> None:
+        """Entry point for the refresh of ratings older than max_age days.
+
+        Ratings are written only for apps whose counts changed. Every app refreshed, changed or
+        not, is recorded in the rating history, from which rating velocity is computed.
+
+        Args:
+            category_ids (list): Categories to refresh. If None, the categories of all rating
+                jobs are refreshed.
+            max_age (float): The age in days beyond which ratings are refreshed. Default = 30
+        """
+        if not super().is_locked():
+            async with self._session_handler:
+                await self._refresh(category_ids=category_ids, max_age=max_age)
+        else:  # pragma: no cover
+            msg = f"Running {self.__class__.__name__} is not authorized at this time."
+            self._logger.info(msg)
+
+    async def _refresh(self, category_ids: list = None, max_age: float = 30) -> None:
+        if category_ids is None:
+            jobs = self._uow.job_repo.getall()
+            category_ids = jobs.loc[jobs["controller"] == self.__class__.__name__, "category_id"]
+            category_ids = category_ids.astype(str).unique().tolist()
+
+        for category_id in category_ids:
+            apps = self._get_stale_apps(category_id=category_id, max_age=max_age)
+            if len(apps) == 0:
+                continue
+            scraper = self._scraper(
+                apps=apps, batch_size=self._batchsize, session_handler=self._session_handler
+            )
+            refreshed, changed, failures = 0, 0, 0
+            async for result in scraper.stream(flush_interval=self._flush_interval):
                 if result.is_valid():
-                    self._failures = 0
-                    self._batch += 1
-                    self.persist(result)
-                    jobrun = self.update_jobrun(jobrun=jobrun, result=result)
-                    if self._batch % self._verbose == 0:
-                        jobrun.announce()
+                    failures = 0
+                    refreshed += result.apps
+                    changed += self.persist(result, upsert=True)
                 else:
-                    self._failures += 1
-                    if self._failures > self._failure_threshold:
-                        msg = f"\nFailures exceeded the failure threshold. Ending job run for job {jobrun.jobid}.\n"
+                    failures += 1
+                    if failures > self._failure_threshold:
+                        msg = f"\nFailures exceeded the failure threshold. Ending refresh of category {category_id}.\n"
                         self._logger.exception(msg)
                         break
-            self.end_jobrun(jobrun=jobrun)
+            msg = f"\nRefreshed ratings of {refreshed} apps in category {category_id}. {changed} changed."
+            self._logger.info(msg)
+
+    async def _scrape(self) -> None:
+        jobrun = self._director.next()
+        while jobrun is not None:
+            try:
+                jobrun = self.start_jobrun(jobrun=jobrun)
+                apps = self._get_apps(category_id=jobrun.category_id)
+                scraper = self._scraper(
+                    apps=apps, batch_size=self._batchsize, session_handler=self._session_handler
+                )
+                if self._streaming:
+                    results = scraper.stream(flush_interval=self._flush_interval)
+                else:
+                    results = scraper.scrape()
+                # Iterate over results returned from the scraper
+                async for result in results:
+                    if result.is_valid():
+                        self._failures = 0
+                        self._batch += 1
+                        self.persist(result)
+                        jobrun = self.update_jobrun(jobrun=jobrun, result=result)
+                        if self._batch % self._verbose == 0:
+                            jobrun.announce()
+                    else:
+                        self._failures += 1
+                        if self._failures > self._failure_threshold:
+                            msg = f"\nFailures exceeded the failure threshold. Ending job run for job {jobrun.jobid}.\n"
+                            self._logger.exception(msg)
+                            break
+                self.end_jobrun(jobrun=jobrun)
+            except LeaseLostError as e:
+                msg = f"\nEnding job run for job {jobrun.jobid} without ending the job. {e}\n"
+                self._logger.warning(msg)
             jobrun = self._director.next()
 
     def _get_apps(self, category_id: int) -> pd.DataFrame:
-        """Obtains apps for the category, removing any apps for which ratings exist."""
+        """Obtains apps for the category for which no ratings exist."""
 
-        # Obtain all apps for the category from the appdata repo.
-        apps = self._uow.appdata_repo.get_by_category(category_id=category_id)
-        msg = f"\n\nA total of {len(apps)} apps in category {category_id}."
-
-        # Obtain apps which we have already processed
+        # Obtain the apps without ratings in a single anti-join on the rating ids.
         try:
-            ratings = self._uow.rating_repo.get_by_category(category_id=category_id)
-            apps_processed = ratings["id"].values
-            msg += f"\nThere are {len(apps_processed)} apps in category {category_id} which have already been processed."
-        except Exception as e:  # pragma: no cover
-            apps_processed = []
-            msg += f"\nException of type {type(e)} encountered. Assuming no apps processed for category."
-
-        # Remove apps already processed
-        if len(apps_processed) > 0:
-            apps = apps.loc[~apps["id"].isin(apps_processed)]
+            apps = self._uow.appdata_repo.get_unprocessed(
+                category_id=category_id, tablename="rating", columns=APP_COLUMNS
+            )
+            msg = f"\n\nThere are {len(apps)} apps in category {category_id} which have not been processed."
+        except ProgrammingError as e:  # pragma: no cover
+            # The rating table does not exist until the first ratings are persisted. Any other
+            # error, i.e. a schema that has not been migrated, is raised.
+            if (getattr(e.orig, "args", None) or (None,))[0] != ER_NO_SUCH_TABLE:
+                raise
+            msg = f"The rating table does not exist. All apps in category {category_id} are processed.\n{e}"
+            self._logger.warning(msg)
+            apps = self._uow.appdata_repo.get_by_category(
+                category_id=category_id, columns=APP_COLUMNS
+            )
+            msg = f"\n\nA total of {len(apps)} apps in category {category_id}."
 
         if len(apps) > 0:
             msg += f"\nApps remaining: {len(apps)}"
@@ -127,21 +224,51 @@ class RatingController(Controller):
             self._logger.info(msg)
         return apps
 
-    def persist(self, result: RatingResult) -> None:
-        """Persists the result from the scraping operation.
+    def _get_stale_apps(self, category_id: str, max_age: float) -> pd.DataFrame:
+        """Obtains apps for the category whose ratings are missing or older than max_age days."""
+        apps = self._uow.appdata_repo.get_by_category(
+            category_id=category_id, columns=APP_COLUMNS
+        )
+        extracted = self._uow.rating_repo.get_extracted(category_id=category_id)
+        extracted = apps["id"].astype(str).map(extracted)
+        cutoff = datetime.now() - timedelta(days=max_age)
+        apps = apps.loc[(extracted.isna() | (extracted < cutoff)).to_numpy()]
+
+        msg = f"\n\n{len(apps)} apps in category {category_id} have ratings older than {max_age} days."
+        self._logger.info(msg)
+        return apps
+
+    def persist(self, result: RatingResult, upsert: bool = False) -> int:
+        """Persists the result from the scraping operation, and returns the rows written.
+
+        Each row of the result is also recorded in the rating history, including those an
+        upsert leaves unchanged, so that velocity is measured to the latest observation.
+        While the background writer is running, rows other than upserts are queued on it.
 
         Args:
             result (RatingResult): The result from the scraping operation
+            upsert (bool): Whether only the ratings of new apps and apps whose counts changed
+                are written. Default = False
         """
         data = result.get_result()
+        if len(data) > 0 and self._writer is not None and not upsert:
+            self._writer.load(repo="rating_repo", data=data)
+            self._writer.load(repo="rating_history_repo", data=data)
+            return len(data)
         if len(data) > 0:
             try:
-                self._uow.rating_repo.load(data=data)
+                self._uow.rating_history_repo.load(data=data)
+                if upsert:
+                    data = self._uow.rating_repo.upsert(data=data)
+                else:
+                    self._uow.rating_repo.load(data=data)
                 self._uow.save()
+                return len(data)
             except Exception as e:  # pragma: no cover
                 msg = f"{type(e)} exception occurred in persist. Rolling back. \n{e}"
                 self._logger.exception(msg)
                 self._uow.rollback()
+        return 0
 
     def start_jobrun(self, jobrun: RatingJobRun) -> RatingJobRun:
         """Starts a jobrun and adds a jobrun to the repository.
@@ -163,7 +290,7 @@ class RatingController(Controller):
 
         """
         jobrun.add_result(result=result)
-        self._director.update_jobrun(jobrun=jobrun)
+        self._director.update_jobrun(jobrun=jobrun, writer=self._writer)
         return jobrun
 
     def end_jobrun(self, jobrun: RatingJobRun) -> None:
@@ -173,11 +300,14 @@ class RatingController(Controller):
             result (ReviewResult) -> Parsed result object
         """
         jobrun.end()
+        # Commit everything queued on the background writer before the job is ended.
+        if self._writer is not None:
+            self._writer.flush()
         # Get the associated job and end it.
         job = self._uow.job_repo.get(id=jobrun.jobid)
         job.end(completed=jobrun.completed)
-        # Persist the jobrun and the job.
-        self._director.update_job(job=job)
+        # Persist the jobrun, renewing the lease, then end the job while it is still held.
         self._director.update_jobrun(jobrun=jobrun)
-        # Archive the ratings
-        self._uow.rating_repo.export()
+        self._director.update_job(job=job)
+        # Archive the ratings, streamed to parquet one chunk at a time.
+        self._uow.rating_repo.export(format="parquet")
@@ -17,18 +17,19 @@
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
 from __future__ import annotations
+from copy import copy
 from appstore.data.acquisition.base import Director
-from appstore.data.acquisition.base import Job
 from appstore.data.acquisition.rating.job import RatingJobRun
 from appstore.data.repo.uow import UoW
+from appstore.data.repo.writer import BackgroundWriter
 
 
 # ------------------------------------------------------------------------------------------------ #
 class RatingDirector(Director):
     """Iterator serving jobs to the controller."""
 
-    def __init__(self, uow: UoW) -> None:
-        super().__init__(uow=uow)
+    def __init__(self, uow: UoW, lease: int = 1800) -> None:
+        super().__init__(uow=uow, lease=lease)
 
     def add_jobrun(self, jobrun: RatingJobRun) -> None:
         """Adds a job run to the repository.
@@ -39,28 +40,30 @@ class RatingDirector(Director):
         self._uow.rating_jobrun_repo.add(jobrun=jobrun)
         self._uow.save()
 
-    def update_jobrun(self, jobrun: RatingJobRun) -> None:
+    def update_jobrun(self, jobrun: RatingJobRun, writer: BackgroundWriter = None) -> None:
         """Updates the jobrun repository
 
         Args:
             jobrun (RatingJobRun): Job run object
-        """
-        self._uow.rating_jobrun_repo.update(jobrun=jobrun)
-        self._uow.save()
-
-    def update_job(self, job: Job) -> None:
-        """Updates a job in the repository.
+            writer (BackgroundWriter): If provided, the update is queued on the writer rather
+                than committed immediately. The lease is renewed immediately in either case.
 
-        Args:
-            job (Job): Job object
+        Raises:
+            LeaseLostError: If this worker no longer holds the lease on the job.
         """
-        self._uow.job_repo.update(job=job)
-        self._uow.save()
+        if writer is not None:
+            writer.update(repo="rating_jobrun_repo", key=jobrun.id, jobrun=copy(jobrun))
+        else:
+            self._uow.rating_jobrun_repo.update(jobrun=jobrun)
+            self._uow.save()
+        self.renew(jobrun=jobrun)
 
     def next(self) -> RatingJobRun:
         """Sets the next job and returns an instance of this iterator"""
 
-        job = self._uow.job_repo.next(controller="RatingController")
+        job = self._uow.job_repo.claim(
+            controller="RatingController", worker=self._worker, lease=self._lease
+        )
         if job is not None:
             return RatingJobRun.from_job(job=job)
         else:
@@ -19,17 +19,35 @@
 """Defines the Result Object for Rating Responses"""
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List
+from datetime import datetime
+
+import pandas as pd
 
 from appstore.data.acquisition.base import Result
 from appstore.infrastructure.web.utils import getsize
 
+COLUMNS = [
+    "id",
+    "name",
+    "category_id",
+    "category",
+    "rating",
+    "reviews",
+    "ratings",
+    "onestar",
+    "twostar",
+    "threestar",
+    "fourstar",
+    "fivestar",
+]
+
 
 # ------------------------------------------------------------------------------------------------ #
 @dataclass
 class RatingResult(Result):
     """Encapsulates the review results. Inherits the following from Result base class:
-    content: list[dict] = field(default_factory=list)
+    content: dict = Column lists of the rating data, keyed by column name.
+    extracted: datetime = The time at which the ratings were extracted.
     size: int = 0
     data_errors: int = 0
     client_errors: int = 0
@@ -38,32 +56,42 @@ class RatingResult(Result):
 
     """
 
-    content: List = field(default_factory=lambda: [])
+    content: dict = field(default_factory=lambda: {column: [] for column in COLUMNS})
 
     apps: int = 0
+    extracted: datetime = field(default_factory=lambda: datetime.now().replace(microsecond=0))
 
     def add_response(self, response: dict, batch: dict) -> None:
         """Adds a rating to the result content
 
         Args:
-           review (dict): Dictionary containing review data
+           response (dict): Dictionary containing rating data
+           batch (dict): The apps in the batch, keyed by app id.
         """
 
         self.size += getsize(response)
         self.apps += 1
 
-        id = str(response["adamId"])  # noqa
-        page = {}
-        page["id"] = [app["id"] for app in batch if app["id"] == id][0]
-        page["name"] = [app["name"] for app in batch if app["id"] == id][0]
-        page["category_id"] = [str(app["category_id"]) for app in batch if app["id"] == id][0]
-        page["category"] = [app["category"] for app in batch if app["id"] == id][0]
-        page["rating"] = response["ratingAverage"]
-        page["reviews"] = response["totalNumberOfReviews"]
-        page["ratings"] = response["ratingCount"]
-        page["onestar"] = response["ratingCountList"][0]
-        page["twostar"] = response["ratingCountList"][1]
-        page["threestar"] = response["ratingCountList"][2]
-        page["fourstar"] = response["ratingCountList"][3]
-        page["fivestar"] = response["ratingCountList"][4]
-        self.content.append(page)
+        app = batch[str(response["adamId"])]
+        histogram = response["ratingCountList"]
+        self.content["id"].append(app["id"])
+        self.content["name"].append(app["name"])
+        self.content["category_id"].append(str(app["category_id"]))
+        self.content["category"].append(app["category"])
+        self.content["rating"].append(response["ratingAverage"])
+        self.content["reviews"].append(response["totalNumberOfReviews"])
+        self.content["ratings"].append(response["ratingCount"])
+        self.content["onestar"].append(histogram[0])
+        self.content["twostar"].append(histogram[1])
+        self.content["threestar"].append(histogram[2])
+        self.content["fourstar"].append(histogram[3])
+        self.content["fivestar"].append(histogram[4])
+
+    def get_result(self) -> pd.DataFrame:
+        """Returns the result in DataFrame format"""
+        df = pd.DataFrame(self.content, columns=COLUMNS)
+        df["extracted"] = pd.Timestamp(self.extracted)
+        return df
+
+    def is_valid(self) -> bool:
+        return self.apps > 0
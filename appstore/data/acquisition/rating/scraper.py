@@ -19,6 +19,7 @@
 """AppStore Review Request Module"""
 from __future__ import annotations
 import logging
+import time
 
 import pandas as pd
 from dependency_injector.wiring import Provide, inject
@@ -94,20 +95,58 @@ class RatingScraper:
                     result.server_errors += validator.server_error
             yield result
 
+    async def stream(self, flush_interval: float = 5) -> RatingResult:
+        """Parses responses as they complete and yields results in micro-batches.
+
+        Unlike scrape, no batch waits on its slowest response. A result is yielded once it
+        holds batch_size responses, or once flush_interval seconds have elapsed since the
+        last result was yielded, whichever comes first.
+
+        Args:
+            flush_interval (float): Maximum number of seconds between results. Default = 5
+
+        Return: RatingResult object, containing projects and results in DataFrame format.
+        """
+        apps = [app for batch in self._batches for app in batch["apps"].values()]
+        urls = [url for batch in self._batches for url in batch["urls"]]
+
+        result = RatingResult()
+        responses = 0
+        flushed = time.monotonic()
+
+        async for idx, response in self._session_handler.stream(urls=urls, headers=self._header):
+            validator = RatingValidator()
+            if validator.is_valid(response=response):
+                result.add_response(response=response, batch={str(apps[idx]["id"]): apps[idx]})
+            else:
+                result.data_errors += validator.data_error
+                result.client_errors += validator.client_error
+                result.server_errors += validator.server_error
+            responses += 1
+
+            if responses >= self._batch_size or time.monotonic() - flushed >= flush_interval:
+                yield result
+                result = RatingResult()
+                responses = 0
+                flushed = time.monotonic()
+
+        if responses > 0:
+            yield result
+
     def _create_batches(self) -> list:
-        """Creates batches of URLs from a list of app ids"""
+        """Creates batches of URLs from a list of app ids, with the batch apps keyed by id."""
         batches = []
-        apps = []
+        apps = {}
         urls = []
         app_dict = self._apps.to_dict(orient="index")
 
         for idx, app in enumerate(app_dict.values(), start=1):
             url = f"https://itunes.apple.com/us/customer-reviews/id{app['id']}?displayable-kind=11"
-            apps.append(app)
+            apps[str(app["id"])] = app
             urls.append(url)
             if idx % self._batch_size == 0 or idx == len(app_dict):
                 batch = {"apps": apps, "urls": urls}
                 batches.append(batch)
-                apps = []
+                apps = {}
                 urls = []
         return batches
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/data/acquisition/review/ascraper.py                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 09:12:40 am                                                #
+# Modified   : Sunday October 18th 2026 09:12:40 am                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+"""AppStore Asynchronous Review Scraper Module"""
+from __future__ import annotations
+import sys
+import logging
+from typing import AsyncGenerator, Iterator
+
+import asyncio
+from dependency_injector.wiring import Provide, inject
+
+from appstore.infrastructure.web.headers import STOREFRONT
+from appstore.data.acquisition.base import App
+from appstore.data.acquisition.review.validator import AReviewValidator
+from appstore.data.acquisition.review.result import ReviewResult
+from appstore.data.acquisition.review.scraper import plan_pages
+from appstore.container import AppstoreContainer
+from appstore.infrastructure.web.asession import ASessionHandler
+
+
+# ------------------------------------------------------------------------------------------------ #
+class AReviewScraper:
+    """Asynchronous App Store Review Scraper
+
+    Paginates the reviews of many apps concurrently. Each app's pages are requested in order,
+    with the request for page N+1 in flight while page N is parsed. An app's pagination ends
+    at the first page holding fewer than max_results_per_page reviews. If the number of
+    reviews of an app is known, its pages are planned from it, and no page is prefetched past
+    the planned last page. As the count may be stale, pages past the plan are still requested
+    while pages are full, each once the page before it has been received.
+
+    Args:
+        apps (list): List of (App, start) tuples, where start is the index of the first review
+            to request for the app.
+        session_handler (ASessionHandler): Object that manages the asynchronous HTTP requests
+        max_results_per_page (int): The number of reviews requested per page. Default = 400
+        max_pages (int): Maximum number of pages requested per app.
+        max_concurrency (int): Maximum number of apps paginated concurrently. Default = 20
+        queue_size (int): Maximum number of parsed results awaiting the consumer, before
+            pagination is suspended. Default = 100
+        reviews (dict): Maps app id to the number of reviews of the app, from the rating
+            repository, from which prefetching is planned.
+    """
+
+    @inject
+    def __init__(
+        self,
+        apps: list,
+        session_handler: ASessionHandler = Provide[AppstoreContainer.web.asession],
+        max_results_per_page: int = 400,
+        max_pages: int = sys.maxsize,
+        max_concurrency: int = 20,
+        queue_size: int = 100,
+        reviews: dict = None,
+    ) -> None:
+        self._apps = apps
+        self._session_handler = session_handler
+        self._max_results_per_page = max_results_per_page
+        self._max_pages = max_pages
+        self._max_concurrency = max_concurrency
+        self._queue_size = queue_size
+        self._reviews = reviews or {}
+
+        self._header = STOREFRONT["headers"]
+
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+    async def scrape(self) -> AsyncGenerator[ReviewResult, None]:
+        """Yields a ReviewResult for each page, in the order in which pages are parsed."""
+        queue = asyncio.Queue(maxsize=self._queue_size)
+        apps = iter(self._apps)
+        producer = asyncio.ensure_future(self._produce(apps=apps, queue=queue))
+        try:
+            while True:
+                result = await queue.get()
+                if result is None:
+                    break
+                yield result
+        finally:
+            producer.cancel()
+
+    async def _produce(self, apps: Iterator, queue: asyncio.Queue) -> None:
+        """Runs the workers to exhaustion, then signals the end of the results."""
+        try:
+            workers = [self._work(apps=apps, queue=queue) for _ in range(self._max_concurrency)]
+            await asyncio.gather(*workers)
+        finally:
+            await queue.put(None)
+
+    async def _work(self, apps: Iterator, queue: asyncio.Queue) -> None:
+        """Paginates apps taken from the shared iterator, one at a time."""
+        for app, start in apps:
+            try:
+                await self._paginate(app=app, start=start, queue=queue)
+            except Exception as e:  # pragma: no cover
+                msg = f"Exception of type {type(e)} occurred while scraping app {app.id}.\n{e}"
+                self._logger.exception(msg)
+
+    async def _paginate(self, app: App, start: int, queue: asyncio.Queue) -> None:
+        """Requests the pages of reviews for an app, prefetching the next page."""
+        planned = sys.maxsize
+        if app.id in self._reviews:
+            planned = plan_pages(
+                reviews=self._reviews[app.id],
+                start=start,
+                max_results_per_page=self._max_results_per_page,
+            )
+
+        page = 0
+        index = start
+        request = asyncio.ensure_future(self._fetch(app=app, index=index))
+        try:
+            while request is not None:
+                content = await request
+                page += 1
+                more = self._is_full(content=content) and page < self._max_pages
+
+                # Prefetch the next page while this page is parsed, unless this page is the last
+                # planned. Only a short page ends pagination.
+                if more and page < planned:
+                    request = asyncio.ensure_future(
+                        self._fetch(app=app, index=index + self._max_results_per_page)
+                    )
+                else:
+                    request = None
+
+                result = self._parse(content=content, app=app, index=index)
+                if result is not None:
+                    await queue.put(result)
+                index += self._max_results_per_page
+
+                # Past the plan, the next page is requested once this page has proven full.
+                if more and request is None:
+                    request = asyncio.ensure_future(self._fetch(app=app, index=index))
+        finally:
+            if request is not None:
+                request.cancel()
+
+    async def _fetch(self, app: App, index: int) -> dict:
+        url = f"https://itunes.apple.com/WebObjects/MZStore.woa/wa/userReviewsRow?id={app.id}&displayable-kind=11&startIndex={index}&endIndex={index + self._max_results_per_page}&sort=1"
+        return await self._session_handler.fetch(url=url, headers=self._header)
+
+    def _is_full(self, content: dict) -> bool:
+        """Returns True if the page holds a full page of reviews."""
+        try:
+            return len(content["userReviewList"]) >= self._max_results_per_page
+        except Exception:
+            return False
+
+    def _parse(self, content: dict, app: App, index: int) -> ReviewResult:
+        """Parses the page, returning None for the empty page that follows the last review."""
+        validator = AReviewValidator()
+        result = ReviewResult()
+
+        if validator.is_valid(response=content):
+            if len(content["userReviewList"]) == 0:
+                return None
+            result.add_content(content=content, app=app, index=index)
+        else:
+            result.app = app
+            result.index = index
+            result.data_errors += validator.data_error
+            result.client_errors += validator.client_error
+            result.server_errors += validator.server_error
+        return result
@@ -19,18 +19,28 @@
 """AppStore Scraper Controller Module"""
 import sys
 import logging
+from copy import copy
+from typing import Callable
 
 import pandas as pd
-from dependency_injector.wiring import inject, Provide
+from dependency_injector.wiring import inject, Provide, Provider
 
 from appstore.data.acquisition.review.scraper import ReviewScraper
+from appstore.data.acquisition.review.ascraper import AReviewScraper
 from appstore.data.acquisition.review.director import ReviewDirector
 from appstore.data.acquisition.review.job import ReviewJobRun
 from appstore.data.acquisition.review.result import ReviewResult
 from appstore.data.acquisition.review.request import ReviewRequest
+from appstore.data.acquisition.review.scheduler import ReviewScheduler
 from appstore.data.repo.uow import UoW
-from appstore.data.acquisition.base import Controller, App
+from appstore.data.repo.writer import BackgroundWriter
+from appstore.data.acquisition.base import Controller, App, LeaseLostError
 from appstore.container import AppstoreContainer
+from appstore.infrastructure.web.asession import ASessionHandler
+
+# ------------------------------------------------------------------------------------------------ #
+# The columns of the appdata repository read by the controller and its scheduler.
+APP_COLUMNS = ["id", "name", "category_id", "category", "ratings"]
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -39,9 +49,14 @@ from appstore.container import AppstoreContainer
 class ReviewController(Controller):
     """Controls the App Store Review scraping process
 
+    The index of each app's next page is saved as a checkpoint in the same transaction as the
+    reviews of the page before it, and an interrupted job resumes each app from its checkpoint.
+
     Args:
         scraper (ReviewScraper): A scraper object that returns data from the target urls.
+        ascraper (AReviewScraper): The asynchronous scraper used by ascrape.
         uow (UoW): Unit of Work containing the repositories.
+        session_handler (ASessionHandler): Asynchronous session handler used by ascrape.
         min_ratings (int): Since we want apps with a minimum number of reviews, and we don't
             have the number of reviews per app, we are using the number of ratings as
             a proxy for the number of reviews. The default is 20
@@ -49,6 +64,23 @@ class ReviewController(Controller):
         max_results_per_page (int): This is the limit of results to return on each request.
         verbose (int): An indicator of the level of progress reporting verbosity. Progress
             will be printed to stdout for each 'verbose' number of apps processed.
+        max_concurrency (int): Maximum number of apps paginated concurrently by ascrape.
+        predict_pages (bool): Whether the asynchronous scraper plans the pages it prefetches
+            per app from the number of reviews in the rating repository. Default = True
+        prioritize (bool): Whether jobs, and the apps within each job, are scraped in
+            descending order of expected new reviews per request. If False, jobs are
+            served at random and apps in repository order. Default = True
+        refresh_sort (int): The review ordering requested by refresh, which must be newest
+            first. The store's orderings are 1 (most helpful), 2 (most favorable), 3 (most
+            critical) and 4 (most recent). Default = 4
+        writer (BackgroundWriter): The class of the background writer.
+        writer_uow (Callable): Returns a unit of work on a connection of its own, for the
+            background writer.
+        write_behind (bool): Whether reviews, request logs and job run metrics are persisted
+            by a background writer while scraping continues, rather than committed after
+            every page. Default = True
+        flush_interval (float): Maximum number of seconds between the batches committed by
+            the background writer. Default = 5
 
     """
 
@@ -57,22 +89,50 @@ class ReviewController(Controller):
         self,
         director: type[ReviewDirector] = ReviewDirector,
         scraper: type[ReviewScraper] = ReviewScraper,
+        ascraper: type[AReviewScraper] = AReviewScraper,
+        scheduler: type[ReviewScheduler] = ReviewScheduler,
         uow: UoW = Provide[AppstoreContainer.data.uow],
+        session_handler: ASessionHandler = Provide[AppstoreContainer.web.asession],
         failure_threshold: int = 10,
         min_ratings: int = 20,
         max_pages: int = sys.maxsize,
         max_results_per_page: int = 400,
         verbose: int = 10,
+        max_concurrency: int = 20,
+        predict_pages: bool = True,
+        prioritize: bool = True,
+        refresh_sort: int = 4,
+        writer: type[BackgroundWriter] = BackgroundWriter,
+        writer_uow: Callable[[], UoW] = Provider[AppstoreContainer.data.writer_uow],
+        write_behind: bool = True,
+        flush_interval: float = 5,
     ) -> None:
         super().__init__()
         self._scraper = scraper
-        self._director = director(uow=uow)
+        self._ascraper = ascraper
+        self._scheduler = (
+            scheduler(
+                uow=uow, max_results_per_page=max_results_per_page, min_ratings=min_ratings
+            )
+            if prioritize
+            else None
+        )
+        self._director = director(uow=uow, scheduler=self._scheduler)
         self._uow = uow
+        self._session_handler = session_handler
         self._failure_threshold = failure_threshold
         self._min_ratings = min_ratings
         self._max_pages = max_pages
         self._max_results_per_page = max_results_per_page
         self._verbose = verbose
+        self._max_concurrency = max_concurrency
+        self._predict_pages = predict_pages
+        self._refresh_sort = refresh_sort
+        self._writer_class = writer
+        self._writer_uow = writer_uow
+        self._write_behind = write_behind
+        self._flush_interval = flush_interval
+        self._writer = None
         self._failures = 0
 
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
@@ -80,7 +140,8 @@ class ReviewController(Controller):
     def scrape(self) -> None:
         """Entry point for scraping operation"""
         if not super().is_locked():
-            self._scrape()
+            with self._writing():
+                self._scrape()
         else:  # pragma: no cover
             msg = f"Running {self.__class__.__name__} is not authorized at this time."
             self._logger.info(msg)
@@ -89,39 +150,176 @@ class ReviewController(Controller):
         """Driver for scraping operation."""
         jobrun = self._director.next()
         while jobrun is not None:
-            jobrun = self.start_jobrun(jobrun=jobrun)
-            apps = self._get_apps(category_id=jobrun.category_id)
+            try:
+                jobrun = self.start_jobrun(jobrun=jobrun)
+                reviews = self._get_review_counts(category_id=jobrun.category_id)
+                apps = self._get_apps(category_id=jobrun.category_id, reviews=reviews)
+                checkpoints = self._get_checkpoints(jobrun=jobrun)
+
+                if len(apps) > 0:
+                    for _, row in apps.iterrows():
+                        app = self._get_app(row=row)
+                        request = self._get_or_create_request_log(app=app)
+                        jobrun.apps += 1
+
+                        for result in self._scraper(
+                            app=app,
+                            max_pages=self._max_pages,
+                            max_results_per_page=self._max_results_per_page,
+                            start=checkpoints.get(str(app.id), request.last_index),
+                        ):
+                            if result.is_valid():
+                                self._failures = 0
+                                self.persist(result, checkpoint=self._checkpoint(jobrun, result))
+                                jobrun = self.update_jobrun(jobrun=jobrun, result=result)
+                                request.last_index = result.index
+                                request.advance(*result.newest)
+                            else:
+                                self._failures += 1
+
+                            if self._failures >= self._failure_threshold:  # pragma: no cover
+                                self._failures = 0
+                                break
+
+                        self._update_request_log(request=request)
+
+                        if jobrun.apps % self._verbose == 0:
+                            jobrun.announce()
+
+                self.end_jobrun(jobrun=jobrun)
+            except LeaseLostError as e:
+                msg = f"\nEnding job run for job {jobrun.jobid} without ending the job. {e}\n"
+                self._logger.warning(msg)
+            jobrun = self._director.next()
 
-            if len(apps) > 0:
-                for app_idx, row in apps.iterrows():
-                    app = self._get_app(row=row)
-                    request = self._get_or_create_request_log(app=app)
-                    jobrun.apps += 1
-
-                    for result in self._scraper(
-                        app=app,
-                        max_pages=self._max_pages,
-                        max_results_per_page=self._max_results_per_page,
-                        start=request.last_index,
-                    ):
-                        if result.is_valid():
-                            self._failures = 0
-                            self.persist(result)
-                            jobrun = self.update_jobrun(jobrun=jobrun, result=result)
-                            request.last_index = result.index
-                        else:
-                            self._failures += 1
+    def refresh(self, category_ids: list = None) -> None:
+        """Entry point for the incremental refresh of the reviews of apps already scraped.
 
-                        if self._failures >= self._failure_threshold:  # pragma: no cover
-                            self._failures = 0
+        Each app's reviews are requested newest first, until its high-water mark is reached,
+        so that an app with no new reviews costs a single request.
+
+        Args:
+            category_ids (list): Categories to refresh. If None, all categories are refreshed.
+        """
+        if not super().is_locked():
+            with self._writing():
+                self._refresh(category_ids=category_ids)
+        else:  # pragma: no cover
+            msg = f"Running {self.__class__.__name__} is not authorized at this time."
+            self._logger.info(msg)
+
+    def _refresh(self, category_ids: list = None) -> None:
+        """Driver for the incremental refresh operation."""
+        requests = self._uow.review_request_repo.getall()
+        requests = requests.loc[requests["last_review_date"].notna()]
+        if category_ids is not None:
+            requests = requests.loc[requests["category_id"].isin([str(c) for c in category_ids])]
+
+        for category_id, group in requests.groupby("category_id", observed=True):
+            apps = self._uow.appdata_repo.get_by_category(
+                category_id=category_id, columns=APP_COLUMNS
+            )
+            apps = apps.loc[apps["id"].astype(str).isin(group["id"].astype(str))]
+            refreshed = 0
+            new_reviews = 0
+
+            for _, row in apps.iterrows():
+                app = self._get_app(row=row)
+                request = self._get_request_log(app=app)
+                failures = 0
+
+                for result in self._scraper(
+                    app=app,
+                    max_pages=self._max_pages,
+                    max_results_per_page=self._max_results_per_page,
+                    since=request.last_review_date,
+                    since_id=request.last_review_id,
+                    sort=self._refresh_sort,
+                ):
+                    if result.is_valid():
+                        self.persist(result)
+                        new_reviews += result.reviews
+                        request.advance(*result.newest)
+                    else:
+                        failures += 1
+                        if failures >= self._failure_threshold:  # pragma: no cover
                             break
 
-                    self._uow.review_request_repo.update(request=request)
+                self._update_request_log(request=request)
+                refreshed += 1
+                if refreshed % self._verbose == 0:
+                    msg = f"Category {category_id}: Refreshed {refreshed} of {len(apps)} apps. New reviews: {new_reviews}."
+                    self._logger.info(msg)
 
-                    if app_idx % self._verbose == 0:
-                        jobrun.announce()
+            msg = f"\nRefreshed {refreshed} apps in category {category_id}, adding {new_reviews} reviews."
+            self._logger.info(msg)
+
+    async def ascrape(self) -> None:
+        """Entry point for the asynchronous scraping operation"""
+        if not super().is_locked():
+            async with self._session_handler:
+                with self._writing():
+                    await self._ascrape()
+        else:  # pragma: no cover
+            msg = f"Running {self.__class__.__name__} is not authorized at this time."
+            self._logger.info(msg)
 
-            self.end_jobrun(jobrun=jobrun)
+    async def _ascrape(self) -> None:
+        """Driver for the asynchronous scraping operation, paginating apps concurrently."""
+        jobrun = self._director.next()
+        while jobrun is not None:
+            try:
+                jobrun = self.start_jobrun(jobrun=jobrun)
+                reviews = self._get_review_counts(category_id=jobrun.category_id)
+                apps = self._get_apps(category_id=jobrun.category_id, reviews=reviews)
+                checkpoints = self._get_checkpoints(jobrun=jobrun)
+
+                requests = {}
+                for _, row in apps.iterrows():
+                    app = self._get_app(row=row)
+                    requests[app.id] = (app, self._get_or_create_request_log(app=app))
+
+                scraper = self._ascraper(
+                    apps=[
+                        (app, checkpoints.get(str(app.id), request.last_index))
+                        for app, request in requests.values()
+                    ],
+                    session_handler=self._session_handler,
+                    max_pages=self._max_pages,
+                    max_results_per_page=self._max_results_per_page,
+                    max_concurrency=self._max_concurrency,
+                    reviews=reviews,
+                )
+
+                # Results arrive by page, interleaved across apps, and in order within each app.
+                apps_seen = set()
+                async for result in scraper.scrape():
+                    if result.app.id not in apps_seen:
+                        apps_seen.add(result.app.id)
+                        jobrun.apps += 1
+                        if jobrun.apps % self._verbose == 0:
+                            jobrun.announce()
+
+                    if result.is_valid():
+                        self._failures = 0
+                        self.persist(result, checkpoint=self._checkpoint(jobrun, result))
+                        jobrun = self.update_jobrun(jobrun=jobrun, result=result)
+                        request = requests[result.app.id][1]
+                        request.last_index = result.index
+                        request.advance(*result.newest)
+                        self._update_request_log(request=request)
+                    else:
+                        self._failures += 1
+                        if self._failures > self._failure_threshold:
+                            msg = f"\nFailures exceeded the failure threshold. Ending job run for job {jobrun.jobid}.\n"
+                            self._logger.exception(msg)
+                            self._failures = 0
+                            break
+
+                self.end_jobrun(jobrun=jobrun)
+            except LeaseLostError as e:
+                msg = f"\nEnding job run for job {jobrun.jobid} without ending the job. {e}\n"
+                self._logger.warning(msg)
             jobrun = self._director.next()
 
     def _get_app(self, row: pd.Series) -> App:
@@ -132,9 +330,11 @@ class ReviewController(Controller):
             category=row["category"],
         )
 
-    def _get_apps(self, category_id: int) -> pd.DataFrame:
+    def _get_apps(self, category_id: int, reviews: dict = None) -> pd.DataFrame:
         # Obtain all apps for the category from the repository.
-        apps = self._uow.appdata_repo.get_by_category(category_id=category_id)
+        apps = self._uow.appdata_repo.get_by_category(
+            category_id=category_id, columns=APP_COLUMNS
+        )
         msg = f"\n\nA total of {len(apps)} apps in category {category_id}."
 
         # Filter the apps that have greater than 'min_ratings'
@@ -144,11 +344,54 @@ class ReviewController(Controller):
         if len(apps) > 0:
             msg += f"\nApps to process: {len(apps)}"
             self._logger.info(msg)
+            apps = self._prioritize(apps=apps, reviews=reviews)
         else:  # pragma: no cover
             msg += f"No apps meet minimum ratings criteria in category {category_id}"
             self._logger.info(msg)
         return apps
 
+    def _prioritize(self, apps: pd.DataFrame, reviews: dict = None) -> pd.DataFrame:
+        """Orders the apps by expected yield, if prioritizing."""
+        if self._scheduler is None:
+            return apps
+        try:
+            return self._scheduler.prioritize(apps=apps, reviews=reviews or None)
+        except Exception as e:  # pragma: no cover
+            msg = f"Apps could not be prioritized. Processing in repository order.\n{e}"
+            self._logger.info(msg)
+            return apps
+
+    def _get_review_counts(self, category_id: int) -> dict:
+        """Returns the number of reviews per app from the rating repository, if predicting pages."""
+        if not self._predict_pages:
+            return {}
+        try:
+            return self._uow.rating_repo.get_review_counts(category_id=category_id)
+        except Exception as e:  # pragma: no cover
+            msg = f"Review counts for category {category_id} are unavailable. Pages will not be planned.\n{e}"
+            self._logger.info(msg)
+            return {}
+
+    def _get_checkpoints(self, jobrun: ReviewJobRun) -> dict:
+        """Returns the index of the next page of each app of the job, keyed by app id."""
+        try:
+            return self._uow.checkpoint_repo.get_positions(
+                controller=self.__class__.__name__, job_id=jobrun.jobid
+            )
+        except Exception as e:  # pragma: no cover
+            msg = f"Checkpoints for job {jobrun.jobid} are unavailable. Resuming from the request logs.\n{e}"
+            self._logger.info(msg)
+            return {}
+
+    def _checkpoint(self, jobrun: ReviewJobRun, result: ReviewResult) -> dict:
+        """Returns the checkpoint following the result: the index of the app's next page."""
+        return {
+            "controller": self.__class__.__name__,
+            "job_id": jobrun.jobid,
+            "id": result.app.id,
+            "position": result.index + self._max_results_per_page,
+        }
+
     def _get_or_create_request_log(self, app: App) -> ReviewRequest:
         """Gets existing or creates new review request object."""
         try:
@@ -165,16 +408,35 @@ class ReviewController(Controller):
 
     def _create_request_log(self, app: App) -> ReviewRequest:
         request = ReviewRequest(id=app.id, category_id=app.category_id)
-        self._uow.review_request_repo.add(request=request)
+        if self._writer is not None:
+            self._writer.update(
+                repo="review_request_repo", key=request.id, method="add", request=copy(request)
+            )
+        else:
+            self._uow.review_request_repo.add(request=request)
         return request
 
-    def persist(self, result: ReviewResult) -> None:
+    def _update_request_log(self, request: ReviewRequest) -> None:
+        """Updates the request log, or queues the update on the background writer."""
+        if self._writer is not None:
+            self._writer.update(repo="review_request_repo", key=request.id, request=copy(request))
+        else:
+            self._uow.review_request_repo.update(request=request)
+
+    def persist(self, result: ReviewResult, checkpoint: dict = None) -> None:
         """Persists results to Database
 
         Args:
             result (ReviewResult) -> Parsed result object
+            checkpoint (dict): The checkpoint following the result, saved in the same
+                transaction as its reviews.
         """
+        if self._writer is not None:
+            self._writer.load(repo="review_repo", data=result.get_result(), checkpoint=checkpoint)
+            return
         self._uow.review_repo.load(data=result.get_result())
+        if checkpoint is not None:
+            self._uow.checkpoint_repo.save(**checkpoint)
         self._uow.save()
 
     def start_jobrun(self, jobrun: ReviewJobRun) -> ReviewJobRun:
@@ -197,7 +459,7 @@ class ReviewController(Controller):
 
         """
         jobrun.add_result(result=result)
-        self._director.update_jobrun(jobrun=jobrun)
+        self._director.update_jobrun(jobrun=jobrun, writer=self._writer)
         return jobrun
 
     def end_jobrun(self, jobrun: ReviewJobRun) -> None:
@@ -207,11 +469,14 @@ class ReviewController(Controller):
             result (ReviewResult) -> Parsed result object
         """
         jobrun.end()
+        # Commit everything queued on the background writer before the job is ended.
+        if self._writer is not None:
+            self._writer.flush()
         # Get the associated job and end it.
         job = self._uow.job_repo.get(id=jobrun.jobid)
         job.end(completed=jobrun.completed)
-        # Persist the jobrun and the job.
-        self._director.update_job(job=job)
+        # Persist the jobrun, renewing the lease, then end the job while it is still held.
         self._director.update_jobrun(jobrun=jobrun)
-        # Archive the ratings
-        self._uow.rating_repo.export()
+        self._director.update_job(job=job)
+        # Archive the ratings, streamed to parquet one chunk at a time.
+        self._uow.rating_repo.export(format="parquet")
@@ -17,18 +17,31 @@
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
 from __future__ import annotations
+from copy import copy
+import logging
+
 from appstore.data.acquisition.base import Director
-from appstore.data.acquisition.base import Job
 from appstore.data.acquisition.review.job import ReviewJobRun
+from appstore.data.acquisition.review.scheduler import ReviewScheduler
 from appstore.data.repo.uow import UoW
+from appstore.data.repo.writer import BackgroundWriter
 
 
 # ------------------------------------------------------------------------------------------------ #
 class ReviewDirector(Director):
-    """Iterator serving jobs to the controller."""
+    """Iterator serving jobs to the controller.
+
+    Args:
+        uow (UoW): Unit of Work containing the repositories.
+        scheduler (ReviewScheduler): Serves the job of the category with the highest
+            expected yield first. If None, jobs are served in random order.
+        lease (int): Number of seconds a claimed job is held without progress. Default = 1800
+    """
 
-    def __init__(self, uow: UoW) -> None:
-        super().__init__(uow=uow)
+    def __init__(self, uow: UoW, scheduler: ReviewScheduler = None, lease: int = 1800) -> None:
+        super().__init__(uow=uow, lease=lease)
+        self._scheduler = scheduler
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
     def add_jobrun(self, jobrun: ReviewJobRun) -> None:
         """Adds a job run to the repository.
@@ -39,29 +52,45 @@ class ReviewDirector(Director):
         self._uow.review_jobrun_repo.add(jobrun=jobrun)
         self._uow.save()
 
-    def update_jobrun(self, jobrun: ReviewJobRun) -> None:
+    def update_jobrun(self, jobrun: ReviewJobRun, writer: BackgroundWriter = None) -> None:
         """Updates the jobrun repository
 
         Args:
             jobrun (ReviewJobRun): Job run object
-        """
-        self._uow.review_jobrun_repo.update(jobrun=jobrun)
-        self._uow.save()
-
-    def update_job(self, job: Job) -> None:
-        """Updates a job in the repository.
+            writer (BackgroundWriter): If provided, the update is queued on the writer rather
+                than committed immediately. The lease is renewed immediately in either case.
 
-        Args:
-            job (Job): Job object
+        Raises:
+            LeaseLostError: If this worker no longer holds the lease on the job.
         """
-        self._uow.job_repo.update(job=job)
-        self._uow.save()
+        if writer is not None:
+            writer.update(repo="review_jobrun_repo", key=jobrun.id, jobrun=copy(jobrun))
+        else:
+            self._uow.review_jobrun_repo.update(jobrun=jobrun)
+            self._uow.save()
+        self.renew(jobrun=jobrun)
 
     def next(self) -> ReviewJobRun:
         """Sets the next job and returns an instance of this iterator"""
 
-        job = self._uow.job_repo.next(controller="ReviewController")
+        job = self._uow.job_repo.claim(
+            controller="ReviewController",
+            worker=self._worker,
+            lease=self._lease,
+            priorities=self._priorities(),
+        )
         if job is not None:
             return ReviewJobRun.from_job(job=job)
         else:
             return None
+
+    def _priorities(self) -> dict:
+        """Returns the priority of each category's job, or None if jobs are served at random."""
+        if self._scheduler is None:
+            return None
+        try:
+            return self._scheduler.priorities()
+        except Exception as e:  # pragma: no cover
+            msg = f"Job priorities are unavailable. Serving jobs at random.\n{e}"
+            self._logger.info(msg)
+            return None
@@ -18,6 +18,7 @@
 # ================================================================================================ #
 from __future__ import annotations
 from dataclasses import dataclass
+from datetime import datetime
 
 import pandas as pd
 from appstore.base import Entity
@@ -26,11 +27,41 @@ from appstore.base import Entity
 # ------------------------------------------------------------------------------------------------ #
 @dataclass
 class ReviewRequest(Entity):
+    """Tracks the review requests of an app.
+
+    The last index is the offset from which the backfill of the app's reviews resumes. The
+    last review date and id form the high-water mark: the newest review stored, at which an
+    incremental refresh of the app stops.
+    """
+
     id: str = None
     category_id: str = None
     last_index: int = 0
+    last_review_date: datetime = None
+    last_review_id: str = None
 
     @classmethod
     def from_df(cls, df: pd.DataFrame) -> ReviewRequest:
         df = df.loc[0]
-        return cls(id=df["id"], category_id=df["category_id"], last_index=df["last_index"])
+        last_review_date = df.get("last_review_date")
+        last_review_id = df.get("last_review_id")
+        return cls(
+            id=df["id"],
+            category_id=df["category_id"],
+            last_index=df["last_index"],
+            last_review_date=None if pd.isna(last_review_date) else last_review_date,
+            last_review_id=None if pd.isna(last_review_id) else last_review_id,
+        )
+
+    def advance(self, date: datetime, id: str) -> None:  # noqa
+        """Raises the high-water mark to the review, if it is newer than the mark.
+
+        Args:
+            date (datetime): The date of the newest review in a result.
+            id (str): The id of that review.
+        """
+        if date is None or pd.isna(date):
+            return
+        if self.last_review_date is None or date > self.last_review_date:
+            self.last_review_date = date
+            self.last_review_id = id
@@ -18,21 +18,49 @@
 # ================================================================================================ #
 """Defines the Result Object for Rating Responses"""
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import dataclass
+from datetime import datetime
 
-import requests
 import pandas as pd
 
 from appstore.data.acquisition.base import Result, App
+from appstore.data.repo.review import DATAFRAME_DTYPES
 from appstore.infrastructure.web.utils import getsize
+from appstore.infrastructure.web.response import ParsedResponse
+
+# Maps the columns of the result to the keys of the reviews in the response.
+FIELDS = {
+    "id": "userReviewId",
+    "author": "name",
+    "rating": "rating",
+    "title": "title",
+    "content": "body",
+    "vote_sum": "voteSum",
+    "vote_count": "voteCount",
+    "date": "date",
+}
+COLUMNS = [
+    "id",
+    "app_id",
+    "app_name",
+    "category_id",
+    "category",
+    "author",
+    "rating",
+    "title",
+    "content",
+    "vote_sum",
+    "vote_count",
+    "date",
+]
 
 
 # ------------------------------------------------------------------------------------------------ #
 @dataclass
 class ReviewResult(Result):
     """Encapsulates the review results. Inherits the following from Result base class:
-    content (list): List of dictionaries containing the response content
+    content (pd.DataFrame): The reviews, typed per the review repository DATAFRAME_DTYPES,
+        with dates in UTC
     size: (int): Total size of response in bytes
     requests (int): Number of requests. This will be one for syncronous requests,
         async requests vary.
@@ -41,48 +69,99 @@ class ReviewResult(Result):
 
     """
 
-    content: List = field(default_factory=lambda: [])
+    content: pd.DataFrame = None
     app: App = None
     reviews: int = 0
     index: int = 0
 
-    def add_response(self, response: requests.Response, app: App, index: int = 0) -> None:
+    def add_response(self, response: ParsedResponse, app: App, index: int = 0) -> None:
         """Adds a response to the instance
 
         Args:
-           response (requests.Response): HTTP Response
+           response (ParsedResponse): HTTP Response with its body decoded
+        """
+        self.size += response.size
+        self._add_reviews(content=response.content, app=app, index=index)
+
+    def add_content(self, content: dict, app: App, index: int = 0) -> None:
+        """Adds the decoded content of an asynchronous response to the instance
+
+        Args:
+           content (dict): The decoded json content of the HTTP response
+           app (App): The app to which the reviews belong
+           index (int): The start index of the page of reviews
+        """
+        self.size += getsize(response=content)
+        self._add_reviews(content=content, app=app, index=index)
+
+    @property
+    def newest(self) -> tuple:
+        """Returns the date and id of the newest review in the result, or (None, None)."""
+        if self.content is None or len(self.content) == 0:
+            return None, None
+        row = self.content.loc[self.content["date"].idxmax()]
+        return row["date"], row["id"]
+
+    def drop_known(self, since: datetime, since_id: str = None) -> bool:
+        """Drops reviews at or before a high-water mark, and returns True if any were found.
+
+        Reviews dated at the mark are kept unless they are the review at the mark, as other
+        reviews may share its date.
+
+        Args:
+            since (datetime): The date of the newest review already stored.
+            since_id (str): The id of the newest review already stored.
         """
+        if self.content is None or len(self.content) == 0:
+            return False
+        dates = self.content["date"]
+        known = (dates < since) | ((dates == since) & (self.content["id"] == since_id))
+        if known.any():
+            self.content = self.content.loc[~known].reset_index(drop=True)
+            self.reviews = len(self.content)
+        return bool((dates <= since).any())
+
+    def get_result(self) -> pd.DataFrame:
+        """Returns the result in DataFrame format"""
+        return self.content if self.content is not None else pd.DataFrame(columns=COLUMNS)
+
+    def _add_reviews(self, content: dict, app: App, index: int) -> None:
         self.app = app
         self.index = index
 
-        self.size += getsize(response=response)
-
-        for data in response.json()["userReviewList"]:
-            review = self._parse_review(data=data)
-            if review is not None:
-                self.content.append(review)
-
-    def _parse_review(self, data: dict) -> dict:
-        try:
-            review = {}
-            review["id"] = data["userReviewId"]
-            review["app_id"] = self.app.id
-            review["app_name"] = self.app.name
-            review["category_id"] = self.app.category_id
-            review["category"] = self.app.category
-            review["author"] = data["name"]
-            review["rating"] = data["rating"]
-            review["title"] = data["title"]
-            review["content"] = data["body"]
-            review["vote_sum"] = data["voteSum"]
-            review["vote_count"] = data["voteCount"]
-            review["date"] = pd.to_datetime(data["date"])
-
-        except Exception as e:
-            msg = f"Exception of type {type(e)} occurred.\n{e}"
-            self._logger.debug(msg)
-            self.data_errors += 1
-            return None
+        df = self._parse_reviews(reviews=content["userReviewList"])
+        self.reviews += len(df)
+        if self.content is None:
+            self.content = df
         else:
-            self.reviews += 1
-            return review
+            self.content = pd.concat([self.content, df], ignore_index=True)
+
+    def _parse_reviews(self, reviews: list) -> pd.DataFrame:
+        """Parses the reviews into typed columns in a single pass over the page."""
+        columns = {column: [] for column in FIELDS}
+        for data in reviews:
+            try:
+                row = [data[key] for key in FIELDS.values()]
+            except Exception as e:
+                msg = f"Exception of type {type(e)} occurred.\n{e}"
+                self._logger.debug(msg)
+                self.data_errors += 1
+            else:
+                for values, value in zip(columns.values(), row):
+                    values.append(value)
+
+        df = pd.DataFrame(columns)
+        # Dates carry a UTC offset, which varies with daylight saving time. They are converted
+        # to UTC in one call, and stored without the offset, as the high-water mark is.
+        df["date"] = pd.to_datetime(df["date"], utc=True, errors="coerce").dt.tz_localize(None)
+        # Reviews with dates that cannot be parsed are data errors.
+        invalid = df["date"].isna()
+        if invalid.any():
+            self.data_errors += int(invalid.sum())
+            df = df.loc[~invalid]
+
+        df["app_id"] = self.app.id
+        df["app_name"] = self.app.name
+        df["category_id"] = self.app.category_id
+        df["category"] = self.app.category
+        return df[COLUMNS].astype(DATAFRAME_DTYPES).reset_index(drop=True)
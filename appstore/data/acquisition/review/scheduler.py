@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/data/acquisition/review/scheduler.py                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 04:05:37 pm                                                #
+# Modified   : Sunday October 18th 2026 04:05:37 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+"""AppStore Review Scheduler Module"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from appstore.data.repo.uow import UoW
+
+
+# ------------------------------------------------------------------------------------------------ #
+class ReviewScheduler:
+    """Orders review work by the expected number of new reviews per request.
+
+    The reviews remaining for an app are its review count, from the rating repository, less
+    the index of the last review requested, from the review request repository. Where the
+    review count is unknown, it is estimated from the app's ratings, by the median ratio of
+    reviews to ratings among the apps whose review count is known. The expected yield is the
+    number of reviews remaining per page request. Apps, and the jobs of categories, with the
+    highest yield are served first, so that a crawl cut short has harvested the most reviews.
+
+    Args:
+        uow (UoW): Unit of Work containing the repositories.
+        max_results_per_page (int): The number of reviews requested per page. Default = 400
+        min_ratings (int): Apps with this many ratings or fewer are not scheduled. Default = 20
+    """
+
+    def __init__(self, uow: UoW, max_results_per_page: int = 400, min_ratings: int = 20) -> None:
+        self._uow = uow
+        self._max_results_per_page = max_results_per_page
+        self._min_ratings = min_ratings
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+    def prioritize(self, apps: pd.DataFrame, reviews: dict = None) -> pd.DataFrame:
+        """Returns the apps of a category in descending order of expected yield.
+
+        Args:
+            apps (pd.DataFrame): The apps of a category, with 'id', 'category_id' and
+                'ratings' columns.
+            reviews (dict): Maps app id to its review count. If None, the counts are read
+                from the rating repository.
+        """
+        if len(apps) == 0:
+            return apps
+        category_id = apps["category_id"].iloc[0]
+        if reviews is None:
+            reviews = self._uow.rating_repo.get_review_counts(category_id=category_id)
+        last_indices = self._uow.review_request_repo.get_last_indices(category_id=category_id)
+
+        ids = apps["id"].astype(str)
+        df = self.expected_yield(
+            ratings=apps["ratings"].to_numpy(),
+            reviews=ids.map(reviews).to_numpy(dtype=float),
+            last_index=ids.map(last_indices).fillna(0).to_numpy(),
+        )
+        order = np.lexsort((-df["remaining"], -df["yield"]))
+        return apps.iloc[order]
+
+    def priorities(self) -> dict:
+        """Returns the expected yield of each category's remaining apps, keyed by category id."""
+        counts = self._uow.rating_repo.get_counts()
+        counts = counts.loc[counts["ratings"] > self._min_ratings]
+        last_indices = self._uow.review_request_repo.get_last_indices()
+
+        df = self.expected_yield(
+            ratings=counts["ratings"].to_numpy(),
+            reviews=counts["reviews"].to_numpy(dtype=float),
+            last_index=counts["id"].astype(str).map(last_indices).fillna(0).to_numpy(),
+        )
+        df["category_id"] = counts["category_id"].astype(str).to_numpy()
+        totals = df.groupby("category_id")[["remaining", "pages"]].sum()
+        totals = totals.loc[totals["pages"] > 0]
+        return (totals["remaining"] / totals["pages"]).to_dict()
+
+    def expected_yield(
+        self, ratings: np.ndarray, reviews: np.ndarray, last_index: np.ndarray
+    ) -> pd.DataFrame:
+        """Returns the reviews remaining, the pages required and the reviews per page of apps.
+
+        Args:
+            ratings (np.ndarray): The number of ratings of each app.
+            reviews (np.ndarray): The number of reviews of each app, NaN where unknown.
+            last_index (np.ndarray): The index of the last review requested for each app.
+        """
+        known = ~np.isnan(reviews) & (ratings > 0)
+        ratio = np.median(reviews[known] / ratings[known]) if known.any() else 1.0
+        reviews = np.where(np.isnan(reviews), ratings * ratio, reviews)
+
+        remaining = np.maximum(reviews - last_index, 0)
+        pages = np.ceil(remaining / self._max_results_per_page)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            yields = np.where(pages > 0, remaining / pages, 0)
+        return pd.DataFrame({"remaining": remaining, "pages": pages, "yield": yields})
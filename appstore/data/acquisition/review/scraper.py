@@ -20,6 +20,7 @@
 from __future__ import annotations
 import sys
 import logging
+from datetime import datetime
 
 from dependency_injector.wiring import Provide, inject
 
@@ -29,11 +30,45 @@ from appstore.data.acquisition.review.validator import ReviewValidator
 from appstore.data.acquisition.review.result import ReviewResult
 from appstore.container import AppstoreContainer
 from appstore.infrastructure.web.session import SessionHandler
+from appstore.infrastructure.web.response import ParsedResponse
+
+
+# ------------------------------------------------------------------------------------------------ #
+def plan_pages(reviews: int, start: int, max_results_per_page: int) -> int:
+    """Returns the number of pages holding an app's reviews from the start index.
+
+    Args:
+        reviews (int): The number of reviews of the app.
+        start (int): The index of the first review to request.
+        max_results_per_page (int): The number of reviews requested per page.
+    """
+    return max(0, -(-(reviews - start) // max_results_per_page))
 
 
 # ------------------------------------------------------------------------------------------------ #
 class ReviewScraper(Scraper):
-    """App Store Review Scraper"""
+    """App Store Review Scraper
+
+    Pagination ends at the first page holding fewer than max_results_per_page reviews, or at
+    the empty page that follows the last review.
+
+    In an incremental refresh, pages are requested newest first from the start, and
+    pagination ends at the first page reaching the high-water mark given by 'since'. Reviews
+    at or before the mark are dropped from the results.
+
+    Args:
+        app (App): The app whose reviews are requested.
+        session_handler (SessionHandler): Object that manages the HTTP requests.
+        start (int): The index of the first review to request. Default = 0
+        max_results_per_page (int): The number of reviews requested per page. Default = 400
+        max_pages (int): Maximum number of pages to request.
+        since (datetime): The date of the newest review already stored. If None, all reviews
+            from the start index are requested.
+        since_id (str): The id of the newest review already stored.
+        sort (int): The ordering of reviews requested of the store: 1 (most helpful),
+            2 (most favorable), 3 (most critical) or 4 (most recent). A refresh requires the
+            most recent ordering, as it stops at the first page reaching the mark. Default = 1
+    """
 
     @inject
     def __init__(
@@ -43,6 +78,9 @@ class ReviewScraper(Scraper):
         start: int = 0,
         max_results_per_page: int = 400,
         max_pages: int = sys.maxsize,
+        since: datetime = None,
+        since_id: str = None,
+        sort: int = 1,
     ) -> None:
         self._app = app
         self._session_handler = session_handler
@@ -51,7 +89,12 @@ class ReviewScraper(Scraper):
         self._max_results_per_page = max_results_per_page
         self._max_pages = max_pages
 
+        self._since = since
+        self._since_id = since_id
+        self._sort = sort
+
         self._page = 0
+        self._last_page = False  # Whether the last page of reviews has been returned.
 
         self._header = STOREFRONT["headers"]
 
@@ -63,16 +106,29 @@ class ReviewScraper(Scraper):
     def __next__(self) -> ReviewScraper:
         """Formats an itunes request for the next page"""
 
-        if self._page < self._max_pages:
+        if self._page < self._max_pages and not self._last_page:
             url = self._setup_url()
 
             validator = ReviewValidator()
             result = ReviewResult()
 
-            response = self._session_handler.get(url=url, header=self._header)
+            response = self._session_handler.fetch(url=url, header=self._header)
+
+            if self._is_empty(response=response):
+                raise StopIteration
 
             if validator.is_valid(response=response):
                 result.add_response(response=response, app=self._app, index=self._start_index)
+                self._last_page = (
+                    len(response.content["userReviewList"]) < self._max_results_per_page
+                )
+                if self._since is not None and result.drop_known(
+                    since=self._since, since_id=self._since_id
+                ):
+                    # The page reached reviews already stored.
+                    self._last_page = True
+                    if result.reviews == 0:
+                        raise StopIteration
             else:  # pragma: no cover
                 result.app = self._app
                 result.data_errors += validator.data_error
@@ -83,9 +139,16 @@ class ReviewScraper(Scraper):
         else:
             raise StopIteration
 
+    def _is_empty(self, response: ParsedResponse) -> bool:
+        """Returns True if the response is the empty page that follows the last review."""
+        try:
+            return response.status_code == 200 and len(response.content["userReviewList"]) == 0
+        except Exception:
+            return False
+
     def _setup_url(self) -> None:
         """Sets the request url"""
-        return f"https://itunes.apple.com/WebObjects/MZStore.woa/wa/userReviewsRow?id={self._app.id}&displayable-kind=11&startIndex={self._start_index}&endIndex={self._end_index}&sort=1"
+        return f"https://itunes.apple.com/WebObjects/MZStore.woa/wa/userReviewsRow?id={self._app.id}&displayable-kind=11&startIndex={self._start_index}&endIndex={self._end_index}&sort={self._sort}"
 
     def _paginate_url(self) -> None:
         self._page += 1
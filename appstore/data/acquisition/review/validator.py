@@ -17,9 +17,9 @@
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
 from dataclasses import dataclass
-import requests
 
 from appstore.data.acquisition.base import Validator
+from appstore.infrastructure.web.response import ParsedResponse
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -36,7 +36,7 @@ class ReviewValidator(Validator):
     server_error: bool = False
     """
 
-    def is_valid(self, response: requests.Response) -> bool:
+    def is_valid(self, response: ParsedResponse) -> bool:
         """Validates the response object"""
         self.response = response
         self.valid = True
@@ -56,7 +56,7 @@ class ReviewValidator(Validator):
             self.msg = "No response"
             self._logger.debug(self.msg)
 
-        elif not isinstance(self.response, requests.Response):
+        elif not isinstance(self.response, ParsedResponse):
             self.valid = False
             self.server_error = True
             self.msg = f"Invalid response type: Response is of type {type(self.response)}."
@@ -65,24 +65,79 @@ class ReviewValidator(Validator):
         return self.valid
 
     def _validate_response_content(self) -> bool:  # pragma: no cover
-        if not isinstance(self.response.json(), dict):
+        content = self.response.content
+        if not isinstance(content, dict):
             self.data_error = True
-            self.msg = f"Invalid Response: Response json is of type {type(self.response.json())}."
+            self.msg = f"Invalid Response: Response json is of type {type(content)}."
             self._logger.debug(msg=self.msg)
             self.valid = False
-        elif "userReviewList" not in self.response.json():
+        elif "userReviewList" not in content:
             self.data_error = True
             self.msg = "Invalid Response: Response json has no 'userReviewList' key."
             self._logger.debug(msg=self.msg)
             self.valid = False
-        elif not isinstance(self.response.json()["userReviewList"], list):
+        elif not isinstance(content["userReviewList"], list):
             self.data_error = True
-            self.msg = f"Invalid Response: Response json 'userReviewList' is of type {type(self.response.json()['userReviewList'])}, not a list."
+            self.msg = f"Invalid Response: Response json 'userReviewList' is of type {type(content['userReviewList'])}, not a list."
             self._logger.debug(msg=self.msg)
             self.valid = False
-        elif len(self.response.json()["userReviewList"]) == 0:
+        elif len(content["userReviewList"]) == 0:
             self.data_error = True
             self.msg = "Invalid Response: Response json 'userReviewList' has zero length."
             self._logger.debug(msg=self.msg)
             self.valid = False
         return self.valid
+
+
+# ------------------------------------------------------------------------------------------------ #
+@dataclass
+class AReviewValidator(Validator):
+    """Validates the decoded content of asynchronous responses. Inherits the following from Validator
+
+    response: Any = None
+    valid: bool = True
+    status_code: int = None
+    msg: str = None
+    data_error: bool = False
+    client_error: bool = False
+    server_error: bool = False
+    """
+
+    def is_valid(self, response: dict) -> bool:
+        """Validates the response content"""
+        self.response = response
+        self.valid = True
+
+        self._validate_response_type()
+        if self.valid:
+            self._validate_response_content()
+        return self.valid
+
+    def _validate_response_type(self) -> bool:
+        """Ensures the response is the correct type"""
+        if self.response is None:
+            self.valid = False
+            self.data_error = True
+            self.msg = "No response"
+            self._logger.debug(self.msg)
+
+        elif not isinstance(self.response, dict):
+            self.valid = False
+            self.data_error = True
+            self.msg = f"Invalid response type: Response is of type {type(self.response)}."
+            self._logger.debug(self.msg)
+
+        return self.valid
+
+    def _validate_response_content(self) -> bool:
+        if "userReviewList" not in self.response:
+            self.data_error = True
+            self.msg = "Invalid Response: Response json has no 'userReviewList' key."
+            self._logger.debug(msg=self.msg)
+            self.valid = False
+        elif not isinstance(self.response["userReviewList"], list):
+            self.data_error = True
+            self.msg = f"Invalid Response: Response json 'userReviewList' is of type {type(self.response['userReviewList'])}, not a list."
+            self._logger.debug(msg=self.msg)
+            self.valid = False
+        return self.valid
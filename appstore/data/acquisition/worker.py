@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/data/acquisition/worker.py                                                #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 05:32:14 pm                                                #
+# Modified   : Sunday October 18th 2026 05:32:14 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+"""Job Worker Launcher Module"""
+import asyncio
+import inspect
+import logging
+import importlib
+import multiprocessing
+
+from appstore.container import AppstoreContainer
+
+# Maps controller names to the modules defining them.
+CONTROLLERS = {
+    "RatingController": "appstore.data.acquisition.rating.controller",
+    "ReviewController": "appstore.data.acquisition.review.controller",
+}
+
+
+# ------------------------------------------------------------------------------------------------ #
+def run_worker(controller: str, kwargs: dict = None) -> None:
+    """Runs a controller in the current process until no job remains to be claimed.
+
+    The container is created and wired in the process, so that the worker has its own
+    database connection and web sessions.
+
+    Args:
+        controller (str): The name of the controller, one of CONTROLLERS.
+        kwargs (dict): Keyword arguments passed to the controller.
+    """
+    container = AppstoreContainer()
+    container.init_resources()
+    container.wire(packages=["appstore.data.acquisition"])
+    try:
+        module = importlib.import_module(CONTROLLERS[controller])
+        ctrl = getattr(module, controller)(**(kwargs or {}))
+        result = ctrl.scrape()
+        if inspect.iscoroutine(result):
+            asyncio.run(result)
+    finally:
+        container.shutdown_resources()
+
+
+# ------------------------------------------------------------------------------------------------ #
+class WorkerPool:
+    """Runs several controller processes concurrently against the same database.
+
+    Each process claims jobs with a lease, so that no two workers process the same category,
+    and exits when no job remains to be claimed. Pools on several machines may share the
+    database in the same way.
+
+    Args:
+        controller (str): The name of the controller, one of CONTROLLERS.
+        workers (int): The number of processes. Default = 2
+        **kwargs: Keyword arguments passed to each controller.
+    """
+
+    def __init__(self, controller: str, workers: int = 2, **kwargs) -> None:
+        if controller not in CONTROLLERS:
+            msg = f"Controller {controller} is not supported. Expected one of {list(CONTROLLERS.keys())}."
+            raise ValueError(msg)
+        self._controller = controller
+        self._workers = workers
+        self._kwargs = kwargs
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+    def run(self) -> list:
+        """Starts the workers, waits for them to exit, and returns their exit codes."""
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(
+                target=run_worker,
+                kwargs={"controller": self._controller, "kwargs": self._kwargs},
+                name=f"{self._controller}-{i}",
+            )
+            for i in range(self._workers)
+        ]
+        for process in processes:
+            process.start()
+        msg = f"Started {self._workers} {self._controller} workers."
+        self._logger.info(msg)
+
+        for process in processes:
+            process.join()
+            if process.exitcode != 0:
+                msg = f"Worker {process.name} exited with code {process.exitcode}."
+                self._logger.warning(msg)
+        return [process.exitcode for process in processes]
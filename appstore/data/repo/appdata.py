@@ -18,11 +18,12 @@
 # ================================================================================================ #
 """Repository Implementation Module"""
 import logging
+from typing import Iterator
 
 import numpy as np
 import pandas as pd
 
-from appstore.data.repo.base import Repo
+from appstore.data.repo.base import Repo, concat_chunks
 from appstore.data.entity.appdata import AppData
 from appstore.data.dataset.appdata import AppDataDataset
 from appstore.infrastructure.database.base import Database
@@ -52,6 +53,20 @@ PARSE_DATES = {
     "released": {"errors": "coerce", "format": "%Y-%m-%d %H:%M:%S", "exact": False},
     # "extracted": {"errors": "coerce", "format": "%Y-%m-%d %H:%M:%S", "exact": False},
 }
+# The columns of the AppData entity, from which the AppDataDataset is built.
+DATASET_COLUMNS = [
+    "id",
+    "name",
+    "description",
+    "category_id",
+    "category",
+    "price",
+    "developer_id",
+    "developer",
+    "rating",
+    "ratings",
+    "released",
+]
 
 # ------------------------------------------------------------------------------------------------ #
 #                                      DATABASE DATA TYPES                                         #
@@ -92,17 +107,11 @@ class AppDataRepo(Repo):
     @property
     def summary(self) -> None:
         """Summarizes the data"""
-        df = self.getall()
-
-        summary = df["category"].value_counts().reset_index()
-        summary.columns = ["category", "Examples"]
-        df2 = df.groupby(by="category")["id"].nunique().to_frame()
-        df3 = df.groupby(by="category")["rating"].mean().to_frame()
-        df4 = df.groupby(by="category")["ratings"].sum().to_frame()
-
-        summary = summary.join(df2, on="category")
-        summary = summary.join(df3, on="category")
-        summary = summary.join(df4, on="category")
+        query = f"""SELECT category, COUNT(*) AS examples, COUNT(DISTINCT id) AS apps,
+            AVG(rating) AS rating, SUM(ratings) AS ratings FROM {self._name}
+            GROUP BY category ORDER BY examples DESC;"""
+        dtypes = {"examples": np.int64, "apps": np.int64, "rating": np.float64, "ratings": np.int64}
+        summary = self._database.query(query=query, dtypes=dtypes)
         summary.columns = ["Category", "Examples", "Apps", "Average Rating", "Rating Count"]
         return summary
 
@@ -138,10 +147,95 @@ class AppDataRepo(Repo):
         else:
             return None
 
-    def getall(self) -> pd.DataFrame:
-        """Returns all data in the repository."""
+    def getall(self, columns: list = None) -> pd.DataFrame:
+        """Returns all data in the repository.
+
+        Args:
+            columns (list): Columns to return. If None, all columns are returned.
+        """
+
+        return super().getall(dtypes=DATAFRAME_DTYPES, parse_dates=PARSE_DATES, columns=columns)
+
+    def get_by_category(self, category_id: str, columns: list = None) -> pd.DataFrame:
+        """Returns the data for the category.
+
+        Args:
+            category_id (str): The four character AppStore category identifier.
+            columns (list): Columns to return. If None, all columns are returned.
+        """
+        return super().get_by_category(
+            category_id=category_id,
+            dtypes=DATAFRAME_DTYPES,
+            parse_dates=PARSE_DATES,
+            columns=columns,
+        )
+
+    def sample(
+        self, n: int = 5, frac: float = None, category_id: str = None, random_state: int = None
+    ) -> pd.DataFrame:
+        """Returns a random sample of the repository in a typed DataFrame.
+
+        Args:
+            n (int): Number of samples to return. Default = 5
+            frac (float): Proportion of the data to return. n is ignored
+                if this variable is non-null. Optional
+            category_id (str): Four character category_id. Optional
+            random_state (int): Seed for pseudo random generation.
+        """
+        return super().sample(
+            n=n,
+            frac=frac,
+            category_id=category_id,
+            random_state=random_state,
+            dtypes=DATAFRAME_DTYPES,
+            parse_dates=PARSE_DATES,
+        )
+
+    def iter_chunks(
+        self, chunksize: int = 10000, columns: list = None, where: str = None, params: dict = None
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the rows of the repository in typed DataFrames of at most chunksize rows.
+
+        Args:
+            chunksize (int): Maximum number of rows per DataFrame. Default = 10000
+            columns (list): Columns to return. If None, all columns are returned.
+            where (str): Condition on the rows, with named parameters.
+            params (dict): Parameters of the condition.
+        """
+        yield from super().iter_chunks(
+            chunksize=chunksize,
+            columns=columns,
+            where=where,
+            params=params,
+            dtypes=DATAFRAME_DTYPES,
+            parse_dates=PARSE_DATES,
+        )
+
+    def get_unprocessed(
+        self, category_id: str, tablename: str = "rating", columns: list = None
+    ) -> pd.DataFrame:
+        """Returns the apps of the category that have no rows in another table.
+
+        The anti-join is evaluated by the database against the id index of the other table,
+        so the apps already processed are never read.
 
-        return super().getall(dtypes=DATAFRAME_DTYPES, parse_dates=PARSE_DATES)
+        Args:
+            category_id (str): The four character AppStore category identifier.
+            tablename (str): The table whose id column records the apps processed.
+                Default = 'rating'
+            columns (list): Columns to return. If None, all columns are returned.
+        """
+        select = "a.*" if columns is None else ", ".join(f"a.`{column}`" for column in columns)
+        query = f"""SELECT {select} FROM {self._name} a WHERE a.category_id = :category_id
+            AND NOT EXISTS (SELECT 1 FROM {tablename} t WHERE t.id = a.id);"""
+        params = {"category_id": category_id}
+        return self._database.query(
+            query=query,
+            params=params,
+            dtypes=DATAFRAME_DTYPES,
+            parse_dates=PARSE_DATES,
+            columns=columns,
+        )
 
     def get_ids(self, category_id: str) -> list:
         """Returns the list of app ids for the category
@@ -154,9 +248,13 @@ class AppDataRepo(Repo):
         ids = self._database.query(query=query, params=params)
         return list(ids["id"].values)
 
-    def get_dataset(self) -> AppDataDataset:
-        df = self.getall()
-        return AppDataDataset(df=df)
+    def get_dataset(self, columns: list = DATASET_COLUMNS) -> AppDataDataset:
+        """Returns the dataset, built from typed chunks of the columns it uses.
+
+        Args:
+            columns (list): Columns to read. Default = DATASET_COLUMNS
+        """
+        return AppDataDataset(df=concat_chunks(self.iter_chunks(columns=columns)))
 
     def replace(self, data: pd.DataFrame) -> None:
         """Replaces the data in a repository with that of the data parameter.
@@ -22,7 +22,7 @@ import os
 from datetime import datetime
 import logging
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Iterable, Iterator, Union
 
 from dotenv import load_dotenv
 import pandas as pd
@@ -35,6 +35,33 @@ from appstore.infrastructure.file.config import FileConfig
 load_dotenv()
 
 
+# ------------------------------------------------------------------------------------------------ #
+def concat_chunks(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenates DataFrames read in chunks, keeping categorical columns categorical.
+
+    The result is assembled a column at a time, each column being released from the chunks as
+    it is concatenated, so that the chunks and the result are never held in full together. The
+    chunks are left empty.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): DataFrames with the same columns, i.e. from iter_chunks.
+    """
+    chunks = list(chunks)
+    if len(chunks) == 0:
+        return pd.DataFrame()
+    data = {}
+    for column in list(chunks[0].columns):
+        pieces = [chunk.pop(column) for chunk in chunks]
+        if isinstance(pieces[0].dtype, pd.CategoricalDtype):
+            data[column] = pd.Series(
+                pd.api.types.union_categoricals(pieces, ignore_order=True), name=column
+            )
+        else:
+            data[column] = pd.concat(pieces, ignore_index=True)
+        del pieces
+    return pd.DataFrame(data, copy=False)
+
+
 # ------------------------------------------------------------------------------------------------ #
 class Repo(ABC):
     """Provides base class for all repositories classes.
@@ -82,33 +109,67 @@ class Repo(ABC):
             self._logger.info(msg)
 
     def sample(
-        self, n: int = 5, frac: float = None, category_id: str = None, random_state: int = None
+        self,
+        n: int = 5,
+        frac: float = None,
+        category_id: str = None,
+        random_state: int = None,
+        dtypes: dict = None,
+        parse_dates: dict = None,
     ) -> pd.DataFrame:
         """Returns a random sample from the underlying dataset.
 
+        The ids are sampled in the database, and only the sampled rows are returned, at most n
+        of them, since an id may occur in more than one row.
+
         Args:
             n (int): Number of samples to return. Optional, defaults to 1.
             frac (float): Proportion of the data to return. n is ignored
                 if this variable is non-null. Optional
             category_id (str): Four character category_id. Optional
             random_state (int): Seed for pseudo random generation.
+            dtypes (dict): Dictionary mapping of column to data types
+            parse_dates (dict): Dictionary of columns and keyword arguments for datetime parsing.
         """
-        if category_id is None:
-            df = self.getall()
-        else:
-            df = self.get_by_category(category_id=category_id)
-        return df.sample(n=n, frac=frac, random_state=random_state)
+        where = " WHERE category_id = :category_id" if category_id is not None else ""
+        params = {"category_id": category_id}
+        if frac is not None:
+            query = f"SELECT COUNT(*) AS n FROM {self._name}{where};"
+            n = round(frac * int(self._database.query(query=query, params=params)["n"].iloc[0]))
+        seed = "" if random_state is None else str(int(random_state))
+        query = f"""SELECT t.* FROM {self._name} t JOIN (
+            SELECT id FROM {self._name}{where} GROUP BY id ORDER BY RAND({seed}) LIMIT :n
+            ) sampled ON t.id = sampled.id LIMIT :n;"""
+        params["n"] = int(n)
+        return self._database.query(
+            query=query, params=params, dtypes=dtypes, parse_dates=parse_dates
+        )
 
     def info(self) -> pd.DataFrame:
-        """Wrapper for pandas info method"""
-        df = self.getall()
-        df.info()
+        """Returns the columns of the underlying table with their types and non-null counts."""
+        query = """SELECT COLUMN_NAME AS name, COLUMN_TYPE AS type FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name ORDER BY ORDINAL_POSITION;"""
+        columns = self._database.query(query=query, params={"name": self._name})
+        counts = ", ".join(f"COUNT(`{name}`)" for name in columns["name"])
+        query = f"SELECT COUNT(*), {counts} FROM {self._name};"
+        counts = self._database.query(query=query).iloc[0].astype(int).tolist()
+        info = pd.DataFrame(
+            {
+                "Column": columns["name"],
+                "Dtype": columns["type"],
+                "Non-Null Count": counts[1:],
+            }
+        )
+        msg = f"\n{self._name}: {counts[0]} rows, {len(info)} columns\n{info.to_string()}"
+        self._logger.info(msg)
+        return info
 
     def get(
         self,
         id: Union[str, int],
         dtypes: dict = None,
         parse_dates: dict = None,
+        columns: list = None,
     ) -> pd.DataFrame:  # noqa
         """Returns data for the entity designated by the 'id' parameter.
 
@@ -116,16 +177,21 @@ class Repo(ABC):
             id (Union[str,int]): The entity id.
             dtypes (dict): Dictionary mapping of column to data types
             parse_dates (dict): Dictionary of columns and keyword arguments for datetime parsing.
+            columns (list): Columns to return. If None, all columns are returned.
         """
 
-        query = f"SELECT * FROM {self._name} WHERE id = :id;"
+        query = f"SELECT {self._select(columns)} FROM {self._name} WHERE id = :id;"
         params = {"id": id}
         return self._database.query(
-            query=query, params=params, dtypes=dtypes, parse_dates=parse_dates
+            query=query, params=params, dtypes=dtypes, parse_dates=parse_dates, columns=columns
         )
 
     def get_by_category(
-        self, category_id: Union[str, int], dtypes: dict = None, parse_dates: dict = None
+        self,
+        category_id: Union[str, int],
+        dtypes: dict = None,
+        parse_dates: dict = None,
+        columns: list = None,
     ) -> pd.DataFrame:
         """Obtains data from the given table by category id
 
@@ -133,24 +199,60 @@ class Repo(ABC):
             category_id (Union[str,int]): The mobile app category.
             dtypes (dict): Dictionary mapping of column to data types
             parse_dates (dict): Dictionary of columns and keyword arguments for datetime parsing.
+            columns (list): Columns to return. If None, all columns are returned.
         """
-        query = f"SELECT * FROM {self._name} WHERE category_id = :category_id;"
+        select = self._select(columns)
+        query = f"SELECT {select} FROM {self._name} WHERE category_id = :category_id;"
         params = {"category_id": category_id}
         return self._database.query(
-            query=query, params=params, dtypes=dtypes, parse_dates=parse_dates
+            query=query, params=params, dtypes=dtypes, parse_dates=parse_dates, columns=columns
         )
 
-    def getall(self, dtypes: dict = None, parse_dates: dict = None) -> pd.DataFrame:
+    def getall(
+        self, dtypes: dict = None, parse_dates: dict = None, columns: list = None
+    ) -> pd.DataFrame:
         """Returns all data in the repository.
 
         Args:
             dtypes (dict): Dictionary mapping of column to data types
             parse_dates (dict): Dictionary of columns and keyword arguments for datetime parsing.
+            columns (list): Columns to return. If None, all columns are returned.
         """
-        query = f"SELECT * FROM {self._name};"
+        query = f"SELECT {self._select(columns)} FROM {self._name};"
         params = None
         return self._database.query(
-            query=query, params=params, dtypes=dtypes, parse_dates=parse_dates
+            query=query, params=params, dtypes=dtypes, parse_dates=parse_dates, columns=columns
+        )
+
+    def iter_chunks(
+        self,
+        chunksize: int = 10000,
+        columns: list = None,
+        where: str = None,
+        params: dict = None,
+        dtypes: dict = None,
+        parse_dates: dict = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the rows of the repository in DataFrames of at most chunksize rows.
+
+        Args:
+            chunksize (int): Maximum number of rows per DataFrame. Default = 10000
+            columns (list): Columns to return. If None, all columns are returned.
+            where (str): Condition on the rows, with named parameters, i.e.
+                'category_id = :category_id'. If None, all rows are returned.
+            params (dict): Parameters of the condition.
+            dtypes (dict): Dictionary mapping of column to data types
+            parse_dates (dict): Dictionary of columns and keyword arguments for datetime parsing.
+        """
+        where = "" if where is None else f" WHERE {where}"
+        query = f"SELECT {self._select(columns)} FROM {self._name}{where};"
+        yield from self._database.iter_query(
+            query=query,
+            params=params or {},
+            chunksize=chunksize,
+            dtypes=dtypes,
+            parse_dates=parse_dates,
+            columns=columns,
         )
 
     def exists(self, id: Union[str, int]) -> bool:  # noqa
@@ -172,13 +274,13 @@ class Repo(ABC):
         Returns number of rows matching criteria
         """
         if id is not None:
-            query = f"SELECT * FROM {self._name} WHERE id = :id;"
+            query = f"SELECT COUNT(*) AS n FROM {self._name} WHERE id = :id;"
             params = {"id": id}
         else:
-            query = f"SELECT * FROM {self._name};"
+            query = f"SELECT COUNT(*) AS n FROM {self._name};"
             params = {}
 
-        return self._database.query(query=query, params=params).shape[0]
+        return int(self._database.query(query=query, params=params)["n"].iloc[0])
 
     def delete(self, id: Union[str, int]) -> int:  # noqa
         """Deletes the entity designated by the id.
@@ -217,20 +319,47 @@ class Repo(ABC):
 
         Args:
             by (str,list): A variable or list of variables in the repository.
+
+        Returns a DataFrame of the duplicated values of 'by' and the number of rows with each.
         """
-        df = self.getall()
-        counts = df[by].value_counts(sort=True, ascending=False, normalize=False).reset_index()
-        counts
+        by = ", ".join(f"`{column}`" for column in ([by] if isinstance(by, str) else by))
+        query = f"""SELECT {by}, COUNT(*) AS count FROM {self._name} GROUP BY {by}
+            HAVING COUNT(*) > 1 ORDER BY count DESC;"""
+        return self._database.query(query=query)
 
     def dedup(self, keep: str = "last", subset: str = "id") -> None:
-        """Removes duplicates by id"""
-        df = self.getall()
-        n1 = df.shape[0]
-        df = df.drop_duplicates(subset=subset, keep=keep)
-        n2 = df.shape[0]
+        """Removes duplicates by id
+
+        Only the rows whose subset values are duplicated are read. They are deleted, and the
+        row kept of each group is inserted again.
+
+        Args:
+            keep (str): Which row of each group of duplicates to keep. 'first' or 'last'.
+            subset (str,list): The column or columns identifying duplicates. Default = 'id'
+        """
+        subset = [subset] if isinstance(subset, str) else list(subset)
+        columns = ", ".join(f"`{column}`" for column in subset)
+        on = " AND ".join(f"t.`{column}` <=> d.`{column}`" for column in subset)
+        query = f"""SELECT t.* FROM {self._name} t JOIN (SELECT {columns} FROM {self._name}
+            GROUP BY {columns} HAVING COUNT(*) > 1) d ON {on};"""
+        n1 = self.count()
+        duplicates = concat_chunks(self._database.iter_query(query=query))
+        if len(duplicates) > 0:
+            try:
+                self._delete_keys(keys=duplicates[subset].drop_duplicates())
+                self._database.insert(
+                    data=duplicates.drop_duplicates(subset=subset, keep=keep),
+                    tablename=self._name,
+                    if_exists="append",
+                )
+                self.save()
+            except Exception as e:  # pragma: no cover
+                msg = f"Exception of type {type(e)} occurred removing duplicates. Rolling back.\n{e}"
+                self._logger.exception(msg)
+                self._database.rollback()
+                raise
+        n2 = self.count()
         r = n1 - n2
-        self.replace(data=df)
-        self.save()
         msg = f"Repository with {n1} observations dropped {r} duplicates leaving {n2} observations"
         self._logger.info(msg)
 
@@ -246,12 +375,20 @@ class Repo(ABC):
         with_datetime: bool = True,
     ) -> str:
         """Archives the data
+
+        Formats that can be written in chunks, i.e. parquet, csv and tsv, are written one
+        chunk at a time. Other formats, i.e. pkl, are written from the whole table, or the
+        whole category, and hence need memory for all of it.
+
         Args:
             directory (str): The base directory into which the archive is created.
                 Optional. Defaults to the archive directory in an environment
                 variable.
+            format (str): The file format. Default = 'pkl'
+            by_category (bool): Whether a file is created for each category. Default = False
+            with_datetime (bool): Whether the current datetime is added to the file names.
+                Default = True
         """
-        df = self.getall()
         if directory is None:
             basedir = self._config.datasets
             directory = os.path.join(basedir, self._name)
@@ -264,17 +401,53 @@ class Repo(ABC):
         os.makedirs(directory, exist_ok=True)
         if by_category:
             filepath = []
-            for category, data in df.groupby(by="category"):
+            query = f"SELECT DISTINCT category FROM {self._name} ORDER BY category;"
+            for category in self._database.query(query=query)["category"]:
                 filename = name + "_" + category + "." + format
                 fp = os.path.join(directory, filename)
                 filepath.append(fp)
-                IOService.write(filepath=fp, data=data)
+                self._write_chunks(
+                    filepath=fp,
+                    chunks=self.iter_chunks(
+                        where="category = :category", params={"category": category}
+                    ),
+                )
         else:
             filename = name + "." + format
             filepath = os.path.join(directory, filename)
-            IOService.write(filepath=filepath, data=df)
+            self._write_chunks(filepath=filepath, chunks=self.iter_chunks())
         return filepath
 
+    def _write_chunks(self, filepath: str, chunks: Iterator[pd.DataFrame]) -> None:
+        """Writes the chunks to the file, one at a time if its format allows."""
+        if IOService.is_chunked(filepath=filepath):
+            IOService.write_chunks(filepath=filepath, chunks=chunks)
+        else:
+            IOService.write(filepath=filepath, data=concat_chunks(chunks))
+
+    def _select(self, columns: list = None) -> str:
+        """Returns the select list for the columns, or '*' if columns is None."""
+        return "*" if columns is None else ", ".join(f"`{column}`" for column in columns)
+
+    def _delete_keys(self, keys: pd.DataFrame, batchsize: int = 500) -> None:
+        """Deletes the rows matching any row of keys, whose columns are those of the table.
+
+        Args:
+            keys (pd.DataFrame): Values of the key columns of the rows to delete.
+            batchsize (int): Number of keys per DELETE statement. Default = 500
+        """
+        for start in range(0, len(keys), batchsize):
+            conditions, params = [], {}
+            batch = keys.iloc[start : start + batchsize]
+            for i, row in enumerate(batch.itertuples(index=False)):
+                terms = []
+                for j, (column, value) in enumerate(zip(keys.columns, row)):
+                    terms.append(f"`{column}` <=> :k{i}_{j}")
+                    params[f"k{i}_{j}"] = None if pd.isna(value) else value
+                conditions.append(f"({' AND '.join(terms)})")
+            query = f"DELETE FROM {self._name} WHERE {' OR '.join(conditions)};"
+            self._database.delete(query=query, params=params)
+
     def _parse_datetime(self, data: pd.DataFrame, dtcols: Union[str, list[str]]) -> pd.DataFrame:
         """Converts strings to datetime objects for the designated column.
 
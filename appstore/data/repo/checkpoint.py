@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/data/repo/checkpoint.py                                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 05:21:06 pm                                                #
+# Modified   : Sunday October 18th 2026 05:21:06 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+import logging
+
+import pandas as pd
+import numpy as np
+
+from appstore.data.repo.base import Repo
+from appstore.infrastructure.database.base import Database
+from appstore.infrastructure.file.config import FileConfig
+from sqlalchemy.dialects.mysql import (
+    VARCHAR,
+    BIGINT,
+    DATETIME,
+)
+
+# ------------------------------------------------------------------------------------------------ #
+#                                    DATAFRAME DATA TYPES                                          #
+# ------------------------------------------------------------------------------------------------ #
+DATAFRAME_DTYPES = {
+    "controller": "string",
+    "job_id": "string",
+    "id": "string",
+    "position": np.int64,
+}
+PARSE_DATES = {
+    "updated": {"errors": "coerce", "format": "%Y-%m-%d %H:%M:%S", "exact": False},
+}
+
+# ------------------------------------------------------------------------------------------------ #
+#                                      DATABASE DATA TYPES                                         #
+# ------------------------------------------------------------------------------------------------ #
+DATABASE_DTYPES = {
+    "controller": VARCHAR(64),
+    "job_id": VARCHAR(64),
+    "id": VARCHAR(128),
+    "position": BIGINT,
+    "updated": DATETIME,
+}
+
+
+# ------------------------------------------------------------------------------------------------ #
+class CheckpointRepo(Repo):
+    """Repository of the positions from which interrupted scrapes resume.
+
+    A checkpoint records, for a controller and the app or search term it scrapes, the position
+    of the next request: the offset of the next page of search results, or the index of the
+    next page of reviews. Controllers save a checkpoint in the same transaction as the rows of
+    the page it follows, so that a process killed at any point resumes at the request after
+    the last page persisted, neither fetching nor storing any page twice.
+
+    Args:
+        database(Database): Database containing data to access.
+    """
+
+    __name = "checkpoint"
+
+    def __init__(self, database: Database, config=FileConfig) -> None:
+        super().__init__(name=self.__name, database=database, config=config)
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Adds the dataframe rows to the designated table.
+
+        Args:
+            data (pd.DataFrame): DataFrame containing rows to add to the table.
+        """
+        self._database.insert(
+            data=data, tablename=self._name, dtype=DATABASE_DTYPES, if_exists="append"
+        )
+        msg = f"Added {data.shape[0]} rows to the {self._name} repository."
+        self._logger.debug(msg)
+
+    def getall(self) -> pd.DataFrame:
+        """Returns all data in the repository."""
+
+        return super().getall(dtypes=DATAFRAME_DTYPES, parse_dates=PARSE_DATES)
+
+    def get_position(self, controller: str, id: str) -> int:
+        """Returns the position of the next request for the app or term, or None if there is none.
+
+        Args:
+            controller (str): The class name of the controller.
+            id (str): The app id or search term.
+        """
+        query = f"SELECT position FROM {self._name} WHERE controller = :controller AND id = :id;"
+        params = {"controller": controller, "id": str(id)}
+        df = self._database.query(query=query, params=params)
+        return int(df["position"].iloc[0]) if len(df) > 0 else None
+
+    def get_positions(self, controller: str, job_id: str) -> dict:
+        """Returns the position of the next request for each app or term of a job, keyed by id.
+
+        Args:
+            controller (str): The class name of the controller.
+            job_id (str): The job identifier.
+        """
+        query = f"SELECT id, position FROM {self._name} WHERE controller = :controller AND job_id = :job_id;"
+        params = {"controller": controller, "job_id": str(job_id)}
+        df = self._database.query(query=query, params=params)
+        return dict(zip(df["id"].astype(str), df["position"].astype(int)))
+
+    def save(self, controller: str, job_id: str, id: str, position: int) -> None:
+        """Inserts or replaces the checkpoint for the app or term. Not committed.
+
+        Args:
+            controller (str): The class name of the controller.
+            job_id (str): The job identifier.
+            id (str): The app id or search term.
+            position (int): The offset or index of the next request.
+        """
+        query = f"""INSERT INTO {self._name} (controller, job_id, id, position, updated)
+            VALUES (:controller, :job_id, :id, :position, NOW())
+            ON DUPLICATE KEY UPDATE job_id = VALUES(job_id), position = VALUES(position), updated = NOW();"""
+        params = {
+            "controller": controller,
+            "job_id": str(job_id),
+            "id": str(id),
+            "position": int(position),
+        }
+        self._database.execute(query=query, params=params)
+
+    def clear(self, controller: str, job_id: str = None) -> int:
+        """Deletes the checkpoints of a controller, or of one of its jobs.
+
+        Args:
+            controller (str): The class name of the controller.
+            job_id (str): The job identifier. If None, all of the controller's checkpoints
+                are deleted.
+        """
+        where = " AND job_id = :job_id" if job_id is not None else ""
+        query = f"DELETE FROM {self._name} WHERE controller = :controller{where};"
+        params = {"controller": controller, "job_id": None if job_id is None else str(job_id)}
+        return self._database.delete(query=query, params=params)
@@ -50,12 +50,18 @@ JOB_DATABASE_DTYPES = {
     "category": VARCHAR(64),
     "complete": TINYINT,
     "completed": VARCHAR(64),
+    "leased_by": VARCHAR(128),
+    "lease_expires": DATETIME,
 }
 
 
 class JobRepo(Repo):
     """Repository tracking progress of ETL
 
+    Jobs are claimed by workers with a lease, so that controllers in several processes, on one
+    or more machines, may run against the same database without claiming the same job. A
+    lease expires unless renewed, so that the jobs of workers that die are claimed again.
+
     Args:
         database(Database): Database containing data to access.
     """
@@ -90,6 +96,7 @@ class JobRepo(Repo):
             data (pd.DataFrame): DataFrame containing rows to add to the table.
         """
         data = self._parse_datetime(data=data, dtcols="completed")
+        data = self._add_lease(data=data)
 
         self._database.insert(
             data=data, tablename=self._name, dtype=JOB_DATABASE_DTYPES, if_exists="append"
@@ -109,34 +116,107 @@ class JobRepo(Repo):
         df = super().get(id=id, dtypes=dtypes, parse_dates=parse_dates)
         return Job.from_df(df=df)
 
-    def next(self, controller: str) -> Job:
-        """Returns a randomly selected job not yet completed"""
+    def next(self, controller: str, priorities: dict = None) -> Job:
+        """Returns the job not yet completed with the highest priority, or a random one.
+
+        Args:
+            controller (str): The name of the controller whose jobs are served.
+            priorities (dict): Maps category id to the priority of its job. If None, a job
+                is selected at random.
+        """
 
         df = self.getall()
         jobs = df.loc[(df["complete"] == False) & (df["controller"] == controller)]  # noqa
         if len(jobs) == 0:
             return None
+        elif priorities:
+            priority = jobs["category_id"].astype(str).map(priorities).fillna(0)
+            job = jobs.loc[[priority.idxmax()]]
+            return Job.from_df(df=job)
         else:
             job = jobs.sample(n=1)
             return Job.from_df(df=job)
 
+    def claim(
+        self, controller: str, worker: str, lease: int = 1800, priorities: dict = None
+    ) -> Job:
+        """Claims the job not yet completed nor leased with the highest priority, or a random one.
+
+        Each candidate is claimed by an update conditioned on the job being unleased, or its
+        lease having expired, so that of concurrent claims of the same job exactly one
+        succeeds. The others move on to the next candidate. Lease times are those of the
+        database server, so that the clocks of the workers' machines need not agree.
+
+        Args:
+            controller (str): The name of the controller whose jobs are served.
+            worker (str): Identifies the claiming worker.
+            lease (int): Number of seconds before the claim expires, unless renewed. Default = 1800
+            priorities (dict): Maps category id to the priority of its job. If None, jobs
+                are claimed in random order.
+        """
+        query = f"""SELECT * FROM {self._name} WHERE controller = :controller AND complete = 0
+            AND (lease_expires IS NULL OR lease_expires < NOW());"""
+        params = {"controller": controller}
+        jobs = self._database.query(
+            query=query, params=params, dtypes=JOB_DATAFRAME_DTYPES, parse_dates=JOB_PARSE_DATES
+        )
+        if priorities:
+            priority = jobs["category_id"].astype(str).map(priorities).fillna(0)
+            jobs = jobs.loc[priority.sort_values(ascending=False).index]
+        else:
+            jobs = jobs.sample(frac=1)
+
+        query = f"""UPDATE {self._name} SET leased_by = :worker,
+            lease_expires = NOW() + INTERVAL :lease SECOND
+            WHERE id = :id AND complete = 0 AND (lease_expires IS NULL OR lease_expires < NOW());"""
+        for idx in jobs.index:
+            params = {"worker": worker, "lease": lease, "id": jobs.loc[idx, "id"]}
+            claimed = self._database.update(query=query, params=params)
+            self.save()
+            if claimed == 1:
+                msg = f"Worker {worker} claimed job {jobs.loc[idx, 'id']}."
+                self._logger.debug(msg)
+                return Job.from_df(df=jobs.loc[[idx]])
+        return None
+
+    def renew(self, id: str, worker: str, lease: int = 1800) -> bool:  # noqa
+        """Extends the lease of a claimed job, and returns False if the worker no longer holds it.
+
+        Args:
+            id (str): The job id.
+            worker (str): Identifies the worker holding the lease.
+            lease (int): Number of seconds from now before the claim expires. Default = 1800
+        """
+        query = f"""UPDATE {self._name} SET lease_expires = NOW() + INTERVAL :lease SECOND
+            WHERE id = :id AND leased_by = :worker;"""
+        params = {"id": id, "worker": worker, "lease": lease}
+        return self._database.update(query=query, params=params) == 1
+
     def getall(
         self, dtypes: dict = JOB_DATAFRAME_DTYPES, parse_dates: dict = JOB_PARSE_DATES
     ) -> pd.DataFrame:
         """Returns all data in the repository."""
         return super().getall(dtypes=dtypes, parse_dates=parse_dates)
 
-    def update(self, job: Job) -> None:
-        """Updates a job in the database"""
-        query = (
-            f"UPDATE {self._name} SET complete = :complete, completed = :completed WHERE id = :id;"
-        )
+    def update(self, job: Job, worker: str = None) -> int:
+        """Updates a job in the database, releasing its lease, and returns the rows updated.
+
+        Args:
+            job (Job): The job to update.
+            worker (str): If provided, the job is updated only while this worker holds its
+                lease. Default = None
+        """
+        query = f"""UPDATE {self._name} SET complete = :complete, completed = :completed,
+            leased_by = NULL, lease_expires = NULL WHERE id = :id"""
         params = {
             "complete": job.complete,
             "completed": job.completed,
             "id": job.id,
         }
-        self._database.update(query=query, params=params)
+        if worker is not None:
+            query += " AND leased_by = :worker"
+            params["worker"] = worker
+        return self._database.update(query=query + ";", params=params)
 
     def replace(self, data: pd.DataFrame) -> None:
         """Replaces the data in a repository with that of the data parameter.
@@ -145,6 +225,7 @@ class JobRepo(Repo):
             data (pd.DataFrame): DataFrame containing rows to add to the table.
         """
         data = self._parse_datetime(data=data, dtcols="completed")
+        data = self._add_lease(data=data)
 
         self._database.insert(
             data=data, tablename=self._name, dtype=JOB_DATABASE_DTYPES, if_exists="replace"
@@ -157,6 +238,14 @@ class JobRepo(Repo):
         """Summarizes the app data by category"""
         return self.getall()
 
+    def _add_lease(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Adds empty lease columns to jobs without them, so that the table has them."""
+        data = data.copy()
+        for column in ("leased_by", "lease_expires"):
+            if column not in data.columns:
+                data[column] = None
+        return data
+
 
 # ------------------------------------------------------------------------------------------------ #
 #                           RATING JOBRUN DATAFRAME DATA TYPES                                     #
@@ -17,19 +17,22 @@
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
 import logging
+from typing import Iterator
+from datetime import datetime
 
 import pandas as pd
 import numpy as np
 
 from appstore.data.entity.rating import Rating
 from appstore.data.dataset.rating import RatingDataset
-from appstore.data.repo.base import Repo
+from appstore.data.repo.base import Repo, concat_chunks
 from appstore.infrastructure.database.base import Database
 from appstore.infrastructure.file.config import FileConfig
 from sqlalchemy.dialects.mysql import (
     BIGINT,
     VARCHAR,
     FLOAT,
+    DATETIME,
 )
 
 # ------------------------------------------------------------------------------------------------ #
@@ -50,8 +53,34 @@ DATAFRAME_DTYPES = {
     "fivestar": np.int64,
 }
 PARSE_DATES = {
-    # "extracted": {"errors": "coerce", "format": "%Y-%m-%d %H:%M:%S", "exact": False},
+    "extracted": {"errors": "coerce", "format": "%Y-%m-%d %H:%M:%S", "exact": False},
 }
+# The columns of the Rating entity, from which the RatingDataset is built.
+DATASET_COLUMNS = [
+    "id",
+    "name",
+    "category_id",
+    "category",
+    "rating",
+    "reviews",
+    "ratings",
+    "onestar",
+    "twostar",
+    "threestar",
+    "fourstar",
+    "fivestar",
+]
+# The columns compared to detect a change in an app's ratings.
+COUNT_COLUMNS = [
+    "rating",
+    "reviews",
+    "ratings",
+    "onestar",
+    "twostar",
+    "threestar",
+    "fourstar",
+    "fivestar",
+]
 # ------------------------------------------------------------------------------------------------ #
 #                                      DATABASE DATA TYPES                                         #
 # ------------------------------------------------------------------------------------------------ #
@@ -68,7 +97,7 @@ DATABASE_DTYPES = {
     "threestar": BIGINT,
     "fourstar": BIGINT,
     "fivestar": BIGINT,
-    # "extracted": VARCHAR(32),
+    "extracted": DATETIME,
 }
 
 
@@ -114,14 +143,154 @@ class RatingRepo(Repo):
         else:
             return None
 
-    def getall(self) -> pd.DataFrame:
-        """Returns all data in the repository."""
+    def get_counts(self, category_id: str = None) -> pd.DataFrame:
+        """Returns the number of reviews and ratings of each app, optionally for one category.
+
+        Args:
+            category_id (str): The mobile app category. If None, all apps are returned.
+        """
+        where = "WHERE category_id = :category_id " if category_id is not None else ""
+        query = f"SELECT id, category_id, MAX(reviews) AS reviews, MAX(ratings) AS ratings FROM {self._name} {where}GROUP BY id, category_id;"
+        params = {"category_id": category_id}
+        return self._database.query(query=query, params=params)
+
+    def get_review_counts(self, category_id: str) -> dict:
+        """Returns the number of reviews of each app in a category, keyed by app id.
+
+        Args:
+            category_id (str): The mobile app category.
+        """
+        df = self.get_counts(category_id=category_id)
+        return dict(zip(df["id"].astype(str), df["reviews"].astype(int)))
+
+    def get_extracted(self, category_id: str) -> dict:
+        """Returns the time each app's ratings were last extracted, keyed by app id.
+
+        Args:
+            category_id (str): The mobile app category.
+        """
+        query = f"SELECT id, MAX(extracted) AS extracted FROM {self._name} WHERE category_id = :category_id GROUP BY id;"
+        params = {"category_id": category_id}
+        df = self._database.query(query=query, params=params, parse_dates=PARSE_DATES)
+        return dict(zip(df["id"].astype(str), df["extracted"]))
+
+    def upsert(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Writes the ratings of apps that are new or whose counts changed, and returns them.
+
+        Stored rows of apps whose counts changed are replaced. The counts of the remaining
+        apps are unchanged, and only their extraction time is updated.
+
+        Args:
+            data (pd.DataFrame): DataFrame containing the ratings, with an 'extracted' column.
+        """
+        ids = data["id"].astype(str).tolist()
+        params = {f"id{i}": id for i, id in enumerate(ids)}
+        placeholders = ", ".join(f":{key}" for key in params)
 
-        return super().getall(dtypes=DATAFRAME_DTYPES)
+        columns = ", ".join(COUNT_COLUMNS)
+        query = f"SELECT id, {columns} FROM {self._name} WHERE id IN ({placeholders});"
+        stored = self._database.query(query=query, params=params)
+        stored = stored.drop_duplicates(subset="id", keep="last").set_index("id")
+        stored.index = stored.index.astype(str)
 
-    def get_dataset(self) -> RatingDataset:
-        df = self.getall()
-        return RatingDataset(df=df)
+        incoming = data.set_index(data["id"].astype(str))
+        stored = stored.reindex(incoming.index)
+        changed = stored[COUNT_COLUMNS].isna().any(axis=1)
+        changed |= ~np.isclose(incoming["rating"], stored["rating"].astype(float))
+        for column in COUNT_COLUMNS[1:]:
+            changed |= incoming[column].to_numpy() != stored[column].to_numpy()
+        changed = changed.to_numpy()
+
+        if changed.any():
+            self._delete_ids(ids=incoming.index[changed & stored["rating"].notna().to_numpy()])
+            self.load(data=data.loc[changed])
+        if (~changed).any():
+            unchanged = incoming.index[~changed]
+            params = {f"id{i}": id for i, id in enumerate(unchanged)}
+            placeholders = ", ".join(f":{key}" for key in params)
+            query = f"UPDATE {self._name} SET extracted = :extracted WHERE id IN ({placeholders});"
+            params["extracted"] = data["extracted"].max().to_pydatetime()
+            self._database.update(query=query, params=params)
+
+        msg = f"Upserted {data.shape[0]} rows to the {self._name} repository. {int(changed.sum())} changed."
+        self._logger.debug(msg)
+        return data.loc[changed]
+
+    def _delete_ids(self, ids: list) -> None:
+        if len(ids) == 0:
+            return
+        params = {f"id{i}": id for i, id in enumerate(ids)}
+        placeholders = ", ".join(f":{key}" for key in params)
+        query = f"DELETE FROM {self._name} WHERE id IN ({placeholders});"
+        self._database.delete(query=query, params=params)
+
+    def getall(self, columns: list = None) -> pd.DataFrame:
+        """Returns all data in the repository.
+
+        Args:
+            columns (list): Columns to return. If None, all columns are returned.
+        """
+
+        return super().getall(dtypes=DATAFRAME_DTYPES, columns=columns)
+
+    def get_by_category(self, category_id: str, columns: list = None) -> pd.DataFrame:
+        """Returns the data for the category.
+
+        Args:
+            category_id (str): The four character AppStore category identifier.
+            columns (list): Columns to return. If None, all columns are returned.
+        """
+        return super().get_by_category(
+            category_id=category_id, dtypes=DATAFRAME_DTYPES, columns=columns
+        )
+
+    def sample(
+        self, n: int = 5, frac: float = None, category_id: str = None, random_state: int = None
+    ) -> pd.DataFrame:
+        """Returns a random sample of the repository in a typed DataFrame.
+
+        Args:
+            n (int): Number of samples to return. Default = 5
+            frac (float): Proportion of the data to return. n is ignored
+                if this variable is non-null. Optional
+            category_id (str): Four character category_id. Optional
+            random_state (int): Seed for pseudo random generation.
+        """
+        return super().sample(
+            n=n,
+            frac=frac,
+            category_id=category_id,
+            random_state=random_state,
+            dtypes=DATAFRAME_DTYPES,
+            parse_dates=PARSE_DATES,
+        )
+
+    def iter_chunks(
+        self, chunksize: int = 10000, columns: list = None, where: str = None, params: dict = None
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the rows of the repository in typed DataFrames of at most chunksize rows.
+
+        Args:
+            chunksize (int): Maximum number of rows per DataFrame. Default = 10000
+            columns (list): Columns to return. If None, all columns are returned.
+            where (str): Condition on the rows, with named parameters.
+            params (dict): Parameters of the condition.
+        """
+        yield from super().iter_chunks(
+            chunksize=chunksize,
+            columns=columns,
+            where=where,
+            params=params,
+            dtypes=DATAFRAME_DTYPES,
+        )
+
+    def get_dataset(self, columns: list = DATASET_COLUMNS) -> RatingDataset:
+        """Returns the dataset, built from typed chunks of the columns it uses.
+
+        Args:
+            columns (list): Columns to read. Default = DATASET_COLUMNS
+        """
+        return RatingDataset(df=concat_chunks(self.iter_chunks(columns=columns)))
 
     def replace(self, data: pd.DataFrame) -> None:
         """Replaces the data in a repository with that of the data parameter.
@@ -138,11 +307,99 @@ class RatingRepo(Repo):
     @property
     def summary(self) -> pd.DataFrame:
         """Summarizes the app data by category"""
-        df = self.getall()
-        summary = df["category"].value_counts().reset_index()
-        df2 = df.groupby(by="category")["id"].nunique().to_frame()
-        df3 = df.groupby(by="category")["rating"].mean().to_frame()
-        summary = summary.join(df2, on="category")
-        summary = summary.join(df3, on="category")
+        query = f"""SELECT category, COUNT(*) AS reviews, COUNT(DISTINCT id) AS apps,
+            AVG(rating) AS rating FROM {self._name} GROUP BY category ORDER BY reviews DESC;"""
+        dtypes = {"reviews": np.int64, "apps": np.int64, "rating": np.float64}
+        summary = self._database.query(query=query, dtypes=dtypes)
         summary.columns = ["Category", "Reviews", "Apps", "Average Rating"]
         return summary
+
+
+# ------------------------------------------------------------------------------------------------ #
+class RatingHistoryRepo(Repo):
+    """Repository of rating snapshots, one row per app each time its ratings are observed.
+
+    Args:
+        database(Database): Database containing data to access.
+    """
+
+    __name = "rating_history"
+
+    def __init__(self, database: Database, config=FileConfig) -> None:
+        super().__init__(name=self.__name, database=database, config=config)
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+    def load(self, data: pd.DataFrame) -> None:
+        """Adds the dataframe rows to the designated table.
+
+        Args:
+            data (pd.DataFrame): DataFrame containing rows to add to the table.
+        """
+        self._database.insert(
+            data=data, tablename=self._name, dtype=DATABASE_DTYPES, if_exists="append"
+        )
+        msg = f"Added {data.shape[0]} rows to the {self._name} repository."
+        self._logger.debug(msg)
+
+    def getall(self) -> pd.DataFrame:
+        """Returns all data in the repository."""
+
+        return super().getall(dtypes=DATAFRAME_DTYPES, parse_dates=PARSE_DATES)
+
+    def replace(self, data: pd.DataFrame) -> None:
+        """Replaces the data in a repository with that of the data parameter.
+
+        Args:
+            data (pd.DataFrame): DataFrame containing rows to add to the table.
+        """
+        self._database.insert(
+            data=data, tablename=self._name, dtype=DATABASE_DTYPES, if_exists="replace"
+        )
+        msg = f"Replace {self._name} repository data with {data.shape[0]} rows."
+        self._logger.debug(msg)
+
+    def get_velocity(self, since: datetime = None) -> pd.DataFrame:
+        """Returns the ratings and reviews gained per day by each app between its snapshots.
+
+        The first and last snapshot of each app are selected by the database, so that only
+        two rows per app are read. Apps with a single snapshot time are omitted.
+
+        Args:
+            since (datetime): Snapshots before this time are ignored. If None, all are used.
+        """
+        where = "" if since is None else " WHERE extracted >= :since"
+        params = {} if since is None else {"since": since}
+        columns = [
+            "id", "name", "category_id", "category", "extracted", "rating", "ratings", "reviews"
+        ]
+        select = ", ".join(f"h.`{column}`" for column in columns)
+        query = f"""SELECT {select} FROM {self._name} h JOIN (
+            SELECT id, MIN(extracted) AS first_extracted, MAX(extracted) AS last_extracted
+            FROM {self._name}{where}
+            GROUP BY id HAVING MAX(extracted) > MIN(extracted)
+            ) span ON h.id = span.id
+            AND (h.extracted = span.first_extracted OR h.extracted = span.last_extracted);"""
+        df = self._database.query(
+            query=query,
+            params=params,
+            dtypes=DATAFRAME_DTYPES,
+            parse_dates=PARSE_DATES,
+            columns=columns,
+        )
+        df = df.sort_values("extracted")
+        grouped = df.groupby("id", observed=True)
+        first, last = grouped.first(), grouped.last()
+        days = (last["extracted"] - first["extracted"]).dt.total_seconds() / 86400
+        days = days.where(days > 0)
+        velocity = pd.DataFrame(
+            {
+                "name": last["name"],
+                "category_id": last["category_id"],
+                "category": last["category"],
+                "days": days,
+                "ratings_per_day": (last["ratings"] - first["ratings"]) / days,
+                "reviews_per_day": (last["reviews"] - first["reviews"]) / days,
+                "rating_change": last["rating"] - first["rating"],
+            }
+        )
+        return velocity.dropna(subset=["days"]).reset_index()
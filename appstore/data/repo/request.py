@@ -28,6 +28,7 @@ from appstore.infrastructure.file.config import FileConfig
 from sqlalchemy.dialects.mysql import (
     VARCHAR,
     INTEGER,
+    DATETIME,
 )
 
 # ------------------------------------------------------------------------------------------------ #
@@ -37,6 +38,10 @@ DATAFRAME_DTYPES = {
     "id": "string",
     "category_id": "category",
     "last_index": np.int64,
+    "last_review_id": "string",
+}
+PARSE_DATES = {
+    "last_review_date": {"errors": "coerce", "format": "%Y-%m-%d %H:%M:%S", "exact": False},
 }
 
 # ------------------------------------------------------------------------------------------------ #
@@ -46,6 +51,8 @@ DATABASE_DTYPES = {
     "id": VARCHAR(64),
     "category_id": VARCHAR(8),
     "last_index": INTEGER,
+    "last_review_date": DATETIME,
+    "last_review_id": VARCHAR(64),
 }
 
 
@@ -92,7 +99,7 @@ class ReviewRequestRepo(Repo):
             dtypes (dict): Dictionary mapping of column to data types
             parse_dates (dict): Dictionary of columns and keyword arguments for datetime parsing.
         """
-        df = super().get(id=id, dtypes=dtypes)
+        df = super().get(id=id, dtypes=dtypes, parse_dates=PARSE_DATES)
         if len(df) > 0:
             return ReviewRequest.from_df(df=df)
         else:
@@ -101,7 +108,19 @@ class ReviewRequestRepo(Repo):
     def getall(self) -> pd.DataFrame:
         """Returns all data in the repository."""
 
-        return super().getall(dtypes=DATAFRAME_DTYPES)
+        return super().getall(dtypes=DATAFRAME_DTYPES, parse_dates=PARSE_DATES)
+
+    def get_last_indices(self, category_id: str = None) -> dict:
+        """Returns the index of the last review requested for each app, keyed by app id.
+
+        Args:
+            category_id (str): The mobile app category. If None, all apps are returned.
+        """
+        where = " WHERE category_id = :category_id" if category_id is not None else ""
+        query = f"SELECT id, last_index FROM {self._name}{where};"
+        params = {"category_id": category_id}
+        df = self._database.query(query=query, params=params)
+        return dict(zip(df["id"].astype(str), df["last_index"].astype(int)))
 
     def update(self, request: ReviewRequest) -> None:
         """Updates a request in the repository
@@ -115,8 +134,13 @@ class ReviewRequestRepo(Repo):
             exists = False
 
         if exists:
-            query = f"""UPDATE {self._name} SET last_index=:last_index WHERE id =:id;"""
-            params = {"id": request.id, "last_index": request.last_index}
+            query = f"""UPDATE {self._name} SET last_index=:last_index, last_review_date=:last_review_date, last_review_id=:last_review_id WHERE id =:id;"""
+            params = {
+                "id": request.id,
+                "last_index": request.last_index,
+                "last_review_date": request.last_review_date,
+                "last_review_id": request.last_review_id,
+            }
             self._database.update(query=query, params=params)
         else:
             msg = f"Request for id: {request.id} does not exist."
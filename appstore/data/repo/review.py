@@ -17,11 +17,12 @@
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
 import logging
+from typing import Iterator
 
 import pandas as pd
 import numpy as np
 
-from appstore.data.repo.base import Repo
+from appstore.data.repo.base import Repo, concat_chunks
 from appstore.data.entity.review import Review
 from appstore.data.dataset.review import ReviewDataset
 from appstore.infrastructure.database.base import Database
@@ -55,6 +56,21 @@ PARSE_DATES = {
     "date": {"errors": "coerce", "format": "%Y-%m-%d %H:%M:%S", "exact": False},
     # "extracted": {"errors": "coerce", "format": "%Y-%m-%d %H:%M:%S", "exact": False},
 }
+# The columns of the Review entity, from which the ReviewDataset is built.
+DATASET_COLUMNS = [
+    "id",
+    "app_id",
+    "app_name",
+    "category_id",
+    "category",
+    "author",
+    "rating",
+    "title",
+    "content",
+    "vote_sum",
+    "vote_count",
+    "date",
+]
 
 # ------------------------------------------------------------------------------------------------ #
 #                                      DATABASE DATA TYPES                                         #
@@ -119,10 +135,55 @@ class ReviewRepo(Repo):
         else:
             return None
 
-    def getall(self) -> pd.DataFrame:
-        """Returns all data in the repository."""
+    def getall(self, columns: list = None) -> pd.DataFrame:
+        """Returns all data in the repository.
 
-        return super().getall(dtypes=DATAFRAME_DTYPES, parse_dates=PARSE_DATES)
+        Args:
+            columns (list): Columns to return. If None, all columns are returned.
+        """
+
+        return super().getall(dtypes=DATAFRAME_DTYPES, parse_dates=PARSE_DATES, columns=columns)
+
+    def sample(
+        self, n: int = 5, frac: float = None, category_id: str = None, random_state: int = None
+    ) -> pd.DataFrame:
+        """Returns a random sample of the repository in a typed DataFrame.
+
+        Args:
+            n (int): Number of samples to return. Default = 5
+            frac (float): Proportion of the data to return. n is ignored
+                if this variable is non-null. Optional
+            category_id (str): Four character category_id. Optional
+            random_state (int): Seed for pseudo random generation.
+        """
+        return super().sample(
+            n=n,
+            frac=frac,
+            category_id=category_id,
+            random_state=random_state,
+            dtypes=DATAFRAME_DTYPES,
+            parse_dates=PARSE_DATES,
+        )
+
+    def iter_chunks(
+        self, chunksize: int = 10000, columns: list = None, where: str = None, params: dict = None
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the rows of the repository in typed DataFrames of at most chunksize rows.
+
+        Args:
+            chunksize (int): Maximum number of rows per DataFrame. Default = 10000
+            columns (list): Columns to return. If None, all columns are returned.
+            where (str): Condition on the rows, with named parameters.
+            params (dict): Parameters of the condition.
+        """
+        yield from super().iter_chunks(
+            chunksize=chunksize,
+            columns=columns,
+            where=where,
+            params=params,
+            dtypes=DATAFRAME_DTYPES,
+            parse_dates=PARSE_DATES,
+        )
 
     def replace(self, data: pd.DataFrame) -> None:
         """Replaces the data in a repository with that of the data parameter.
@@ -136,17 +197,21 @@ class ReviewRepo(Repo):
         msg = f"Replace {self._name} repository data with {data.shape[0]} rows."
         self._logger.debug(msg)
 
-    def get_dataset(self) -> ReviewDataset:
-        df = self.getall()
-        return ReviewDataset(df=df)
+    def get_dataset(self, columns: list = DATASET_COLUMNS) -> ReviewDataset:
+        """Returns the dataset, built from typed chunks of the columns it uses.
+
+        Args:
+            columns (list): Columns to read. Default = DATASET_COLUMNS
+        """
+        return ReviewDataset(df=concat_chunks(self.iter_chunks(columns=columns)))
 
     @property
     def summary(self) -> pd.DataFrame:
         """Summarizes the app data by category"""
-        df = self.getall()
-        df2 = df.groupby(["category"])["id"].nunique().to_frame()
-        df3 = df.groupby(["category"])["app_id"].nunique().to_frame()
-        summary = df2.join(df3, on="category").reset_index()
+        query = f"""SELECT category, COUNT(DISTINCT id) AS reviews, COUNT(DISTINCT app_id) AS apps
+            FROM {self._name} GROUP BY category ORDER BY category;"""
+        dtypes = {"reviews": np.int64, "apps": np.int64}
+        summary = self._database.query(query=query, dtypes=dtypes)
         summary.columns = ["Category", "Reviews", "Apps"]
         return summary
 
@@ -18,6 +18,7 @@
 # ================================================================================================ #
 import logging
 
+from appstore.config import Config
 from appstore.infrastructure.database.base import Database
 from appstore.data.repo.base import Repo
 
@@ -28,6 +29,8 @@ from appstore.data.repo.base import Repo
 class UoW:
     """Unit of Work class encapsulating the repositories used in project objects.
 
+    Each repository is created on first access and reused thereafter.
+
     Args:
         database (Database): A Database instance from the dependency injector container.
         content (Repo): The content repository
@@ -46,6 +49,8 @@ class UoW:
         rating_jobrun_repo: Repo,
         review_jobrun_repo: Repo,
         review_request_repo: Repo,
+        rating_history_repo: Repo,
+        checkpoint_repo: Repo,
     ) -> None:
         self._database = database
         self._appdata_repo = appdata_repo
@@ -56,7 +61,10 @@ class UoW:
         self._rating_jobrun_repo = rating_jobrun_repo
         self._review_jobrun_repo = review_jobrun_repo
         self._review_request_repo = review_request_repo
+        self._rating_history_repo = rating_history_repo
+        self._checkpoint_repo = checkpoint_repo
 
+        self._repos = {}  # Repository instances, keyed by name, created on first access.
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
     @property
@@ -65,35 +73,48 @@ class UoW:
 
     @property
     def appdata_repo(self) -> Repo:
-        return self._appdata_repo(database=self._database)
+        return self._repo(name="appdata_repo")
 
     @property
     def review_repo(self) -> Repo:
-        return self._review_repo(database=self._database)
+        return self._repo(name="review_repo")
 
     @property
     def rating_repo(self) -> Repo:
-        return self._rating_repo(database=self._database)
+        return self._repo(name="rating_repo")
 
     @property
     def appdata_project_repo(self) -> Repo:
-        return self._appdata_project_repo(database=self._database)
+        return self._repo(name="appdata_project_repo")
 
     @property
     def job_repo(self) -> Repo:
-        return self._job_repo(database=self._database)
+        return self._repo(name="job_repo")
 
     @property
     def rating_jobrun_repo(self) -> Repo:
-        return self._rating_jobrun_repo(database=self._database)
+        return self._repo(name="rating_jobrun_repo")
 
     @property
     def review_jobrun_repo(self) -> Repo:
-        return self._review_jobrun_repo(database=self._database)
+        return self._repo(name="review_jobrun_repo")
 
     @property
     def review_request_repo(self) -> Repo:
-        return self._review_request_repo(database=self._database)
+        return self._repo(name="review_request_repo")
+
+    @property
+    def rating_history_repo(self) -> Repo:
+        return self._repo(name="rating_history_repo")
+
+    @property
+    def checkpoint_repo(self) -> Repo:
+        return self._repo(name="checkpoint_repo")
+
+    def reload(self) -> None:
+        """Discards the repositories and the parsed configuration files, so both are re-created."""
+        Config.reload()
+        self._repos = {}
 
     def connect(self) -> None:
         """Connects the database"""
@@ -114,3 +135,11 @@ class UoW:
     def close(self) -> None:
         """Closes the sqlite connection."""
         self._database.close()
+
+    def _repo(self, name: str) -> Repo:
+        """Returns the named repository, creating it on first access."""
+        repo = self._repos.get(name)
+        if repo is None:
+            repo = getattr(self, f"_{name}")(database=self._database)
+            self._repos[name] = repo
+        return repo
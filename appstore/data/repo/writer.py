@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/data/repo/writer.py                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 04:12:37 pm                                                #
+# Modified   : Sunday October 18th 2026 04:12:37 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+"""Write-Behind Persistence Module"""
+from __future__ import annotations
+import queue
+import logging
+import threading
+from time import monotonic
+
+import pandas as pd
+
+from appstore.data.repo.uow import UoW
+
+
+# ------------------------------------------------------------------------------------------------ #
+class BackgroundWriter:
+    """Persists data on a background thread, so that scraping and persistence overlap.
+
+    Loads are queued by repository and coalesced into a single multi-row insert per repository.
+    Updates are queued by repository, method and key, and only the most recent update for each
+    key is written. A batch is written, loads first and then updates, and committed as one
+    transaction when it reaches batch_rows rows, when flush_interval seconds have elapsed, or
+    when flush or close is called. Since loads precede updates in each batch, an update that
+    records progress is never committed ahead of the data it describes.
+
+    If a batch fails, it is rolled back and held, and nothing further is committed until the
+    exception has been raised to the producer, by the next call to load, update, flush or
+    close. The held batch, with anything queued since, is written with the next batch.
+
+    The writer uses its own unit of work, and hence its own database connection. When the
+    queue is full, the producer blocks until the writer catches up.
+
+    Args:
+        uow (UoW): Unit of Work on a connection used only by the writer.
+        maxsize (int): Maximum number of queued loads and updates. Default = 100
+        batch_rows (int): Number of queued rows at which a batch is written. Default = 10000
+        flush_interval (float): Maximum number of seconds between batches. Default = 5
+    """
+
+    def __init__(
+        self,
+        uow: UoW,
+        maxsize: int = 100,
+        batch_rows: int = 10000,
+        flush_interval: float = 5,
+    ) -> None:
+        self._uow = uow
+        self._batch_rows = batch_rows
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._error = None
+        self._batches = 0
+        self._rows = 0
+
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+    def __enter__(self) -> BackgroundWriter:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(raise_error=exc_type is None)
+
+    @property
+    def batches(self) -> int:
+        """Returns the number of batches committed."""
+        return self._batches
+
+    @property
+    def rows(self) -> int:
+        """Returns the number of rows loaded."""
+        return self._rows
+
+    def start(self) -> None:
+        """Starts the writer thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="BackgroundWriter", daemon=True)
+            self._thread.start()
+
+    def load(self, repo: str, data: pd.DataFrame, checkpoint: dict = None) -> None:
+        """Queues rows for insert into a repository.
+
+        Args:
+            repo (str): Name of the repository property of the unit of work, i.e. 'review_repo'.
+            data (pd.DataFrame): The rows to insert.
+            checkpoint (dict): Keyword arguments of CheckpointRepo.save, for the checkpoint
+                that follows the rows. It is committed in the same batch as the rows.
+
+        Raises the first exception that occurred on the writer thread, if any.
+        """
+        self._raise()
+        self._queue.put(("load", repo, (data, checkpoint)))
+
+    def update(self, repo: str, key: str, method: str = "update", **kwargs) -> None:
+        """Queues a call to a repository method, replacing any queued call with the same key.
+
+        Args:
+            repo (str): Name of the repository property of the unit of work.
+            key (str): Identifies the entity updated, i.e. its id.
+            method (str): Name of the repository method. Default = 'update'
+            **kwargs: Keyword arguments passed to the method.
+
+        Raises the first exception that occurred on the writer thread, if any.
+        """
+        self._raise()
+        self._queue.put(("update", (repo, method, key), kwargs))
+
+    def flush(self) -> None:
+        """Blocks until all queued loads and updates are committed.
+
+        Raises the first exception that occurred on the writer thread, if any.
+        """
+        if self._thread is not None:
+            done = threading.Event()
+            self._queue.put(("flush", done, None))
+            done.wait()
+        self._raise()
+
+    def close(self, raise_error: bool = True) -> None:
+        """Commits all queued loads and updates, stops the writer thread and closes its connection.
+
+        Args:
+            raise_error (bool): Whether the first exception that occurred on the writer
+                thread is raised. Default = True
+        """
+        if self._thread is not None:
+            self._queue.put(("stop", None, None))
+            self._thread.join()
+            self._thread = None
+            self._uow.close()
+        if raise_error:
+            self._raise()
+
+    def _run(self) -> None:
+        loads = {}  # Maps repository to the frames queued for it.
+        updates = {}  # Maps (repository, method, key) to the latest keyword arguments.
+        rows = 0
+        deadline = monotonic() + self._flush_interval
+        while True:
+            try:
+                op, target, payload = self._queue.get(timeout=max(deadline - monotonic(), 0))
+            except queue.Empty:
+                op, target, payload = "tick", None, None
+
+            if op == "load":
+                data, checkpoint = payload
+                loads.setdefault(target, []).append(data)
+                rows += len(data)
+                if checkpoint is not None:
+                    key = ("checkpoint_repo", "save", (checkpoint["controller"], checkpoint["id"]))
+                    updates[key] = checkpoint
+            elif op == "update":
+                updates[target] = payload
+
+            if op != "update" and (op != "load" or rows >= self._batch_rows):
+                # Batches are held while an exception is pending, and cleared once written.
+                if self._error is None and self._write(loads=loads, updates=updates, rows=rows):
+                    loads, updates, rows = {}, {}, 0
+                deadline = monotonic() + self._flush_interval
+
+            if op == "flush":
+                target.set()
+            elif op == "stop":
+                if len(loads) > 0 or len(updates) > 0:
+                    msg = f"Stopped with {rows} rows and {len(updates)} updates unwritten."
+                    self._logger.warning(msg)
+                return
+
+    def _write(self, loads: dict, updates: dict, rows: int) -> bool:
+        """Writes and commits a batch, rolling back and returning False if any part of it fails."""
+        if len(loads) == 0 and len(updates) == 0:
+            return True
+        try:
+            for repo, frames in loads.items():
+                getattr(self._uow, repo).load(data=pd.concat(frames, ignore_index=True))
+            for (repo, method, _), kwargs in updates.items():
+                getattr(getattr(self._uow, repo), method)(**kwargs)
+            self._uow.save()
+            self._batches += 1
+            self._rows += rows
+            return True
+        except Exception as e:
+            msg = f"{type(e)} exception occurred writing a batch of {rows} rows. Rolling back.\n{e}"
+            self._logger.exception(msg)
+            self._uow.rollback()
+            self._error = e
+            return False
+
+    def _raise(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
@@ -20,6 +20,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 import logging
+from typing import Iterator
 
 import sqlalchemy
 from sqlalchemy.exc import SQLAlchemyError
@@ -192,7 +193,12 @@ class Database(ABC):
         return result.rowcount
 
     def query(
-        self, query: str, params: dict = (), dtypes: dict = None, parse_dates: dict = None
+        self,
+        query: str,
+        params: dict = (),
+        dtypes: dict = None,
+        parse_dates: dict = None,
+        columns: list = None,
     ) -> pd.DataFrame:
         """Fetches the next row of a query result set, returning a single sequence, or None if no more data
         Args:
@@ -200,10 +206,15 @@ class Database(ABC):
             params (dict): Parameters for the SQL command
             dtypes (dict): Dictionary mapping of column to data types
             parse_dates (dict): Dictionary of columns and keyword arguments for datetime parsing.
+            columns (list): The columns selected by the query. If provided, dtypes and
+                parse_dates are restricted to these columns.
 
         Returns: Pandas DataFrame
 
         """
+        if columns is not None:
+            dtypes = {k: v for k, v in (dtypes or {}).items() if k in columns} or None
+            parse_dates = {k: v for k, v in (parse_dates or {}).items() if k in columns} or None
         return pd.read_sql(
             sql=sqlalchemy.text(query),
             con=self._connection,
@@ -212,6 +223,44 @@ class Database(ABC):
             parse_dates=parse_dates,
         )
 
+    def iter_query(
+        self,
+        query: str,
+        params: dict = (),
+        chunksize: int = 10000,
+        dtypes: dict = None,
+        parse_dates: dict = None,
+        columns: list = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the result set of a query in DataFrames of at most chunksize rows.
+
+        Rows are streamed from a server-side cursor on a connection of its own, so the result
+        set is never held in memory in full, and this connection remains free for other
+        statements while the result is consumed.
+
+        Args:
+            query (str): The SQL command
+            params (dict): Parameters for the SQL command
+            chunksize (int): Maximum number of rows per DataFrame. Default = 10000
+            dtypes (dict): Dictionary mapping of column to data types
+            parse_dates (dict): Dictionary of columns and keyword arguments for datetime parsing.
+            columns (list): The columns selected by the query. If provided, dtypes and
+                parse_dates are restricted to these columns.
+        """
+        if columns is not None:
+            dtypes = {k: v for k, v in (dtypes or {}).items() if k in columns} or None
+            parse_dates = {k: v for k, v in (parse_dates or {}).items() if k in columns} or None
+        with self._engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True)
+            yield from pd.read_sql(
+                sql=sqlalchemy.text(query),
+                con=connection,
+                params=params,
+                chunksize=chunksize,
+                dtype=dtypes,
+                parse_dates=parse_dates,
+            )
+
     def exists(self, query: str, params: dict = None) -> bool:
         """Returns True if a row matching the query and parameters exists. Returns False otherwise.
         Args:
@@ -21,7 +21,6 @@ from dotenv import load_dotenv
 import logging
 
 from appstore.config import Config
-from appstore.infrastructure.file.io import IOService
 
 # ------------------------------------------------------------------------------------------------ #
 load_dotenv()
@@ -32,7 +31,7 @@ class FileConfig(Config):
     def __init__(self) -> None:
         super().__init__()
         self._config_file = os.getenv("PERSISTENCE_CONFIG")
-        self._config = IOService.read(self._config_file)["file"]
+        self._config = self.read(self._config_file)["file"]
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
     @property
@@ -26,13 +26,15 @@ import pandas as pd
 import pyarrow as pa
 import json
 import pyarrow.parquet as pq
-from typing import Any, Union, List
+from typing import Any, Iterable, Union, List
 
 
 # ------------------------------------------------------------------------------------------------ #
 
 
 class IO(ABC):  # pragma: no cover
+    # Whether the format can be written in chunks, by write_chunks.
+    chunked = False
     _logger = logging.getLogger(
         f"{__module__}.{__name__}",
     )
@@ -57,6 +59,16 @@ class IO(ABC):  # pragma: no cover
     def _write(cls, filepath: str, data: Any, **kwargs) -> None:
         pass
 
+    @classmethod
+    def write_chunks(cls, filepath: str, chunks: Iterable[pd.DataFrame], **kwargs) -> None:
+        """Writes DataFrames with the same columns to one file, holding one at a time."""
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        cls._write_chunks(filepath, chunks, **kwargs)
+
+    @classmethod
+    def _write_chunks(cls, filepath: str, chunks: Iterable[pd.DataFrame], **kwargs) -> None:
+        raise NotImplementedError(f"{cls.__name__} does not write files in chunks.")
+
 
 # ------------------------------------------------------------------------------------------------ #
 #                                         EXCEL IO                                                 #
@@ -111,6 +123,8 @@ class ExcelIO(IO):  # pragma: no cover
 
 
 class CSVIO(IO):  # pragma: no cover
+    chunked = True
+
     @classmethod
     def _read(
         cls,
@@ -153,6 +167,29 @@ class CSVIO(IO):  # pragma: no cover
             escapechar="\\",
         )
 
+    @classmethod
+    def _write_chunks(
+        cls,
+        filepath: str,
+        chunks: Iterable[pd.DataFrame],
+        sep: str = ",",
+        index: bool = False,
+        index_label: bool = None,
+        encoding: str = "utf-8",
+        **kwargs,
+    ) -> None:
+        """Appends each DataFrame to the file, with the header written once."""
+        with open(filepath, "w", encoding=encoding, newline="") as file:
+            for i, data in enumerate(chunks):
+                data.to_csv(
+                    file,
+                    sep=sep,
+                    header=i == 0,
+                    index=index,
+                    index_label=index_label,
+                    escapechar="\\",
+                )
+
 
 # ------------------------------------------------------------------------------------------------ #
 #                                        TSV IO                                                    #
@@ -160,6 +197,8 @@ class CSVIO(IO):  # pragma: no cover
 
 
 class TSVIO(IO):  # pragma: no cover
+    chunked = True
+
     @classmethod
     def _read(
         cls,
@@ -202,6 +241,29 @@ class TSVIO(IO):  # pragma: no cover
             escapechar="\\",
         )
 
+    @classmethod
+    def _write_chunks(
+        cls,
+        filepath: str,
+        chunks: Iterable[pd.DataFrame],
+        sep: str = "\t",
+        index: bool = False,
+        index_label: bool = None,
+        encoding: str = "utf-8",
+        **kwargs,
+    ) -> None:
+        """Appends each DataFrame to the file, with the header written once."""
+        with open(filepath, "w", encoding=encoding, newline="") as file:
+            for i, data in enumerate(chunks):
+                data.to_csv(
+                    file,
+                    sep=sep,
+                    header=i == 0,
+                    index=index,
+                    index_label=index_label,
+                    escapechar="\\",
+                )
+
 
 # ------------------------------------------------------------------------------------------------ #
 #                                        YAML IO                                                   #
@@ -269,6 +331,8 @@ class PickleIO(IO):  # pragma: no cover
 
 
 class ParquetIO(IO):  # pragma: no cover
+    chunked = True
+
     @classmethod
     def _read(cls, filepath: str, **kwargs) -> Any:
         """Read the pyarrow table, then convert to pandas."""
@@ -281,6 +345,39 @@ class ParquetIO(IO):  # pragma: no cover
         table = pa.Table.from_pandas(data)
         pq.write_table(table, filepath)
 
+    @classmethod
+    def _write_chunks(cls, filepath: str, chunks: Iterable[pd.DataFrame], **kwargs) -> None:
+        """Writes each DataFrame as a row group, in the schema of the first.
+
+        Dictionary indices are widened to int32 and columns without values in the first
+        DataFrame are typed as strings, so that later DataFrames convert to the schema.
+        """
+        writer = None
+        schema = None
+        try:
+            for data in chunks:
+                if writer is None:
+                    table = pa.Table.from_pandas(data, preserve_index=False)
+                    schema = pa.schema(
+                        [cls._widen(field) for field in table.schema], metadata=table.schema.metadata
+                    )
+                    table = table.cast(schema)
+                    writer = pq.ParquetWriter(filepath, schema)
+                else:
+                    table = pa.Table.from_pandas(data, schema=schema, preserve_index=False)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    @classmethod
+    def _widen(cls, field: pa.Field) -> pa.Field:
+        if pa.types.is_dictionary(field.type):
+            return field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+        if pa.types.is_null(field.type):
+            return field.with_type(pa.large_string())
+        return field
+
 
 # ------------------------------------------------------------------------------------------------ #
 #                                           HTML                                                   #
@@ -365,6 +462,16 @@ class IOService:  # pragma: no cover
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         io.write(filepath=filepath, data=data, **kwargs)
 
+    @classmethod
+    def write_chunks(cls, filepath: str, chunks: Iterable[pd.DataFrame], **kwargs) -> None:
+        io = cls._get_io(filepath)
+        io.write_chunks(filepath=filepath, chunks=chunks, **kwargs)
+
+    @classmethod
+    def is_chunked(cls, filepath: str) -> bool:
+        """Returns True if files of the format of filepath can be written in chunks."""
+        return cls._get_io(filepath).chunked
+
     @classmethod
     def _get_io(cls, filepath: str) -> IO:
         try:
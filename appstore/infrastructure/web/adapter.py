@@ -16,6 +16,7 @@
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
+from __future__ import annotations
 from requests.adapters import HTTPAdapter
 
 
@@ -29,6 +30,16 @@ class TimeoutHTTPAdapter(HTTPAdapter):
 
         super().__init__(*args, **kwargs)
 
+    def copy(self) -> TimeoutHTTPAdapter:
+        """Returns an adapter with the same timeout, retries and pool sizes, and pools of its own."""
+        return TimeoutHTTPAdapter(
+            timeout=self._timeout,
+            max_retries=self.max_retries,
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=self._pool_block,
+        )
+
     def send(self, request, **kwargs):
         if kwargs["timeout"] is None:
             kwargs["timeout"] = self._timeout
@@ -16,9 +16,10 @@
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
-import os
+from __future__ import annotations
 import logging
-from dotenv import load_dotenv
+from itertools import islice
+from typing import AsyncGenerator
 
 import asyncio
 
@@ -27,19 +28,40 @@ import asyncio
 import aiohttp
 
 
-from appstore.infrastructure.web.base import PROXY_SERVERS
 from appstore.infrastructure.web.headers import BrowserHeader
+from appstore.infrastructure.web.proxy import ProxyPool
+from appstore.infrastructure.web.cache import ResponseCache
+from appstore.infrastructure.web.response import loads
 from appstore.infrastructure.web.throttle import AThrottle
 
-load_dotenv()
-
 
 # ------------------------------------------------------------------------------------------------ #
 class ASessionHandler:
     """Asyncronous Session Handler
 
+    The handler owns a single aiohttp ClientSession and TCPConnector for its lifetime, so that
+    keep-alive connections and the DNS cache are reused across the batches of a crawl. Use the
+    handler as an async context manager, or call close() when done. If not opened explicitly,
+    the session is opened on the first request.
+
+    If a response cache is provided, fresh cached responses are served without a request,
+    and stale ones are revalidated with a conditional request.
+
     Args:
+        throttle (AThrottle): Computes the delay between requests.
+        headers (BrowserHeader): Iterator serving rotating browser headers.
+        max_concurrency (int): Maximum number of concurrent requests.
         retries (int): Number of sessions to retry if timeout retry maximum has been reached.
+        timeout (int): Total number of seconds allowed for a request.
+        limit (int): Total number of simultaneous connections held by the connector.
+            Zero means no limit. Default = 100
+        limit_per_host (int): Number of simultaneous connections to the same endpoint.
+            Zero means no limit. Default = 0
+        ttl_dns_cache (int): Number of seconds resolved DNS entries are cached. Default = 300
+        keepalive_timeout (float): Number of seconds idle connections are kept alive. Default = 30
+        proxies (ProxyPool): Pool of proxies over which requests are rotated. If None, a pool
+            of the proxy configured in the environment is used.
+        cache (ResponseCache): Cache of responses. If None, responses are not cached.
 
     """
 
@@ -50,90 +72,223 @@ class ASessionHandler:
         max_concurrency: int = 10,
         retries: int = 3,
         timeout: int = 30,
-        proxies: list = PROXY_SERVERS,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        ttl_dns_cache: int = 300,
+        keepalive_timeout: float = 30,
+        proxies: ProxyPool = None,
+        cache: ResponseCache = None,
     ) -> None:
         self._throttle = throttle
-        self._proxies = proxies
+        self._proxies = proxies or ProxyPool()
+        self._cache = cache or ResponseCache(enabled=False)
         self._retries = retries
         self._timeout = aiohttp.ClientTimeout(total=timeout)
         self._headers = iter(headers)
         self._max_concurrency = max_concurrency
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._ttl_dns_cache = ttl_dns_cache
+        self._keepalive_timeout = keepalive_timeout
 
         self._proxy = None  # The proxy used for the current request
         self._header = None  # The header used for the current request.
 
+        self._client = None  # The session shared by all requests.
+        self._concurrency = None  # Semaphore bounding concurrent requests on the session.
+        self._loop = None  # The event loop to which the session is bound.
+
         self._responses = None
 
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
+    async def __aenter__(self) -> ASessionHandler:
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
     @property
     async def responses(self) -> list:
         """Returns the responses"""
         return self._responses
 
+    @property
+    def is_open(self) -> bool:
+        """Returns True if the session is open, False otherwise."""
+        return self._client is not None and not self._client.closed
+
+    async def open(self) -> None:
+        """Opens the session and its connector, unless already open in the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self.is_open and self._loop is loop:
+            return
+
+        if self.is_open:  # pragma: no cover
+            msg = "Session is bound to a prior event loop. Opening a new session."
+            self._logger.debug(msg)
+
+        connector = aiohttp.TCPConnector(
+            limit=self._limit,
+            limit_per_host=self._limit_per_host,
+            ttl_dns_cache=self._ttl_dns_cache,
+            keepalive_timeout=self._keepalive_timeout,
+        )
+        self._client = aiohttp.ClientSession(
+            connector=connector,
+            trust_env=True,
+            raise_for_status=True,
+            timeout=self._timeout,
+        )
+        self._concurrency = asyncio.Semaphore(self._max_concurrency)
+        self._loop = loop
+
+    async def close(self) -> None:
+        """Closes the session and releases its connections."""
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+        self._concurrency = None
+        self._loop = None
+
     async def get(self, urls: list, headers: dict = None) -> list:
         """Entry point returns results from asynchronous http requests
 
         Args:
             urls (list): List of urls for http requests
+            headers (dict): A dictionary containing header parameters. If None provided,
+                standard rotating headers will be used.
         """
+        await self.open()
 
-        headers = headers or next(self._header)
+        headers = headers or next(self._headers)
 
-        conn = aiohttp.TCPConnector()
+        tasks = [self._make_request(url=url, headers=headers) for url in urls]
+        self._responses = await asyncio.gather(*tasks)
+        return self._responses
 
-        concurrency = asyncio.Semaphore(self._max_concurrency)
+    async def fetch(self, url: str, headers: dict = None) -> dict:
+        """Returns the content of a single asynchronous http request
 
-        async with aiohttp.ClientSession(
-            headers=headers,
-            connector=conn,
-            trust_env=True,
-            raise_for_status=True,
-            timeout=self._timeout,
-        ) as client:
-            tasks = [self._make_request(client, url, concurrency) for url in urls]
-            self._responses = await asyncio.gather(*tasks)
-        return self._responses
+        Requests made by concurrent callers share the session, concurrency limit and throttle.
 
-    async def _make_request(
-        self,
-        client: aiohttp.ClientSession,
-        url: str,
-        concurrency: asyncio.Semaphore,
-    ):
+        Args:
+            url (str): The url for the http request
+            headers (dict): A dictionary containing header parameters. If None provided,
+                standard rotating headers will be used.
+        """
+        await self.open()
+
+        headers = headers or next(self._headers)
+
+        return await self._make_request(url=url, headers=headers)
+
+    async def stream(
+        self, urls: list, headers: dict = None, window: int = None
+    ) -> AsyncGenerator[tuple, None]:
+        """Yields responses in the order in which they complete.
+
+        At most 'window' requests are in flight at any time. A new request is submitted only
+        as a completed response is taken by the consumer, so a slow consumer applies
+        backpressure rather than accumulating responses in memory.
+
+        Args:
+            urls (list): List of urls for http requests
+            headers (dict): A dictionary containing header parameters. If None provided,
+                standard rotating headers will be used.
+            window (int): Maximum number of requests in flight. Defaults to twice the
+                maximum concurrency, so that the connection pool stays saturated.
+
+        Yields: Tuple containing the index of the url in urls, and the response.
+        """
+        await self.open()
+
+        headers = headers or next(self._headers)
+        window = window or 2 * self._max_concurrency
+
+        requests = iter(enumerate(urls))
+        pending = {
+            asyncio.ensure_future(self._make_indexed_request(idx=idx, url=url, headers=headers))
+            for idx, url in islice(requests, window)
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+                    for idx, url in islice(requests, 1):
+                        pending.add(
+                            asyncio.ensure_future(
+                                self._make_indexed_request(idx=idx, url=url, headers=headers)
+                            )
+                        )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _make_indexed_request(self, idx: int, url: str, headers: dict) -> tuple:
+        """Executes the http request and returns the response with the index of its url."""
+        return idx, await self._make_request(url=url, headers=headers)
+
+    async def _make_request(self, url: str, headers: dict):
         """Executes the http request and returns a Response object.
 
         Args:
-            client (httpx.AsyncClient): The http client executing the http request.
             url (str): The base url for the http request
-            concurrency (asyncio.Semaphore): Controls number of concurrent requests.
-            headers (dict): A dictionary containing header parameters.If None provided, standard rotating headers will be used.
+            headers (dict): A dictionary containing header parameters.
         """
-
-        proxy = self._get_proxy()
+        key = self._cache.key(url=url)
+        # Cache reads and writes are disk I/O, and run in a thread off the event loop.
+        entry = await asyncio.to_thread(self._cache.get, key=key)
+        if self._cache.is_fresh(entry=entry):
+            return entry.json()
+        headers = {**headers, **self._cache.validators(entry=entry)}
 
         retries = 0
 
-        async with concurrency:
+        async with self._concurrency:
             while retries < self._retries:
+                proxy = self._proxies.next()
                 try:
-                    self._throttle.start()
-                    async with client.get(url, proxy=proxy, ssl=False) as response:
-                        self._throttle.stop()
-                        self._throttle.delay()
-                        return await response.json()
+                    started = self._throttle.start()
+                    async with self._client.get(
+                        url, headers=headers, proxy=proxy, ssl=False
+                    ) as response:
+                        latency = self._throttle.stop(started)
+                        self._throttle.signal(
+                            status_code=response.status,
+                            retry_after=response.headers.get("Retry-After"),
+                        )
+                        revalidated = response.status == 304 and entry is not None
+                        if revalidated:
+                            content = entry.json()
+                        else:
+                            body = await response.read()
+                            content = loads(body)
+                    # The proxy is credited only once the body has been read and decoded.
+                    self._proxies.report(proxy=proxy, latency=latency)
+                    if revalidated:
+                        await asyncio.to_thread(self._cache.revalidated, key=key, entry=entry)
+                    elif response.status == 200:
+                        await asyncio.to_thread(
+                            self._cache.put, key=key, body=body, headers=response.headers
+                        )
+                    # The delay suspends only this task, after its connection is released.
+                    await self._throttle.delay(latency=latency)
+                    return content
 
                 except Exception as e:
                     retries += 1
                     msg = f"Exception type {type(e)} occurred.\n{e}\nExecuting retry # {retries}."
                     self._logger.exception(msg)
+                    self._proxies.report(proxy=proxy, error=True)
+                    if isinstance(e, aiohttp.ClientResponseError):
+                        self._throttle.signal(
+                            status_code=e.status,
+                            retry_after=e.headers.get("Retry-After") if e.headers else None,
+                        )
+                    # Honour any hold requested by the server before retrying.
+                    await asyncio.sleep(self._throttle.hold())
             msg = "Exhausted retries. Returning to calling environment."
             self._logger.exception(msg)
-
-    def _get_proxy(self) -> dict:
-        dns = os.getenv("WEBSHARE_DNS")
-        username = os.getenv("WEBSHARE_USER")
-        pwd = os.getenv("WEBSHARE_PWD")
-        port = os.getenv("WEBSHARE_PORT")
-        proxy = f"http://{username}:{pwd}@{dns}:{port}"
-        return proxy
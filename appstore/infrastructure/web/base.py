@@ -21,6 +21,8 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 import logging
 
+from appstore.infrastructure.web.stats import StreamStats
+
 
 # ------------------------------------------------------------------------------------------------ #
 class Header(ABC):
@@ -37,15 +39,37 @@ class Header(ABC):
 
 # ------------------------------------------------------------------------------------------------ #
 class Throttle(ABC):
-    """Base class for HTTP request rate limiters"""
+    """Base class for HTTP request rate limiters
+
+    Request latencies and delays are summarized in streaming statistics, in constant memory.
+    """
 
     def __init__(self) -> None:
+        self._latency_stats = StreamStats()
+        self._delay_stats = StreamStats()
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
+    @property
+    def stats(self) -> dict:
+        """Returns a snapshot of the latency and delay statistics over the life of the throttle."""
+        return {"latency": self._latency_stats.as_dict(), "delay": self._delay_stats.as_dict()}
+
     @abstractmethod
     def delay(self, *args, **kwargs) -> int:
         """Returns a delay time in milliseconds"""
 
+    def signal(self, status_code: int, retry_after: str = None) -> None:
+        """Reports the status of a response. Throttles that adapt to the server override this.
+
+        Args:
+            status_code (int): The HTTP status code of the response.
+            retry_after (str): The value of the Retry-After header, if provided.
+        """
+
+    def hold(self) -> float:
+        """Returns the number of seconds to wait before retrying a failed request."""
+        return 0
+
 
 # ------------------------------------------------------------------------------------------------ #
 # Servers provided courtesy of Geonode
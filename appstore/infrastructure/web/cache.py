@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/infrastructure/web/cache.py                                               #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 01:20:44 pm                                                #
+# Modified   : Sunday October 18th 2026 01:20:44 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+"""HTTP Response Cache Module"""
+from __future__ import annotations
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from appstore.infrastructure.web.response import loads
+
+
+# ------------------------------------------------------------------------------------------------ #
+@dataclass
+class CacheEntry:
+    """A cached response body, its headers and the time it was stored or last revalidated."""
+
+    body: bytes
+    headers: dict = field(default_factory=dict)
+    stored: float = 0
+
+    def json(self):
+        """Returns the decoded json body"""
+        return loads(self.body)
+
+    def to_response(self, url: str) -> requests.Response:
+        """Returns the entry as a requests Response object"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        return response
+
+
+# ------------------------------------------------------------------------------------------------ #
+class ResponseCache:
+    """On-disk cache of HTTP responses, keyed by url and parameters.
+
+    Entries younger than the time-to-live are served without a request. Older entries are
+    revalidated with a conditional request, using the ETag and Last-Modified headers of the
+    cached response, and are served again if the server responds 304 Not Modified. When the
+    total size of the cached bodies exceeds max_size, the least recently used entries are
+    evicted. The cache is thread safe.
+
+    Args:
+        directory (str): Directory in which the entries are stored.
+        ttl (float): Number of seconds an entry is served without revalidation. Default = 86400
+        max_size (int): Maximum total size of the cached bodies in bytes. Default = 1 GB
+        enabled (bool): Whether responses are cached. If False, the cache is inert. Default = True
+    """
+
+    def __init__(
+        self,
+        directory: str = "data/cache/web",
+        ttl: float = 86400,
+        max_size: int = 1073741824,
+        enabled: bool = True,
+    ) -> None:
+        self._directory = directory
+        self._ttl = ttl
+        self._max_size = max_size
+        self._enabled = enabled
+
+        self._sizes = OrderedDict()  # Maps key to body size, from least to most recently used.
+        self._size = 0
+
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+        if self._enabled:
+            os.makedirs(self._directory, exist_ok=True)
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def size(self) -> int:
+        """Returns the total size of the cached bodies in bytes."""
+        return self._size
+
+    def key(self, url: str, params: dict = None) -> str:
+        """Returns the cache key for a url and its parameters."""
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> CacheEntry:
+        """Returns the cached entry for the key, or None if there is none."""
+        if not self._enabled:
+            return None
+        with self._lock:
+            if key not in self._sizes:
+                return None
+            try:
+                with open(self._path(key, "json"), "r") as file:
+                    meta = json.load(file)
+                with open(self._path(key, "bin"), "rb") as file:
+                    body = file.read()
+            except Exception as e:  # pragma: no cover
+                msg = f"Unable to read cache entry {key}. Discarding it.\n{e}"
+                self._logger.debug(msg)
+                self._remove(key)
+                return None
+            # Record the use, so that the order of use survives a restart.
+            os.utime(self._path(key, "bin"))
+            self._sizes.move_to_end(key)
+            return CacheEntry(body=body, headers=meta["headers"], stored=meta["stored"])
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Returns True if the entry may be served without revalidation."""
+        return entry is not None and time.time() - entry.stored < self._ttl
+
+    def validators(self, entry: CacheEntry) -> dict:
+        """Returns the conditional request headers with which to revalidate the entry."""
+        if entry is None:
+            return {}
+        headers = CaseInsensitiveDict(entry.headers)
+        validators = {}
+        if "ETag" in headers:
+            validators["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+    def put(self, key: str, body: bytes, headers: dict) -> None:
+        """Stores a response body and its headers, evicting entries if the cache is full."""
+        if not self._enabled or len(body) > self._max_size:
+            return
+        meta = {"headers": dict(headers), "stored": time.time()}
+        with self._lock:
+            self._write(key=key, body=body, meta=meta)
+            self._size += len(body) - self._sizes.get(key, 0)
+            self._sizes[key] = len(body)
+            self._sizes.move_to_end(key)
+            while self._size > self._max_size:
+                self._remove(next(iter(self._sizes)))
+
+    def revalidated(self, key: str, entry: CacheEntry) -> CacheEntry:
+        """Records that the server confirmed the entry is unchanged, and returns the entry."""
+        with self._lock:
+            entry.stored = time.time()
+            meta = {"headers": entry.headers, "stored": entry.stored}
+            self._atomic_write(self._path(key, "json"), json.dumps(meta).encode("utf-8"))
+        return entry
+
+    def _load_index(self) -> None:
+        """Indexes existing entries, ordered by the time each was last used."""
+        entries = []
+        for filename in os.listdir(self._directory):
+            if filename.endswith(".bin"):
+                path = os.path.join(self._directory, filename)
+                entries.append((os.path.getmtime(path), filename[:-4], os.path.getsize(path)))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._size += size
+
+    def _write(self, key: str, body: bytes, meta: dict) -> None:
+        self._atomic_write(self._path(key, "bin"), body)
+        self._atomic_write(self._path(key, "json"), json.dumps(meta).encode("utf-8"))
+
+    def _atomic_write(self, path: str, data: bytes) -> None:
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+
+    def _remove(self, key: str) -> None:
+        self._size -= self._sizes.pop(key, 0)
+        for ext in ("bin", "json"):
+            try:
+                os.remove(self._path(key, ext))
+            except FileNotFoundError:  # pragma: no cover
+                pass
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self._directory, f"{key}.{ext}")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/infrastructure/web/proxy.py                                               #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 11:02:17 am                                                #
+# Modified   : Sunday October 18th 2026 11:02:17 am                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+"""Proxy Pool Module"""
+import os
+import random
+import logging
+import threading
+from time import monotonic
+from collections import deque
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# ------------------------------------------------------------------------------------------------ #
+class ProxyPool:
+    """Rotates requests over proxy servers, weighted toward the fastest healthy proxies.
+
+    The latency and outcome of the most recent requests through each proxy are kept in a
+    rolling window. A proxy whose error rate exceeds max_error_rate is ejected from rotation
+    for the cool-off period, after which it returns with a clean window. Healthy proxies are
+    selected with probability inversely proportional to their mean latency. The pool is
+    shared by the synchronous and asynchronous session handlers, and is thread safe.
+
+    Args:
+        servers (list): Proxy servers as 'host:port', to which the WEBSHARE_USER and
+            WEBSHARE_PWD credentials are added, or as complete proxy urls. If empty, the
+            single WEBSHARE_DNS:WEBSHARE_PORT proxy from the environment is used.
+        window (int): Number of recent requests per proxy in the rolling window. Default = 50
+        min_requests (int): Number of requests in the window before a proxy may be ejected.
+            Default = 10
+        max_error_rate (float): Proportion of failed requests in the window above which a
+            proxy is ejected. Default = 0.5
+        cooloff (float): Number of seconds an ejected proxy is withheld from rotation.
+            Default = 300
+    """
+
+    def __init__(
+        self,
+        servers: list = None,
+        window: int = 50,
+        min_requests: int = 10,
+        max_error_rate: float = 0.5,
+        cooloff: float = 300,
+    ) -> None:
+        self._window = window
+        self._min_requests = min_requests
+        self._max_error_rate = max_error_rate
+        self._cooloff = cooloff
+
+        urls = [self._format_url(server) for server in servers or [self._default_server()]]
+        self._latencies = {url: deque(maxlen=window) for url in urls}
+        self._errors = {url: deque(maxlen=window) for url in urls}
+        self._ejected = {}  # Maps proxy url to the time at which its cool-off ends.
+
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+    @property
+    def proxies(self) -> list:
+        """Returns the urls of all proxies in the pool."""
+        return list(self._latencies.keys())
+
+    @property
+    def healthy(self) -> list:
+        """Returns the urls of the proxies currently in rotation."""
+        with self._lock:
+            return self._healthy(now=monotonic())
+
+    def next(self) -> str:
+        """Returns the url of the proxy to be used for the next request."""
+        with self._lock:
+            now = monotonic()
+            healthy = self._healthy(now=now)
+            if len(healthy) == 0:
+                # Every proxy is cooling off. Use the one that is closest to returning.
+                return min(self._ejected, key=self._ejected.get)
+            return random.choices(healthy, weights=self._weights(proxies=healthy))[0]
+
+    def report(self, proxy: str, latency: float = None, error: bool = False) -> None:
+        """Records the outcome of a request made through a proxy.
+
+        Args:
+            proxy (str): The proxy url returned by next.
+            latency (float): Seconds between request and response. None if the request failed.
+            error (bool): Whether the request failed.
+        """
+        if proxy not in self._errors:
+            return
+        with self._lock:
+            self._errors[proxy].append(error)
+            if latency is not None:
+                self._latencies[proxy].append(latency)
+
+            errors = self._errors[proxy]
+            if len(errors) >= self._min_requests and sum(errors) / len(errors) > self._max_error_rate:
+                self._eject(proxy=proxy)
+
+    def _healthy(self, now: float) -> list:
+        """Returns proxies not cooling off, restoring those whose cool-off has ended."""
+        for proxy, until in list(self._ejected.items()):
+            if until <= now:
+                del self._ejected[proxy]
+                msg = f"Proxy {self._mask(proxy)} cool-off ended. Returning it to rotation."
+                self._logger.debug(msg)
+        return [proxy for proxy in self._latencies if proxy not in self._ejected]
+
+    def _weights(self, proxies: list) -> list:
+        """Weights proxies by inverse mean latency. Unmeasured proxies get the average weight."""
+        means = {
+            proxy: sum(self._latencies[proxy]) / len(self._latencies[proxy])
+            for proxy in proxies
+            if len(self._latencies[proxy]) > 0
+        }
+        weights = {proxy: 1 / max(mean, 1e-3) for proxy, mean in means.items()}
+        default = sum(weights.values()) / len(weights) if weights else 1
+        return [weights.get(proxy, default) for proxy in proxies]
+
+    def _eject(self, proxy: str) -> None:
+        self._ejected[proxy] = monotonic() + self._cooloff
+        self._errors[proxy].clear()
+        self._latencies[proxy].clear()
+        msg = f"Proxy {self._mask(proxy)} exceeded the error rate. Ejected for {self._cooloff} seconds."
+        self._logger.info(msg)
+
+    def _format_url(self, server: str) -> str:
+        if "://" in server:
+            return server
+        username = os.getenv("WEBSHARE_USER")
+        password = os.getenv("WEBSHARE_PWD")
+        return f"http://{username}:{password}@{server}"
+
+    def _default_server(self) -> str:
+        dns = os.getenv("WEBSHARE_DNS")
+        port = os.getenv("WEBSHARE_PORT")
+        return f"{dns}:{port}"
+
+    def _mask(self, proxy: str) -> str:
+        """Removes credentials from a proxy url for logging."""
+        return proxy.rsplit("@", 1)[-1]
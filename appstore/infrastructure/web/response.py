@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/infrastructure/web/response.py                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 02:31:09 pm                                                #
+# Modified   : Sunday October 18th 2026 02:31:09 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+"""Parsed HTTP Response Module"""
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+import requests
+
+try:  # pragma: no cover
+    import orjson
+
+    def loads(data: bytes) -> Any:
+        """Decodes json with orjson"""
+        return orjson.loads(data)
+
+except ImportError:  # pragma: no cover
+    loads = json.loads
+
+
+# ------------------------------------------------------------------------------------------------ #
+@dataclass
+class ParsedResponse:
+    """HTTP response whose body has been decoded exactly once.
+
+    The envelope is passed from the session handler to the validator and on to the result,
+    none of which decode the body again. The body is decoded with orjson when installed.
+
+    Args:
+        status_code (int): The HTTP status code.
+        headers (dict): The response headers.
+        content (Any): The decoded json body, or None if the body could not be decoded.
+        size (int): The size of the body in bytes.
+        url (str): The url of the request.
+        error (str): The decoding error, if the body could not be decoded.
+    """
+
+    status_code: int
+    headers: dict = field(default_factory=dict)
+    content: Any = None
+    size: int = 0
+    url: str = None
+    error: str = None
+
+    def json(self) -> Any:
+        """Returns the decoded body, for compatibility with requests.Response"""
+        return self.content
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> ParsedResponse:
+        """Creates the envelope from a requests Response, decoding its body."""
+        body = response.content or b""
+        content, error = None, None
+        try:
+            content = loads(body)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        try:
+            size = int(response.headers["content-length"])
+        except Exception:
+            size = len(body)
+        return cls(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=content,
+            size=size,
+            url=response.url,
+            error=error,
+        )
@@ -16,28 +16,53 @@
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
-import os
 import logging
-from dotenv import load_dotenv
+import threading
+from time import sleep, monotonic
 
 import requests
 
-from appstore.infrastructure.web.throttle import LatencyThrottle
+from appstore.infrastructure.web.throttle import LatencyThrottle, RateLimiter
 from appstore.infrastructure.web.adapter import TimeoutHTTPAdapter
 from appstore.infrastructure.web.headers import BrowserHeader
-
-
-load_dotenv()
+from appstore.infrastructure.web.proxy import ProxyPool
+from appstore.infrastructure.web.cache import CacheEntry, ResponseCache
+from appstore.infrastructure.web.response import ParsedResponse
 
 
 # ------------------------------------------------------------------------------------------------ #
 class SessionHandler:
     """Encapsulates an HTTP Session with retry capability.
 
+    In persistent mode, a single pooled session is created on first use and reused across
+    requests, so that connections (and their TLS handshakes) to the proxy and target hosts
+    are kept alive between pages. The session is only rebuilt after a request fails, as
+    headers and proxies are passed per request and do not require a new session.
+
+    If a response cache is provided, fresh cached responses are served without a request,
+    and stale ones are revalidated with a conditional request.
+
+    The status and Retry-After header of each response are signalled to the throttle. A 429
+    or 5xx response that reaches the handler is retried after any hold the throttle imposes,
+    and is returned if the session retries are exhausted.
+
+    The handler may be shared by several threads. Each thread has its own session, proxy and
+    header, and if a rate limiter is provided, the requests of all threads are paced by it,
+    in addition to the delay set by the throttle.
+
     Args:
         timeout (TimeoutHTTPAdapter): An HTTP Adapter for managing timeouts and retries at request level.
-        retries (int): Number of sessions to retry if timeout retry maximum has been reached.
-        delay (tuple): The lower and upper bound on time between requests.
+            Each session mounts a copy of it, with connection pools of its own.
+        throttle (LatencyThrottle): Computes and executes the delay between requests.
+        headers (BrowserHeader): Iterator serving rotating browser headers.
+        session_retries (int): Number of sessions to retry if timeout retry maximum has been reached.
+        persistent (bool): Whether the session is kept alive across requests. If False,
+            a new session is created for each request. Default = True
+        proxies (ProxyPool): Pool of proxies over which requests are rotated. If None, a pool
+            of the proxy configured in the environment is used.
+        cache (ResponseCache): Cache of responses. If None, responses are not cached.
+        limiter (RateLimiter): Rate limit shared by all threads using the handler. If None,
+            requests are paced by the throttle alone.
     """
 
     def __init__(
@@ -46,20 +71,34 @@ class SessionHandler:
         throttle: LatencyThrottle,
         headers: BrowserHeader,
         session_retries: int = 3,
+        persistent: bool = True,
+        proxies: ProxyPool = None,
+        cache: ResponseCache = None,
+        limiter: RateLimiter = None,
     ) -> None:
         self._timeout = timeout
         self._throttle = throttle
         self._headers = iter(headers)
 
         self._session_retries = session_retries
+        self._persistent = persistent
+        self._proxies = proxies or ProxyPool()
+        self._cache = cache or ResponseCache(enabled=False)
+        self._limiter = limiter
 
-        self._proxy = None  # The proxy used for the current request
-        self._header = None  # The header used for the current request.
+        # The session, and the proxy and header of the current request, are held per thread.
+        self._local = threading.local()
 
-        self._session = None
+        self._sessions = 0  # The number of sessions created over the life of the handler.
+        self._lock = threading.Lock()
 
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
+    @property
+    def sessions(self) -> int:
+        """Returns the number of sessions created by the handler."""
+        return self._sessions
+
     def get(self, url: str, header: dict = None, params: dict = None):  # noqa: C901
         """Executes the http request and returns a Response object.
 
@@ -69,6 +108,10 @@ class SessionHandler:
             params (dict): The parameters to be added to the url
 
         """
+        key = self._cache.key(url=url, params=params)
+        entry = self._cache.get(key=key)
+        if self._cache.is_fresh(entry=entry):
+            return entry.to_response(url=url)
 
         session_retry = 0
 
@@ -76,12 +119,27 @@ class SessionHandler:
             self._setup(header=header)
 
             try:
-                self._throttle.start()
-                response = self._session.get(
-                    url=url, headers=self._header, params=params, proxies=self._proxy
+                if self._limiter is not None:
+                    self._limiter.acquire()
+                token = self._throttle.start()
+                started = monotonic()
+                response = self._local.session.get(
+                    url=url,
+                    headers={**self._local.header, **self._cache.validators(entry=entry)},
+                    params=params,
+                    proxies=self._local.proxy,
+                )
+                self._proxies.report(
+                    proxy=self._local.proxy_url,
+                    latency=monotonic() - started,
+                    error=self._is_overload(response),
                 )
-                self._throttle.stop()
-                self._throttle.delay()
+                latency = self._throttle.stop(started=token)
+                self._throttle.signal(
+                    status_code=response.status_code,
+                    retry_after=response.headers.get("Retry-After"),
+                )
+                self._throttle.delay(latency=latency)
 
             except Exception as e:  # pragma: no cover
                 session_retry += 1
@@ -89,30 +147,87 @@ class SessionHandler:
                     f"A {type(e)} exception occurred. \n{e}\nRetrying with retry #{session_retry}."
                 )
                 self._logger.exception(msg)
+                self._proxies.report(proxy=self._local.proxy_url, error=True)
+                response = getattr(e, "response", None)
+                if response is not None:
+                    self._throttle.signal(
+                        status_code=response.status_code,
+                        retry_after=response.headers.get("Retry-After"),
+                    )
+                # Discard the session and its connections; a new one is built on retry.
+                self.close()
+                # Honour any hold requested by the server before retrying.
+                sleep(self._throttle.hold())
             else:
-                return response
+                if self._is_overload(response) and session_retry + 1 < self._session_retries:
+                    session_retry += 1
+                    msg = f"Status code {response.status_code} received. Retrying with retry #{session_retry}."
+                    self._logger.debug(msg)
+                    sleep(self._throttle.hold())
+                    continue
+                if not self._persistent:
+                    self.close()
+                return self._cache_response(key=key, entry=entry, response=response)
 
         self._logger.exception("All retry and session limits have been reached. Exiting.")
 
+    def fetch(self, url: str, header: dict = None, params: dict = None) -> ParsedResponse:
+        """Executes the http request and returns the response with its body decoded.
+
+        Args:
+            url (str): The base url for the http request
+            header (dict): A dictionary containing header parameters.If None provided, standard rotating headers will be used.
+            params (dict): The parameters to be added to the url
+
+        """
+        response = self.get(url=url, header=header, params=params)
+        if response is not None:
+            return ParsedResponse.from_response(response=response)
+
+    def _cache_response(
+        self, key: str, entry: CacheEntry, response: requests.Response
+    ) -> requests.Response:
+        """Caches a successful response, or serves the cached entry the server revalidated."""
+        if response.status_code == 304 and entry is not None:
+            return self._cache.revalidated(key=key, entry=entry).to_response(url=response.url)
+        if response.status_code == 200:
+            self._cache.put(key=key, body=response.content, headers=response.headers)
+        return response
+
+    def _is_overload(self, response: requests.Response) -> bool:
+        """Returns True if the response signals that the server is overloaded."""
+        return response.status_code == 429 or response.status_code >= 500
+
+    def close(self) -> None:
+        """Closes the calling thread's session, releasing its pooled connections.
+
+        The sessions of other threads, and their connections, are not affected.
+        """
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            session.close()
+            self._local.session = None
+
     def _setup(self, header: dict = None) -> None:
         """Conducts pre-request initializations"""
 
-        self._proxy = self._get_proxy()  # From rotating proxies
-        self._header = header or next(self._headers)  # From rotating headers
-
-        # Construct session object
-        self._session = requests.Session()
-        self._session.mount("https://", self._timeout)
-        self._session.mount("http://", self._timeout)
+        self._local.proxy = self._get_proxy()  # From rotating proxies
+        with self._lock:
+            self._local.header = header or next(self._headers)  # From rotating headers
+
+        # Construct session object unless the thread has a live session.
+        if getattr(self._local, "session", None) is None:
+            # Each session has an adapter of its own, so that closing it releases only the
+            # connection pools of this thread.
+            adapter = self._timeout.copy()
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions += 1
 
     def _get_proxy(self) -> dict:
-        """Returns proxy servers"""
-        username = os.getenv("WEBSHARE_USER")
-        password = os.getenv("WEBSHARE_PWD")
-        dns = os.getenv("WEBSHARE_DNS")
-        port = os.getenv("WEBSHARE_PORT")
-
-        return {
-            "http": f"http://{username}:{password}@{dns}:{port}/",
-            "https": f"http://{username}:{password}@{dns}:{port}/",
-        }
+        """Returns the proxy servers for the next request from the pool"""
+        self._local.proxy_url = self._proxies.next()
+        return {"http": self._local.proxy_url, "https": self._local.proxy_url}
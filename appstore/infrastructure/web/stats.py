@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /appstore/infrastructure/web/stats.py                                               #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 12:15:48 pm                                                #
+# Modified   : Sunday October 18th 2026 12:15:48 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+"""Streaming Statistics Module
+
+Statistics over unbounded streams of observations, such as request latencies, computed in
+constant memory and constant time per observation.
+"""
+from bisect import insort
+import math
+
+import numpy as np
+
+
+# ------------------------------------------------------------------------------------------------ #
+class RunningStats:
+    """Count, mean, standard deviation, minimum, maximum and total, by Welford's algorithm."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def std(self) -> float:
+        """Returns the population standard deviation."""
+        return math.sqrt(self._m2 / self._count) if self._count > 0 else 0.0
+
+    @property
+    def min(self) -> float:
+        return self._min if self._count > 0 else None
+
+    @property
+    def max(self) -> float:
+        return self._max if self._count > 0 else None
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    def add(self, x: float) -> None:
+        """Adds an observation"""
+        self._count += 1
+        delta = x - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (x - self._mean)
+        self._min = min(self._min, x)
+        self._max = max(self._max, x)
+        self._total += x
+
+    def reset(self) -> None:
+        """Discards all observations"""
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._total = 0.0
+
+
+# ------------------------------------------------------------------------------------------------ #
+class P2Quantile:
+    """Streaming estimate of a quantile by the P-Square algorithm of Jain and Chlamtac (1985).
+
+    Five markers track the minimum, the maximum, the quantile, and the quantiles halfway
+    between them, and are adjusted with each observation by piecewise-parabolic interpolation.
+
+    Args:
+        p (float): The quantile to estimate, between 0 and 1.
+    """
+
+    def __init__(self, p: float) -> None:
+        self._p = p
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    @property
+    def value(self) -> float:
+        """Returns the estimate of the quantile, or None if there are no observations."""
+        if len(self._heights) == 0:
+            return None
+        if len(self._heights) < 5:
+            return self._heights[round(self._p * (len(self._heights) - 1))]
+        return self._heights[2]
+
+    def add(self, x: float) -> None:
+        """Adds an observation"""
+        h = self._heights
+        if len(h) < 5:
+            insort(h, x)
+            return
+
+        n = self._positions
+        # Find the cell containing the observation, extending the extremes if necessary.
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if h[i] <= x < h[i + 1])
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Adjust the heights of the three middle markers if they are off their desired positions.
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not h[i - 1] < height < h[i + 1]:
+                    height = self._linear(i, d)
+                h[i] = height
+                n[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, d: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+
+# ------------------------------------------------------------------------------------------------ #
+class StreamStats:
+    """Running statistics and streaming quantile estimates for a stream of observations.
+
+    Args:
+        quantiles (tuple): The quantiles to estimate. Default = (0.5, 0.95, 0.99)
+    """
+
+    def __init__(self, quantiles: tuple = (0.5, 0.95, 0.99)) -> None:
+        self._quantiles = quantiles
+        self.reset()
+
+    @property
+    def running(self) -> RunningStats:
+        return self._running
+
+    def quantile(self, p: float) -> float:
+        """Returns the estimate of a tracked quantile"""
+        return self._estimators[p].value
+
+    def add(self, x: float) -> None:
+        """Adds an observation"""
+        self._running.add(x)
+        for estimator in self._estimators.values():
+            estimator.add(x)
+
+    def reset(self) -> None:
+        """Discards all observations"""
+        self._running = RunningStats()
+        self._estimators = {p: P2Quantile(p) for p in self._quantiles}
+
+    def as_dict(self) -> dict:
+        """Returns a snapshot of the statistics"""
+        d = {
+            "count": self._running.count,
+            "mean": self._running.mean,
+            "std": self._running.std,
+            "min": self._running.min,
+            "max": self._running.max,
+            "total": self._running.total,
+        }
+        for p, estimator in self._estimators.items():
+            d[f"p{round(p * 100)}"] = estimator.value
+        return d
+
+
+# ------------------------------------------------------------------------------------------------ #
+class RingBuffer:
+    """Fixed size window of the most recent observations.
+
+    The number of observations in the window above a threshold is maintained as observations
+    are added, so that it is available in constant time.
+
+    Args:
+        size (int): The number of observations in the window.
+        threshold (float): The threshold for the count of observations above it. Default = 0
+    """
+
+    def __init__(self, size: int, threshold: float = 0) -> None:
+        self._size = size
+        self._values = np.zeros(size)
+        self._idx = 0
+        self._threshold = threshold
+        self._above = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def above(self) -> int:
+        """Returns the number of observations in the window above the threshold"""
+        return self._above
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, threshold: float) -> None:
+        self._threshold = threshold
+        self._above = int(np.count_nonzero(self._values > threshold))
+
+    def add(self, x: float) -> None:
+        """Adds an observation, replacing the oldest"""
+        self._above -= int(self._values[self._idx] > self._threshold)
+        self._above += int(x > self._threshold)
+        self._values[self._idx] = x
+        self._idx = (self._idx + 1) % self._size
@@ -17,15 +17,18 @@
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
 """Autothrottle Module"""
-from time import sleep
-from datetime import datetime
+import asyncio
+import threading
+from time import sleep, monotonic
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import logging
 from typing import Union
 
 from scipy.stats import expon
-import numpy as np
 
 from appstore.infrastructure.web.base import Throttle
+from appstore.infrastructure.web.stats import RingBuffer, RunningStats
 
 # ------------------------------------------------------------------------------------------------ #
 
@@ -33,6 +36,10 @@ from appstore.infrastructure.web.base import Throttle
 class LatencyThrottle(Throttle):
     """Throttles based upon the target website latency.
 
+    The throttle may be shared by several threads. Each request obtains a start token from
+    start and passes it to stop, and the latency returned by stop to delay. The delay state is
+    updated under a lock, and the delay is slept outside it.
+
     Args:
         start_delay (int): The initial delay in milliseconds. Default = 3000
         min_delay (int): Minimum number of milliseconds between requests. Default = 1000
@@ -61,84 +68,76 @@ class LatencyThrottle(Throttle):
         self._prior_delay = start_delay
         self._counter = 0
         self._latency = None
-        self._latencies = []
-        self._wait = []
 
         self._start = None
         self._end = None
 
-    def start(self) -> None:
+        self._lock = threading.Lock()
+
+    def start(self) -> datetime:
+        """Marks the start of a request and returns the start time to be passed to stop."""
         self._start = datetime.now()
+        return self._start
 
-    def stop(self) -> None:
-        self._end = datetime.now()
-        self._latency = (self._end - self._start).total_seconds()
-        self._latencies.append(self._latency)
+    def stop(self, started: datetime = None) -> float:
+        """Records and returns the latency of the request.
 
-    def delay(self) -> Union[float, None]:
-        """Computes and optionally executes a delay, related to request latency and status code.
+        Args:
+            started (datetime): The start time returned by start. Concurrent requests must
+                pass their own start time. Defaults to the time of the last call to start.
+        """
+        end = datetime.now()
+        latency = (end - (started or self._start)).total_seconds()
+        with self._lock:
+            self._end = end
+            self._latency = latency
+            self._latency_stats.add(latency)
+        return latency
+
+    def delay(self, latency: float = None) -> Union[float, None]:
+        """Computes and executes a delay, related to request latency and status code.
 
         Delay is equal to the average of the prior delay and the latency, bounded
         by min and max delay.
 
         Args:
-            latency (float): The time between the last request and its response
-            wait (bool): Should the method sleep, or return the delay time.
+            latency (float): The latency of the request for which the delay is computed.
+                Defaults to the most recently recorded latency.
 
         """
-        # Target delay is the time of round trips allowed per request.
-        target_delay = self._latency
-        # Compute adjusted delay as average of prior delay and target delay
-        new_delay = (target_delay + self._prior_delay) / 2.0
-        # New delay should be at least the target delay
-        new_delay = max(target_delay, new_delay)
-        # New Delay should be between min and max delay
-        new_delay = min(max(self._min_delay, new_delay), self._max_delay)
-        # Store the new delay
-        self._prior_delay = new_delay
-        self._wait.append(new_delay)
-        # Viola
-        self._monitor()
+        with self._lock:
+            # Target delay is the time of round trips allowed per request.
+            target_delay = self._latency if latency is None else latency
+            # Compute adjusted delay as average of prior delay and target delay
+            new_delay = (target_delay + self._prior_delay) / 2.0
+            # New delay should be at least the target delay
+            new_delay = max(target_delay, new_delay)
+            # New Delay should be between min and max delay
+            new_delay = min(max(self._min_delay, new_delay), self._max_delay)
+            # Store the new delay
+            self._prior_delay = new_delay
+            self._delay_stats.add(new_delay)
+            # Viola
+            self._monitor()
         # Wait
         sleep(new_delay)
+        return new_delay
 
     def _monitor(self):
-        """Monitors and reports average latency and delay
-
-        Args:
-            latency (float): Time between request and server response
-        """
+        """Monitors and reports latency and delay statistics over the life of the throttle."""
         self._counter += 1
 
         if self._counter % self._verbose == 0:
-            min_latency = round(np.min(self._latencies), 2)
-            max_latency = round(np.max(self._latencies), 2)
-            ave_latency = round(np.mean(self._latencies), 2)
-            std_latency = round(np.std(self._latencies), 2)
-            ttl_latency = round(np.sum(self._latencies), 2)
-            min_delay = round(np.min(self._wait), 2)
-            max_delay = round(np.max(self._wait), 2)
-            ave_delay = round(np.mean(self._wait), 2)
-            std_delay = round(np.std(self._wait), 2)
-            ttl_delay = round(np.sum(self._wait), 2)
-
+            stats = self.stats
             width = 32
-            msg = f"\n\t{'Min Latency'.rjust(width, ' ')} | {min_latency}\n"
-            msg += f"\n\t{'Max Latency'.rjust(width, ' ')} | {max_latency}\n"
-            msg += f"\n\t{'Ave Latency'.rjust(width, ' ')} | {ave_latency}\n"
-            msg += f"\t{'Std Latency'.rjust(width, ' ')} | {std_latency}\n"
-            msg += f"\t{'Total Latency'.rjust(width, ' ')} | {ttl_latency}\n\n"
-            msg += f"\t{'Min Delay'.rjust(width, ' ')} | {min_delay}\n"
-            msg += f"\t{'Max Delay'.rjust(width, ' ')} | {max_delay}\n"
-            msg += f"\t{'Ave Delay'.rjust(width, ' ')} | {ave_delay}\n"
-            msg += f"\t{'Std Delay'.rjust(width, ' ')} | {std_delay}\n"
-            msg += f"\t{'Total Delay'.rjust(width, ' ')} | {ttl_delay}\n"
+            msg = ""
+            for name in ("latency", "delay"):
+                for stat in ("min", "max", "mean", "std", "p50", "p95", "p99", "total"):
+                    label = f"{stat.capitalize()} {name.capitalize()}"
+                    msg += f"\t{label.rjust(width, ' ')} | {round(stats[name][stat], 2)}\n"
+                msg += "\n"
             self._logger.debug(msg)
 
-            self._counter = 0
-            self._latencies = []
-            self._wait = []
-
 
 # ------------------------------------------------------------------------------------------------ #
 
@@ -146,6 +145,11 @@ class LatencyThrottle(Throttle):
 class AThrottle(Throttle):
     """Async Throttle based upon the target website latency.
 
+    A single throttle is shared by all in-flight requests of an ASessionHandler. Each request
+    obtains a start token from start, reports its latency to stop, and awaits delay. The
+    burn-in, rolling window, and cooldown state is updated before the delay is awaited, and
+    the delay suspends only the calling task, so other requests progress in the meantime.
+
     Args:
         burnin_period (int): The number of requests in the burn-in period. Default is 50
         burnin_reset (int): The number of requests between each burnin period.
@@ -193,37 +197,57 @@ class AThrottle(Throttle):
         self._burnin_latency_mean = 0
         self._burnin_latency_std = 0
         self._burnin_latency_threshold = 0
-        self._burnin_latency = []
-        self._latencies = []
-        self._delays = []
+        self._burnin_latency = RunningStats()
 
-        self._latency_window = np.zeros(self._rolling_window_size)
+        self._latency_window = RingBuffer(size=self._rolling_window_size)
         self._logger = logging.getLogger(f"{self.__class__.__name__}")
 
-    def start(self) -> None:
+    def start(self) -> datetime:
+        """Marks the start of a request and returns the start time to be passed to stop."""
         self._start = datetime.now()
+        return self._start
+
+    def stop(self, started: datetime = None) -> float:
+        """Records and returns the latency of the request.
 
-    def stop(self) -> None:
+        Args:
+            started (datetime): The start time returned by start. Concurrent requests must
+                pass their own start time. Defaults to the time of the last call to start.
+        """
         self._end = datetime.now()
-        self._latency = (self._end - self._start).total_seconds()
-        self._latencies.append(self._latency)
+        started = started or self._start
+        self._latency = (self._end - started).total_seconds()
+        self._latency_stats.add(self._latency)
+        return self._latency
+
+    async def delay(self, latency: float = None) -> float:
+        """Computes the delay for the next request and suspends the calling task for its duration.
+
+        Args:
+            latency (float): The latency of the request for which the delay is computed.
+                Defaults to the most recently recorded latency.
+        """
+        delay = self._next_delay(latency=latency)
+        await asyncio.sleep(delay)
+        return delay
 
-    def delay(self) -> Union[float, None]:
-        """Computes the delay for the next request."""
+    def _next_delay(self, latency: float = None) -> float:
+        """Updates the shared throttle state with the latency and returns the next delay."""
+        latency = self._latency if latency is None else latency
 
         if self._starting_epoch():
             self._reset_epoch()
 
         if self._burning_in():
-            self._burnin()
+            self._burnin(latency)
             delay = self._burnin_delay()
         else:
-            delay = self._compute_delay()
+            delay = self._compute_delay(latency)
 
         self._counter += 1
-        self._delays.append(delay)
-        sleep(delay)
+        self._delay_stats.add(delay)
         self._monitor()
+        return delay
 
     def _starting_epoch(self) -> bool:
         """If first request after burn-in, return True, otherwise return False"""
@@ -236,7 +260,7 @@ class AThrottle(Throttle):
         self._burnin_latency_mean = 0
         self._burnin_latency_std = 0
         self._burnin_latency_threshold = 0
-        self._burnin_latency = []
+        self._burnin_latency.reset()
 
     def _burning_in(self) -> bool:
         """Returns True if within a burn-in period, returns False otherwise."""
@@ -244,31 +268,36 @@ class AThrottle(Throttle):
             return True
         return False
 
-    def _burnin(self) -> float:
+    def _burnin(self, latency: float) -> None:
         """Captures statistics for the burnin-phase
 
         Args:
             latency (float): Time between last request and response
         """
-        if len(self._burnin_latency) == 0:
+        if self._burnin_latency.count == 0:
             msg = "Starting Burn-in Phase"
             self._logger.debug(msg)
 
-        self._burnin_latency.append(self._latency)
-        if len(self._burnin_latency) == self._burnin_period:
-            self._burnin_latency_mean = np.mean(self._burnin_latency)
-            self._burnin_latency_std = np.std(self._burnin_latency)
+        self._burnin_latency.add(latency)
+        if self._burnin_latency.count == self._burnin_period:
+            self._burnin_latency_mean = self._burnin_latency.mean
+            self._burnin_latency_std = self._burnin_latency.std
             self._burnin_latency_threshold = (
                 self._burnin_latency_mean + self._burnin_threshold_factor * self._burnin_latency_std
             )
+            self._latency_window.threshold = self._burnin_latency_threshold
 
     def _burnin_delay(self) -> float:
         """Returns the delay during burn-in."""
         return expon.rvs(scale=1 / self._burnin_rate, size=1)[0]
 
-    def _compute_delay(self) -> int:
-        """Returns the number of seconds to delay"""
-        self._update_running_window(self._latency)
+    def _compute_delay(self, latency: float) -> float:
+        """Returns the number of seconds to delay
+
+        Args:
+            latency (float): Time between last request and response
+        """
+        self._update_running_window(latency)
         delay = expon.rvs(scale=1 / self._rate, size=1)[0]
         if self._running_hot():
             delay = self._cooldown(delay)
@@ -280,15 +309,11 @@ class AThrottle(Throttle):
         Args:
             latency (float): Time between last request and response
         """
-        idx = self._counter % self._burnin_period
-        self._latency_window[idx] = latency
+        self._latency_window.add(latency)
 
     def _running_hot(self) -> bool:
         """Returns True if tolerance of window_size is above threshold, and returns False otherwise."""
-        return (
-            np.sum(np.where(self._latency_window > self._burnin_latency_threshold))
-            > self._tolerance * self._rolling_window_size
-        )
+        return self._latency_window.above > self._tolerance * self._rolling_window_size
 
     def _cooldown(self, delay: float) -> float:
         """If rate has been adjusted and watching the rolling window_size"""
@@ -306,28 +331,234 @@ class AThrottle(Throttle):
 
     def _monitor(self) -> None:
         if self._counter % self._verbose == 0:
-            min_latency = np.min(self._latencies)
-            mean_latency = np.mean(self._latencies)
-            std_latency = np.std(self._latencies)
-            max_latency = np.max(self._latencies)
-            min_delay = np.min(self._delays)
-            mean_delay = np.mean(self._delays)
-            std_delay = np.std(self._delays)
-            max_delay = np.max(self._delays)
-
-            self._latencies = []
-            self._delays = []
-
+            stats = self.stats
             width = 24
-            msg = f"{self.__class__.__name__}:\n:"
+            msg = f"{self.__class__.__name__}:\n"
             msg += f"\t{'Count:'.rjust(width,' ')} | {self._counter}\n"
-            msg += f"\t{'Min Latency:'.rjust(width,' ')} | {min_latency}\n"
-            msg += f"\t{'Min Latency:'.rjust(width,' ')} | {min_latency}\n"
-            msg += f"\t{'Mean Latency:'.rjust(width,' ')} | {mean_latency}\n"
-            msg += f"\t{'Max Latency:'.rjust(width,' ')} | {max_latency}\n"
-            msg += f"\t{'Std Latency:'.rjust(width,' ')} | {std_latency}\n\n"
-            msg += f"\t{'Min Delay:'.rjust(width,' ')} | {min_delay}\n"
-            msg += f"\t{'Mean Delay:'.rjust(width,' ')} | {mean_delay}\n"
-            msg += f"\t{'Max Delay:'.rjust(width,' ')} | {max_delay}\n"
-            msg += f"\t{'Std Delay:'.rjust(width,' ')} | {std_delay}\n"
+            for name in ("latency", "delay"):
+                for stat in ("min", "mean", "max", "std", "p50", "p95", "p99"):
+                    label = f"{stat.capitalize()} {name.capitalize()}:"
+                    msg += f"\t{label.rjust(width,' ')} | {stats[name][stat]}\n"
+                msg += "\n"
+            self._logger.debug(msg)
+
+
+# ------------------------------------------------------------------------------------------------ #
+
+
+class RateLimiter:
+    """Paces requests to a fixed rate, across all threads and tasks sharing the limiter.
+
+    Each request reserves the next of a series of evenly spaced slots, and waits until it.
+    Access is serialized by a lock, so that the rate applies to all callers combined.
+
+    Args:
+        rate (float): The number of requests per second. Default = 10
+    """
+
+    def __init__(self, rate: float = 10) -> None:
+        self._rate = rate
+
+        self._next = 0  # Time of the next available request slot
+        self._held_until = 0  # Time until which requests are held, per Retry-After
+
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(f"{self.__class__.__name__}")
+
+    @property
+    def rate(self) -> float:
+        """Returns the current number of requests per second."""
+        return self._rate
+
+    def reserve(self) -> float:
+        """Reserves the next request slot and returns the number of seconds until it."""
+        with self._lock:
+            now = monotonic()
+            slot = max(now, self._next, self._held_until)
+            self._next = slot + 1 / self._rate
+            return slot - now
+
+    def acquire(self) -> float:
+        """Waits until the next request slot and returns the number of seconds waited."""
+        delay = self.reserve()
+        sleep(delay)
+        return delay
+
+    def hold(self) -> float:
+        """Returns the number of seconds remaining until requests are no longer held."""
+        with self._lock:
+            return max(0, self._held_until - monotonic())
+
+
+# ------------------------------------------------------------------------------------------------ #
+
+
+class AIMDRate(RateLimiter):
+    """Request rate controlled by additive-increase / multiplicative-decrease.
+
+    Each successful response adds increase / rate to the rate, so that the rate grows by about
+    'increase' requests per second, every second, while the server keeps up. The rate is
+    multiplied by 'decrease' when the server signals overload with a 429 or 5xx status. A
+    Retry-After header holds all requests until the time it specifies. Requests are paced by
+    reserving evenly spaced slots, so that the rate applies to all callers combined.
+
+    A single instance is shared by the synchronous and asynchronous throttles, and access is
+    serialized by a lock, so that a signal observed by one session handler slows both.
+
+    Args:
+        rate (float): The initial number of requests per second. Default = 1
+        min_rate (float): The minimum number of requests per second. Default = 0.1
+        max_rate (float): The maximum number of requests per second. Default = 20
+        increase (float): Requests per second added per second of successes. Default = 0.1
+        decrease (float): Factor applied to the rate on each overload signal. Default = 0.5
+        interval (float): Minimum number of seconds between decreases, so that the overload
+            signals of requests in flight at the same time count once. Default = 1
+        verbose (int): Number of signals between progress reports to the log. Default = 100
+    """
+
+    def __init__(
+        self,
+        rate: float = 1,
+        min_rate: float = 0.1,
+        max_rate: float = 20,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        interval: float = 1,
+        verbose: int = 100,
+    ) -> None:
+        super().__init__(rate=rate)
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase = increase
+        self._decrease = decrease
+        self._interval = interval
+        self._verbose = verbose
+
+        self._decreased = None  # Time of the last decrease
+        self._signals = 0
+        self._overloads = 0
+
+    def signal(self, status_code: int, retry_after: str = None) -> None:
+        """Adjusts the rate to the status of a response.
+
+        Args:
+            status_code (int): The HTTP status code of the response.
+            retry_after (str): The value of the Retry-After header, if provided.
+        """
+        if status_code is None:
+            return
+        with self._lock:
+            now = monotonic()
+            self._signals += 1
+            if status_code == 429 or status_code >= 500:
+                self._overloads += 1
+                if self._decreased is None or now - self._decreased >= self._interval:
+                    self._rate = max(self._min_rate, self._rate * self._decrease)
+                    self._decreased = now
+                    msg = f"Status code {status_code} received. Decreasing rate to {round(self._rate, 2)} requests per second."
+                    self._logger.debug(msg)
+                wait = self._parse_retry_after(retry_after)
+                if wait > 0:
+                    self._held_until = max(self._held_until, now + wait)
+            elif status_code < 400:
+                self._rate = min(self._max_rate, self._rate + self._increase / self._rate)
+            self._monitor()
+
+    def _parse_retry_after(self, retry_after: str) -> float:
+        """Returns the seconds to wait from a Retry-After header in seconds or HTTP date form."""
+        if not retry_after:
+            return 0
+        try:
+            return max(0, float(retry_after))
+        except ValueError:
+            try:
+                until = parsedate_to_datetime(retry_after)
+                return max(0, (until - datetime.now(timezone.utc)).total_seconds())
+            except Exception:
+                return 0
+
+    def _monitor(self) -> None:
+        if self._signals % self._verbose == 0:
+            width = 24
+            msg = f"{self.__class__.__name__}:\n"
+            msg += f"\t{'Signals:'.rjust(width,' ')} | {self._signals}\n"
+            msg += f"\t{'Overloads:'.rjust(width,' ')} | {self._overloads}\n"
+            msg += f"\t{'Rate:'.rjust(width,' ')} | {round(self._rate, 2)}\n"
             self._logger.debug(msg)
+
+
+# ------------------------------------------------------------------------------------------------ #
+
+
+class AIMDThrottle(Throttle):
+    """Throttles the synchronous session handler at the rate set by a shared AIMDRate.
+
+    Args:
+        rate (AIMDRate): The request rate, shared with the asynchronous throttle.
+    """
+
+    def __init__(self, rate: AIMDRate) -> None:
+        super().__init__()
+        self._rate = rate
+        self._start = None
+        self._latency = None
+        self._lock = threading.Lock()
+
+    def start(self) -> datetime:
+        """Marks the start of a request and returns the start time to be passed to stop."""
+        self._start = datetime.now()
+        return self._start
+
+    def stop(self, started: datetime = None) -> float:
+        """Records and returns the latency of the request.
+
+        Args:
+            started (datetime): The start time returned by start. Concurrent requests must
+                pass their own start time. Defaults to the time of the last call to start.
+        """
+        latency = (datetime.now() - (started or self._start)).total_seconds()
+        with self._lock:
+            self._latency = latency
+            self._latency_stats.add(latency)
+        return latency
+
+    def delay(self, latency: float = None) -> float:
+        """Waits until the next request slot and returns the delay in seconds.
+
+        Args:
+            latency (float): Unused. Accepted for compatibility with LatencyThrottle.
+        """
+        delay = self._rate.reserve()
+        with self._lock:
+            self._delay_stats.add(delay)
+        sleep(delay)
+        return delay
+
+    def signal(self, status_code: int, retry_after: str = None) -> None:
+        self._rate.signal(status_code=status_code, retry_after=retry_after)
+
+    def hold(self) -> float:
+        return self._rate.hold()
+
+
+# ------------------------------------------------------------------------------------------------ #
+
+
+class AAIMDThrottle(AIMDThrottle):
+    """Throttles the asynchronous session handler at the rate set by a shared AIMDRate.
+
+    Args:
+        rate (AIMDRate): The request rate, shared with the synchronous throttle.
+    """
+
+    async def delay(self, latency: float = None) -> float:
+        """Suspends the calling task until the next request slot and returns the delay.
+
+        Args:
+            latency (float): Unused. Accepted for compatibility with AThrottle.
+        """
+        delay = self._rate.reserve()
+        with self._lock:
+            self._delay_stats.add(delay)
+        await asyncio.sleep(delay)
+        return delay
@@ -0,0 +1,139 @@
+/*
+ * Filename: /home/john/projects/appstore/scripts/database/setup/migrate.sql
+ * Path: /home/john/projects/appstore/scripts/database/setup
+ * Created Date: Sunday, October 18th 2026, 4:48:03 pm
+ * Author: John James
+ *
+ * Copyright (c) 2023 John James
+ */
+
+-- Adds the high-water mark used by the incremental review refresh to existing review request
+-- tables, and sets it to the newest review already stored for each app. Adds the extraction
+-- time used by the rating refresh to existing rating tables. Ratings without one are stale.
+-- Adds the lease with which workers claim jobs to existing job tables. Creates the checkpoint
+-- table from which interrupted scrapes resume, keyed by controller and app or search term.
+-- Indexes the app ids of the rating table and the categories of the appdata table, on which
+-- the rating controller selects the apps it has yet to process.
+--
+-- Each step checks information_schema first, so the migration may be run again, i.e. after
+-- an interrupted run, or against a database already migrated in part.
+
+USE appstore;
+
+DROP PROCEDURE IF EXISTS migrate_add_column;
+DROP PROCEDURE IF EXISTS migrate_add_index;
+
+DELIMITER //
+
+-- Adds the column to the table, unless the table already has it.
+CREATE PROCEDURE migrate_add_column(
+    IN p_schema VARCHAR(64),
+    IN p_table VARCHAR(64),
+    IN p_column VARCHAR(64),
+    IN p_definition VARCHAR(255)
+)
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = p_schema AND TABLE_NAME = p_table
+            AND COLUMN_NAME = p_column
+    ) THEN
+        SET @ddl = CONCAT(
+            'ALTER TABLE `', p_schema, '`.`', p_table, '` ADD COLUMN `', p_column, '` ',
+            p_definition
+        );
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END //
+
+-- Creates the index on the table, unless the table already has an index of that name.
+CREATE PROCEDURE migrate_add_index(
+    IN p_schema VARCHAR(64),
+    IN p_table VARCHAR(64),
+    IN p_index VARCHAR(64),
+    IN p_columns VARCHAR(255)
+)
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = p_schema AND TABLE_NAME = p_table
+            AND INDEX_NAME = p_index
+    ) THEN
+        SET @ddl = CONCAT(
+            'CREATE INDEX `', p_index, '` ON `', p_schema, '`.`', p_table, '` (',
+            p_columns, ')'
+        );
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END //
+
+DELIMITER ;
+
+-- ------------------------------------------------------------------------------------------------
+--                                          APPSTORE
+-- ------------------------------------------------------------------------------------------------
+CALL migrate_add_column('appstore', 'review_request', 'last_review_date', 'DATETIME NULL');
+CALL migrate_add_column('appstore', 'review_request', 'last_review_id', 'VARCHAR(64) NULL');
+
+-- Only marks not yet set are backfilled, so that marks advanced by a refresh are kept.
+UPDATE review_request rr
+JOIN (
+    SELECT r.app_id, r.date, MAX(r.id) AS id
+    FROM review r
+    JOIN (SELECT app_id, MAX(date) AS date FROM review GROUP BY app_id) newest
+        ON r.app_id = newest.app_id AND r.date = newest.date
+    GROUP BY r.app_id, r.date
+) mark ON rr.id = mark.app_id
+SET rr.last_review_date = mark.date, rr.last_review_id = mark.id
+WHERE rr.last_review_date IS NULL;
+
+CALL migrate_add_column('appstore', 'rating', 'extracted', 'DATETIME NULL');
+
+CALL migrate_add_column('appstore', 'job', 'leased_by', 'VARCHAR(128) NULL');
+CALL migrate_add_column('appstore', 'job', 'lease_expires', 'DATETIME NULL');
+
+CREATE TABLE IF NOT EXISTS checkpoint (
+    controller VARCHAR(64) NOT NULL,
+    job_id VARCHAR(64) NULL,
+    id VARCHAR(128) NOT NULL,
+    position BIGINT NOT NULL,
+    updated DATETIME NULL,
+    PRIMARY KEY (controller, id),
+    INDEX (controller, job_id)
+);
+
+CALL migrate_add_index('appstore', 'rating', 'ix_rating_id', 'id');
+
+CALL migrate_add_index('appstore', 'appdata', 'ix_appdata_category_id', 'category_id, id');
+
+-- ------------------------------------------------------------------------------------------------
+--                                        APPSTORE TEST
+-- ------------------------------------------------------------------------------------------------
+CALL migrate_add_column('appstore_test', 'review_request', 'last_review_date', 'DATETIME NULL');
+CALL migrate_add_column('appstore_test', 'review_request', 'last_review_id', 'VARCHAR(64) NULL');
+
+CALL migrate_add_column('appstore_test', 'rating', 'extracted', 'DATETIME NULL');
+
+CALL migrate_add_column('appstore_test', 'job', 'leased_by', 'VARCHAR(128) NULL');
+CALL migrate_add_column('appstore_test', 'job', 'lease_expires', 'DATETIME NULL');
+
+CREATE TABLE IF NOT EXISTS appstore_test.checkpoint (
+    controller VARCHAR(64) NOT NULL,
+    job_id VARCHAR(64) NULL,
+    id VARCHAR(128) NOT NULL,
+    position BIGINT NOT NULL,
+    updated DATETIME NULL,
+    PRIMARY KEY (controller, id),
+    INDEX (controller, job_id)
+);
+
+CALL migrate_add_index('appstore_test', 'rating', 'ix_rating_id', 'id');
+
+CALL migrate_add_index('appstore_test', 'appdata', 'ix_appdata_category_id', 'category_id, id');
+
+DROP PROCEDURE IF EXISTS migrate_add_column;
+DROP PROCEDURE IF EXISTS migrate_add_index;
@@ -21,6 +21,7 @@ from datetime import datetime
 import pytest
 import logging
 
+from appstore.config import Config
 from appstore.infrastructure.file.config import FileConfig
 
 
@@ -100,3 +101,40 @@ class TestFileConfig:  # pragma: no cover
             )
         )
         logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_reload(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        # The file is parsed once and shared, until reloaded.
+        fc1 = FileConfig()
+        fc2 = FileConfig()
+        assert fc1._config is fc2._config
+        Config.reload()
+        fc3 = FileConfig()
+        assert fc3._config is not fc1._config
+        assert fc3.archive == fc1.archive
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\n\tCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
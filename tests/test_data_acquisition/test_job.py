@@ -185,3 +185,55 @@ class TestJob:  # pragma: no cover
             )
         )
         logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_claim_renew(self, job_df, job_repo, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        job_repo.delete_all()
+        job_repo.load(job_df)
+        # Workers never claim the same job, and a claimed job is not claimed again.
+        claimed = set()
+        for i in range(10):
+            worker = f"worker-{i % 2}"
+            job = job_repo.claim(controller="RatingController", worker=worker, lease=600)
+            if i < 7:
+                assert isinstance(job, Job)
+                assert job.id not in claimed
+                assert job_repo.renew(id=job.id, worker=worker, lease=600)
+                assert not job_repo.renew(id=job.id, worker="other", lease=600)
+                claimed.add(job.id)
+                last, holder = job, worker
+            else:
+                assert job is None
+
+        # A job is not ended by a worker that does not hold its lease.
+        last.complete = False
+        assert job_repo.update(last, worker="other") == 0
+        # Updating a job releases its lease.
+        assert job_repo.update(last, worker=holder) == 1
+        assert job_repo.claim(controller="RatingController", worker="worker-2").id == last.id
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\n\tCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
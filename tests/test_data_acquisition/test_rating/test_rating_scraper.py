@@ -54,13 +54,12 @@ class TestRatingScraper:  # pragma: no cover
         df = repo.sample(10)
 
         async for result in RatingScraper(apps=df, batch_size=5):
-            assert isinstance(result.content, list)
+            assert isinstance(result.content, dict)
             assert result.apps + result.errors == 5
             assert isinstance(result.size, int)
-            for data in result.content:
-                for key in KEYS:
-                    assert key in data
-                logger.debug(data)
+            for key in KEYS:
+                assert key in result.content
+                assert len(result.content[key]) == result.apps
 
             logger.debug(result.get_result())
             logger.debug(result)
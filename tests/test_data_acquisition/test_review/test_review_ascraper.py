@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.12                                                                             #
+# Filename   : /tests/test_data_acquisition/test_review/test_review_ascraper.py                    #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 09:40:12 am                                                #
+# Modified   : Sunday October 18th 2026 09:40:12 am                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+import inspect
+from datetime import datetime
+import pytest
+import logging
+
+import pandas as pd
+
+from appstore.data.acquisition.review.ascraper import AReviewScraper
+from appstore.data.acquisition.review.result import ReviewResult
+
+KEYS = [
+    "id",
+    "app_id",
+    "app_name",
+    "category_id",
+    "category",
+    "author",
+    "rating",
+    "title",
+    "content",
+    "vote_sum",
+    "vote_count",
+    "date",
+]
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+@pytest.mark.review_scraper
+@pytest.mark.asyncio
+class TestAReviewScraper:  # pragma: no cover
+    # ============================================================================================ #
+    async def test_scraper(self, container, apps, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        apps = [(app, 0) for app in apps if app.category_id == "6002"]
+        pages = {}
+        async with container.web.asession() as session_handler:
+            scraper = AReviewScraper(apps=apps, session_handler=session_handler, max_pages=4)
+            async for result in scraper.scrape():
+                assert isinstance(result, ReviewResult)
+                assert result.reviews > 0
+                assert isinstance(result.get_result(), pd.DataFrame)
+                assert list(result.content.columns) == KEYS
+                # Pages of each app arrive in order.
+                assert result.index > pages.get(result.app.id, -1)
+                pages[result.app.id] = result.index
+
+        assert len(pages) > 0
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
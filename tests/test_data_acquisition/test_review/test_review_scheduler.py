@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.12                                                                             #
+# Filename   : /tests/test_data_acquisition/test_review/test_review_scheduler.py                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 04:21:52 pm                                                #
+# Modified   : Sunday October 18th 2026 04:21:52 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+import inspect
+from datetime import datetime
+import pytest
+import logging
+
+import pandas as pd
+
+from appstore.data.acquisition.review.scheduler import ReviewScheduler
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+class RatingRepoStub:
+    def get_review_counts(self, category_id):
+        return {"a": 1000, "b": 50, "c": 800}
+
+    def get_counts(self, category_id=None):
+        return pd.DataFrame(
+            {
+                "id": ["a", "b", "c", "d", "e"],
+                "category_id": ["6000", "6000", "6000", "6001", "6001"],
+                "reviews": [1000, 50, 800, 10, 5],
+                "ratings": [5000, 100, 4000, 30, 25],
+            }
+        )
+
+
+class ReviewRequestRepoStub:
+    def get_last_indices(self, category_id=None):
+        return {"a": 800}
+
+
+class UoWStub:
+    rating_repo = RatingRepoStub()
+    review_request_repo = ReviewRequestRepoStub()
+
+
+@pytest.mark.review_scheduler
+class TestReviewScheduler:  # pragma: no cover
+    # ============================================================================================ #
+    def test_prioritize(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        scheduler = ReviewScheduler(uow=UoWStub(), max_results_per_page=400)
+        apps = pd.DataFrame(
+            {
+                "id": ["a", "b", "c", "x"],
+                "category_id": ["6000"] * 4,
+                "ratings": [5000, 100, 4000, 8000],
+            }
+        )
+        # 'x' has no review count, and is estimated at the median 0.2 reviews per rating.
+        # Full pages come first, larger backlogs breaking ties, then the part-harvested 'a'.
+        apps = scheduler.prioritize(apps=apps)
+        assert apps["id"].tolist() == ["x", "c", "a", "b"]
+
+        priorities = scheduler.priorities()
+        assert priorities["6000"] == pytest.approx(1050 / 4)
+        assert priorities["6001"] == pytest.approx(7.5)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
@@ -23,8 +23,10 @@ import logging
 
 import pandas as pd
 
+from appstore.data.acquisition.base import App
 from appstore.data.acquisition.review.scraper import ReviewScraper
 from appstore.data.acquisition.review.result import ReviewResult
+from appstore.infrastructure.web.response import ParsedResponse
 
 KEYS = [
     "id",
@@ -41,6 +43,36 @@ KEYS = [
     "date",
 ]
 
+
+# ------------------------------------------------------------------------------------------------ #
+class PagedSessionHandler:
+    """Serves pages of newest-first reviews, numbered from 0, recording the urls requested."""
+
+    def __init__(self, reviews: int, max_results_per_page: int) -> None:
+        self._reviews = reviews
+        self._max_results_per_page = max_results_per_page
+        self.urls = []
+
+    def fetch(self, url: str, header: dict = None) -> ParsedResponse:
+        self.urls.append(url)
+        start = int(url.split("startIndex=")[1].split("&")[0])
+        stop = min(start + self._max_results_per_page, self._reviews)
+        reviews = [
+            {
+                "userReviewId": str(self._reviews - i),
+                "name": "author",
+                "rating": 5,
+                "title": "title",
+                "body": "body",
+                "voteSum": 0,
+                "voteCount": 0,
+                "date": f"2023-06-01T{23 - i:02d}:00:00-07:00",
+            }
+            for i in range(start, stop)
+        ]
+        return ParsedResponse(status_code=200, content={"userReviewList": reviews}, size=1)
+
+
 # ------------------------------------------------------------------------------------------------ #
 logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------------------------ #
@@ -82,6 +114,53 @@ class TestReviewScraper:  # pragma: no cover
         )
         logger.info(single_line)
 
+    # ============================================================================================ #
+    def test_refresh(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        app = App(id="1", name="app", category_id="6000", category="Business")
+        # Review i, counting from the newest, is dated (23 - i):00 at -07:00, i.e. UTC + 7h.
+        for mark, expected, requests in ((6, 6, 2), (2, 2, 1)):
+            session_handler = PagedSessionHandler(reviews=10, max_results_per_page=4)
+            results = list(
+                ReviewScraper(
+                    app=app,
+                    session_handler=session_handler,
+                    max_results_per_page=4,
+                    since=datetime(2023, 6, 2, 6 - mark),
+                    since_id=str(10 - mark),
+                    sort=4,
+                )
+            )
+            # Every review newer than the mark is returned, including those ahead of the mark
+            # on its page, and no page after the mark's page is requested.
+            assert sum(result.reviews for result in results) == expected
+            assert len(session_handler.urls) == requests
+            assert all(url.endswith("&sort=4") for url in session_handler.urls)
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
     # ============================================================================================ #
     def test_scraper(self, apps, caplog):
         start = datetime.now()
@@ -109,12 +188,11 @@ class TestReviewScraper:  # pragma: no cover
                     assert isinstance(result, ReviewResult)
                     assert result.app == app
                     assert result.reviews > 0
-                    assert isinstance(result.content, list)
+                    assert isinstance(result.content, pd.DataFrame)
                     assert isinstance(result.get_result(), pd.DataFrame)
                     assert isinstance(result.index, int)
-                    for review in result.content:
-                        for key in KEYS:
-                            assert key in review
+                    assert list(result.content.columns) == KEYS
+                    assert len(result.content) == result.reviews
 
         # ---------------------------------------------------------------------------------------- #
         end = datetime.now()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Enter Project Name in Workspace Settings                                            #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /tests/test_infrastructure/test_web/test_cache.py                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : Enter URL in Workspace Settings                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 02:05:51 pm                                                #
+# Modified   : Sunday October 18th 2026 02:05:51 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+import inspect
+from datetime import datetime
+import pytest
+import logging
+from time import sleep
+
+from appstore.infrastructure.web.cache import ResponseCache
+
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+URL = "https://itunes.apple.com/search"
+
+
+@pytest.mark.cache
+class TestResponseCache:  # pragma: no cover
+    # ============================================================================================ #
+    def test_cache(self, tmp_path, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        cache = ResponseCache(directory=str(tmp_path), ttl=0.5)
+        key = cache.key(url=URL, params={"term": "health", "offset": 0})
+        assert key == cache.key(url=URL, params={"offset": 0, "term": "health"})
+        assert cache.get(key=key) is None
+
+        cache.put(key=key, body=b'{"results": []}', headers={"ETag": '"abc"'})
+        entry = cache.get(key=key)
+        assert entry.json() == {"results": []}
+        assert cache.is_fresh(entry=entry)
+        assert entry.to_response(url=URL).json() == {"results": []}
+
+        # Stale entries are revalidated with the validators of the cached response.
+        sleep(0.6)
+        entry = cache.get(key=key)
+        assert not cache.is_fresh(entry=entry)
+        assert cache.validators(entry=entry) == {"If-None-Match": '"abc"'}
+        entry = cache.revalidated(key=key, entry=entry)
+        assert cache.is_fresh(entry=cache.get(key=key))
+
+        # Entries persist across instances.
+        assert ResponseCache(directory=str(tmp_path)).get(key=key).json() == {"results": []}
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_eviction(self, tmp_path, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        cache = ResponseCache(directory=str(tmp_path), max_size=30)
+        keys = [cache.key(url=URL, params={"offset": i}) for i in range(4)]
+        for key in keys[:3]:
+            cache.put(key=key, body=b"0123456789", headers={})
+        # Use the first entry, so that the second is the least recently used.
+        cache.get(key=keys[0])
+        cache.put(key=keys[3], body=b"0123456789", headers={})
+
+        assert cache.size == 30
+        assert cache.get(key=keys[1]) is None
+        assert all(cache.get(key=key) is not None for key in (keys[0], keys[2], keys[3]))
+
+        # A disabled cache stores nothing.
+        cache = ResponseCache(directory=str(tmp_path / "disabled"), enabled=False)
+        cache.put(key=keys[0], body=b"0123456789", headers={})
+        assert cache.get(key=keys[0]) is None
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
@@ -16,14 +16,23 @@
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
+import asyncio
 import inspect
 from datetime import datetime
 import pytest
 import logging
 from time import sleep
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
-from appstore.infrastructure.web.throttle import AThrottle
+from appstore.infrastructure.web.throttle import (
+    AThrottle,
+    AIMDRate,
+    LatencyThrottle,
+    AIMDThrottle,
+    AAIMDThrottle,
+    RateLimiter,
+)
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -36,7 +45,8 @@ single_line = f"\n{100 * '-'}"
 @pytest.mark.delay
 class TestDelay:  # pragma: no cover
     # ============================================================================================ #
-    def test_delay(self, caplog):
+    @pytest.mark.asyncio
+    async def test_delay(self, caplog):
         start = datetime.now()
         logger.info(
             "\n\nStarted {} {} at {} on {}".format(
@@ -69,7 +79,183 @@ class TestDelay:  # pragma: no cover
                 latency = np.random.rand()
             sleep(int(latency))
             throttle.stop()
-            throttle.delay()
+            await throttle.delay()
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    @pytest.mark.asyncio
+    async def test_concurrent_delay(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        throttle = AThrottle(burnin_period=5, burnin_reset=20, burnin_rate=2, rate=2, verbose=5)
+
+        async def request() -> float:
+            started = throttle.start()
+            await asyncio.sleep(0.1)
+            return await throttle.delay(latency=throttle.stop(started))
+
+        began = datetime.now()
+        delays = await asyncio.gather(*[request() for _ in range(20)])
+        elapsed = (datetime.now() - began).total_seconds()
+        # Delays overlap rather than accumulate, since they do not block the event loop.
+        assert elapsed < sum(delays)
+        assert elapsed < max(delays) + 1
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    @pytest.mark.asyncio
+    async def test_aimd(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        rate = AIMDRate(rate=10, max_rate=12, increase=1, decrease=0.5, interval=1)
+        throttle = AIMDThrottle(rate=rate)
+        athrottle = AAIMDThrottle(rate=rate)
+
+        # Successes increase the rate additively, up to the maximum.
+        for _ in range(100):
+            athrottle.signal(status_code=200)
+        assert rate.rate == 12
+
+        # Overload signals from either throttle decrease the shared rate once per interval.
+        throttle.signal(status_code=429, retry_after="1")
+        athrottle.signal(status_code=503)
+        assert rate.rate == 6
+        assert 0 < athrottle.hold() <= 1
+
+        # Requests are held until the Retry-After time, then paced at the rate.
+        began = datetime.now()
+        await asyncio.gather(*[athrottle.delay() for _ in range(3)])
+        elapsed = (datetime.now() - began).total_seconds()
+        assert elapsed >= 0.9 + 2 / 6
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_rate_limiter(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        limiter = RateLimiter(rate=20)
+
+        # Requests from several threads share the one rate.
+        began = datetime.now()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: limiter.acquire(), range(21)))
+        elapsed = (datetime.now() - began).total_seconds()
+        assert elapsed >= 0.95
+        assert limiter.hold() == 0
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_latency_threads(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        throttle = LatencyThrottle(start_delay=0, min_delay=0, max_delay=0.01)
+
+        # Each thread's latency is measured from its own start, not the last thread's.
+        def request(latency: float) -> float:
+            started = throttle.start()
+            sleep(latency)
+            measured = throttle.stop(started=started)
+            throttle.delay(latency=measured)
+            return measured
+
+        latencies = [0.05, 0.2, 0.1, 0.3]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            measured = list(executor.map(request, latencies))
+        assert all(m >= latency for m, latency in zip(measured, latencies))
+        assert all(m < latency + 0.1 for m, latency in zip(measured, latencies))
+        assert throttle.stats["latency"]["total"] == pytest.approx(sum(measured))
+
         # ---------------------------------------------------------------------------------------- #
         end = datetime.now()
         duration = round((end - start).total_seconds(), 1)
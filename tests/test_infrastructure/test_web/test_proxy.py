@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Enter Project Name in Workspace Settings                                            #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /tests/test_infrastructure/test_web/test_proxy.py                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : Enter URL in Workspace Settings                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 11:40:05 am                                                #
+# Modified   : Sunday October 18th 2026 11:40:05 am                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+import inspect
+from datetime import datetime
+import pytest
+import logging
+from collections import Counter
+from time import sleep
+
+from appstore.infrastructure.web.proxy import ProxyPool
+
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+SERVERS = ["http://fast:1", "http://slow:2", "http://broken:3"]
+
+
+@pytest.mark.proxy
+class TestProxyPool:  # pragma: no cover
+    # ============================================================================================ #
+    def test_weighting(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        pool = ProxyPool(servers=SERVERS[:2], window=10)
+        assert pool.proxies == SERVERS[:2]
+        for _ in range(10):
+            pool.report(proxy="http://fast:1", latency=0.1)
+            pool.report(proxy="http://slow:2", latency=1.0)
+
+        counts = Counter(pool.next() for _ in range(1000))
+        assert counts["http://fast:1"] > 5 * counts["http://slow:2"]
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_ejection(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        pool = ProxyPool(servers=SERVERS, window=10, min_requests=5, max_error_rate=0.5, cooloff=1)
+        for _ in range(5):
+            pool.report(proxy="http://broken:3", error=True)
+        assert "http://broken:3" not in pool.healthy
+        assert all(pool.next() != "http://broken:3" for _ in range(100))
+
+        # The proxy returns to rotation after its cool-off.
+        sleep(1.1)
+        assert "http://broken:3" in pool.healthy
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
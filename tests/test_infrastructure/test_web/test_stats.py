@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Enter Project Name in Workspace Settings                                            #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /tests/test_infrastructure/test_web/test_stats.py                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : Enter URL in Workspace Settings                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 12:48:30 pm                                                #
+# Modified   : Sunday October 18th 2026 12:48:30 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+import inspect
+from datetime import datetime
+import pytest
+import logging
+
+import numpy as np
+
+from appstore.infrastructure.web.stats import RunningStats, StreamStats, RingBuffer
+from appstore.infrastructure.web.throttle import AThrottle
+
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+@pytest.mark.stats
+class TestStats:  # pragma: no cover
+    # ============================================================================================ #
+    def test_running_stats(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        x = np.random.default_rng(42).exponential(scale=0.5, size=10000)
+        running = RunningStats()
+        stream = StreamStats()
+        for value in x:
+            running.add(value)
+            stream.add(value)
+
+        assert running.count == len(x)
+        assert np.isclose(running.mean, np.mean(x))
+        assert np.isclose(running.std, np.std(x))
+        assert running.min == np.min(x)
+        assert running.max == np.max(x)
+        assert np.isclose(running.total, np.sum(x))
+        for p in (0.5, 0.95, 0.99):
+            assert np.isclose(stream.quantile(p), np.quantile(x, p), rtol=0.05)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_ring_buffer(self, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        x = np.random.default_rng(42).uniform(size=100)
+        window = RingBuffer(size=10, threshold=0.5)
+        for i, value in enumerate(x):
+            window.add(value)
+            assert window.above == np.count_nonzero(x[max(0, i - 9) : i + 1] > 0.5)
+
+        window.threshold = 0.9
+        assert window.above == np.count_nonzero(x[-10:] > 0.9)
+
+        # The throttle exposes its statistics without retaining observations.
+        throttle = AThrottle()
+        for _ in range(10):
+            throttle.stop(throttle.start())
+        assert throttle.stats["latency"]["count"] == 10
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
@@ -298,6 +298,49 @@ class TestAppDataRepo:  # pragma: no cover
         )
         logger.info(single_line)
 
+    # ============================================================================================ #
+    def test_get_unprocessed(self, appdata_repo, rating_repo, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo = appdata_repo
+        apps = repo.get_by_category(category_id=CATEGORY_ID)
+        assert len(apps) > 1
+        # Seed ratings for half of the apps of the category.
+        processed = apps.iloc[: len(apps) // 2]
+        rating_repo.load(data=processed[["id", "name", "category_id", "category"]])
+        rating_repo.save()
+        columns = ["id", "name", "category"]
+        df = repo.get_unprocessed(category_id=CATEGORY_ID, tablename="rating", columns=columns)
+        # Exactly the apps without ratings are returned, with the columns requested.
+        assert list(df.columns) == columns
+        assert sorted(df["id"]) == sorted(apps["id"].iloc[len(apps) // 2 :])
+        assert df["id"].dtype == "string"
+        assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+        rating_repo.delete_all()
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\n\tCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
     # ============================================================================================ #
     def test_get_dataset(self, appdata_repo, caplog):
         start = datetime.now()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /tests/test_repo/test_checkpoint_repo.py                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 05:44:30 pm                                                #
+# Modified   : Sunday October 18th 2026 05:44:30 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+import inspect
+from datetime import datetime
+import pytest
+import logging
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+# ------------------------------------------------------------------------------------------------ #
+CONTROLLER = "ReviewController"
+JOB_ID = "6000-ReviewController"
+
+
+@pytest.mark.repo
+@pytest.mark.checkpoint
+class TestCheckpointRepo:  # pragma: no cover
+    # ============================================================================================ #
+    def test_save_get(self, container, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo = container.data.checkpoint_repo()
+        repo.clear(controller=CONTROLLER)
+        assert repo.get_position(controller=CONTROLLER, id="123") is None
+
+        repo.save(controller=CONTROLLER, job_id=JOB_ID, id="123", position=400)
+        repo.save(controller=CONTROLLER, job_id=JOB_ID, id="456", position=800)
+        repo.save(controller=CONTROLLER, job_id=JOB_ID, id="123", position=1200)
+        assert repo.get_position(controller=CONTROLLER, id="123") == 1200
+        assert repo.get_positions(controller=CONTROLLER, job_id=JOB_ID) == {
+            "123": 1200,
+            "456": 800,
+        }
+
+        assert repo.clear(controller=CONTROLLER, job_id=JOB_ID) == 2
+        assert repo.get_positions(controller=CONTROLLER, job_id=JOB_ID) == {}
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
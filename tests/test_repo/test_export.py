@@ -23,6 +23,8 @@ import pytest
 import logging
 import shutil
 
+from appstore.infrastructure.file.io import IOService
+
 # Import whatever your testing here
 
 
@@ -94,6 +96,10 @@ class TestExportRepo:  # pragma: no cover
         # Export pkl, no category no datetime
         file = repo.export(directory=DIRECTORY, by_category=False, with_datetime=False)
         assert os.path.exists(file)
+        assert len(IOService.read(filepath=file)) == len(repo.getall())
+        # Export parquet in chunks, no category no datetime
+        file = repo.export(directory=DIRECTORY, format="parquet", with_datetime=False)
+        assert len(IOService.read(filepath=file)) == len(repo.getall())
 
         # ---------------------------------------------------------------------------------------- #
         end = datetime.now()
@@ -132,6 +138,10 @@ class TestExportRepo:  # pragma: no cover
         # Export pkl, no category no datetime
         file = repo.export(directory=DIRECTORY, by_category=False, with_datetime=False)
         assert os.path.exists(file)
+        assert len(IOService.read(filepath=file)) == len(repo.getall())
+        # Export parquet in chunks, no category no datetime
+        file = repo.export(directory=DIRECTORY, format="parquet", with_datetime=False)
+        assert len(IOService.read(filepath=file)) == len(repo.getall())
         # ---------------------------------------------------------------------------------------- #
         end = datetime.now()
         duration = round((end - start).total_seconds(), 1)
@@ -169,6 +179,10 @@ class TestExportRepo:  # pragma: no cover
         # Export pkl, no category no datetime
         file = repo.export(directory=DIRECTORY, by_category=False, with_datetime=False)
         assert os.path.exists(file)
+        assert len(IOService.read(filepath=file)) == len(repo.getall())
+        # Export parquet in chunks, no category no datetime
+        file = repo.export(directory=DIRECTORY, format="parquet", with_datetime=False)
+        assert len(IOService.read(filepath=file)) == len(repo.getall())
         # ---------------------------------------------------------------------------------------- #
         end = datetime.now()
         duration = round((end - start).total_seconds(), 1)
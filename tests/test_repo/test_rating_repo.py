@@ -17,14 +17,17 @@
 # Copyright  : (c) 2023 John James                                                                 #
 # ================================================================================================ #
 import inspect
-from datetime import datetime
+from datetime import datetime, timedelta
 import pytest
 import logging
 
 import pandas as pd
 
+from appstore.data.acquisition.rating.controller import RatingController
+from appstore.data.acquisition.rating.result import RatingResult
 from appstore.data.dataset.rating import RatingDataset
-from appstore.data.repo.rating import RatingRepo
+from appstore.data.repo.rating import RatingRepo, RatingHistoryRepo
+from appstore.data.repo.base import concat_chunks
 from appstore.data.entity.rating import Rating
 
 # ------------------------------------------------------------------------------------------------ #
@@ -43,6 +46,52 @@ NAME = "rating"
 CATEGORY_ID = "6013"
 
 
+def ratings_df(ratings: list, extracted: list, ids: list = None) -> pd.DataFrame:
+    """Returns ratings of apps '1', '2', ... of the category, with the counts given."""
+    ids = ids or [str(i + 1) for i in range(len(ratings))]
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "name": [f"App {id}" for id in ids],
+            "category_id": CATEGORY_ID,
+            "category": "Health & Fitness",
+            "rating": 4.5,
+            "reviews": [count // 10 for count in ratings],
+            "ratings": ratings,
+            "onestar": 0,
+            "twostar": 0,
+            "threestar": 0,
+            "fourstar": 0,
+            "fivestar": ratings,
+            "extracted": extracted,
+        }
+    )
+
+
+class RefreshScraper:
+    """Returns the ratings of the apps, ten per app number, and five more for app '1'."""
+
+    def __init__(self, apps: pd.DataFrame, *args, **kwargs) -> None:
+        self._apps = apps
+
+    async def stream(self, *args, **kwargs):
+        ids = self._apps["id"].astype(str).tolist()
+        ratings = [10 * int(id) + 5 * (id == "1") for id in ids]
+        result = RatingResult()
+        result.content = ratings_df(ratings=ratings, extracted=None, ids=ids)
+        result.content = result.content.drop(columns="extracted").to_dict(orient="list")
+        result.apps = len(ids)
+        yield result
+
+
+class NullSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
 @pytest.mark.rating
 @pytest.mark.rating_repo
 @pytest.mark.repo
@@ -162,6 +211,52 @@ class TestRatingRepo:  # pragma: no cover
             repo = RatingRepo(database=db)
             df = repo.get_by_category(category_id=CATEGORY_ID)
             assert df.shape[0] == 2
+            df = repo.get_by_category(category_id=CATEGORY_ID, columns=["id", "category"])
+            assert list(df.columns) == ["id", "category"]
+            assert df.shape[0] == 2
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\n\tCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_iter_chunks(self, container, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        with container.data.db() as db:
+            repo = RatingRepo(database=db)
+            chunks = list(repo.iter_chunks(chunksize=1))
+            assert all(len(chunk) <= 1 for chunk in chunks)
+            assert sum(len(chunk) for chunk in chunks) == repo.count()
+            chunks = list(
+                repo.iter_chunks(
+                    columns=["id", "category"],
+                    where="category_id = :category_id",
+                    params={"category_id": CATEGORY_ID},
+                )
+            )
+            df = concat_chunks(chunks)
+            assert df.shape == (2, 2)
+            assert df["category"].dtype == "category"
         # ---------------------------------------------------------------------------------------- #
         end = datetime.now()
         duration = round((end - start).total_seconds(), 1)
@@ -226,6 +321,8 @@ class TestRatingRepo:  # pragma: no cover
             repo = RatingRepo(database=db)
             df = repo.sample(n=2, category_id=CATEGORY_ID)
             assert df.shape[0] == 2
+            assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+            assert pd.api.types.is_datetime64_any_dtype(df["extracted"])
         # ---------------------------------------------------------------------------------------- #
         end = datetime.now()
         duration = round((end - start).total_seconds(), 1)
@@ -446,3 +543,178 @@ class TestRatingRepo:  # pragma: no cover
             )
         )
         logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_upsert(self, container, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        t0 = datetime(2023, 8, 1, 12)
+        t1 = t0 + timedelta(days=10)
+        with container.data.db() as db:
+            repo = RatingRepo(database=db)
+            repo.delete_all()
+            repo.load(data=ratings_df(ratings=[10, 20, 30], extracted=t0))
+            repo.save()
+            changed = repo.upsert(data=ratings_df(ratings=[10, 25, 30], extracted=t1))
+            repo.save()
+            # Only the app whose counts changed is rewritten.
+            assert changed["id"].astype(str).tolist() == ["2"]
+            df = repo.getall().set_index("id")
+            assert len(df) == 3
+            assert df.loc["2", "ratings"] == 25
+            assert df.loc["1", "ratings"] == 10
+            assert df.loc["3", "ratings"] == 30
+            # The unchanged apps only have their extraction time bumped.
+            extracted = repo.get_extracted(category_id=CATEGORY_ID)
+            assert all(extracted[id] == t1 for id in ("1", "2", "3"))
+            repo.delete_all()
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\n\tCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    @pytest.mark.asyncio
+    async def test_refresh(self, container, appdata_repo, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        now = datetime.now().replace(microsecond=0)
+        apps = ratings_df(ratings=[10, 20, 30, 40], extracted=now)
+        appdata_repo.load(data=apps[["id", "name", "category_id", "category", "rating", "ratings"]])
+        with container.data.db() as db:
+            repo = RatingRepo(database=db)
+            history = RatingHistoryRepo(database=db)
+            repo.delete_all()
+            history.delete_all()
+            # Apps '1' and '2' were rated 60 days ago, and apps '3' and '4' yesterday.
+            stale, fresh = now - timedelta(days=60), now - timedelta(days=1)
+            extracted = [stale, stale, fresh, fresh]
+            repo.load(data=ratings_df(ratings=[10, 20, 30, 40], extracted=extracted))
+            repo.save()
+
+        controller = RatingController(
+            scraper=RefreshScraper, uow=container.data.uow(), session_handler=NullSession()
+        )
+        apps = controller._get_stale_apps(category_id=CATEGORY_ID, max_age=30)
+        assert sorted(apps["id"].astype(str)) == ["1", "2"]
+
+        await controller.refresh(category_ids=[CATEGORY_ID], max_age=30)
+
+        with container.data.db() as db:
+            repo = RatingRepo(database=db)
+            history = RatingHistoryRepo(database=db)
+            # A history row is written for every refreshed app, changed or not.
+            assert sorted(history.getall()["id"].astype(str)) == ["1", "2"]
+            # Only app '1' changed, and no app is stale any longer.
+            df = repo.getall().set_index("id")
+            assert len(df) == 4
+            assert df.loc["1", "ratings"] == 15
+            assert df.loc["2", "ratings"] == 20
+        assert len(controller._get_stale_apps(category_id=CATEGORY_ID, max_age=30)) == 0
+        appdata_repo.delete_all()
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\n\tCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_get_velocity(self, container, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        t0 = datetime(2023, 8, 1, 12)
+        day = timedelta(days=1)
+        snapshots = pd.concat(
+            [
+                # App '1' gains 40 ratings and 4 reviews over 4 days.
+                ratings_df(ratings=[10], extracted=t0, ids=["1"]),
+                ratings_df(ratings=[30], extracted=t0 + 2 * day, ids=["1"]),
+                ratings_df(ratings=[50], extracted=t0 + 4 * day, ids=["1"]),
+                # App '2' gains nothing over 5 days.
+                ratings_df(ratings=[20], extracted=t0, ids=["2"]),
+                ratings_df(ratings=[20], extracted=t0 + 5 * day, ids=["2"]),
+                # App '3' has two snapshots at the same time, a zero-day span.
+                ratings_df(ratings=[30], extracted=t0, ids=["3"]),
+                ratings_df(ratings=[40], extracted=t0, ids=["3"]),
+            ],
+            ignore_index=True,
+        )
+        with container.data.db() as db:
+            history = RatingHistoryRepo(database=db)
+            history.delete_all()
+            history.load(data=snapshots)
+            history.save()
+
+            velocity = history.get_velocity().set_index("id")
+            assert sorted(velocity.index.astype(str)) == ["1", "2"]
+            assert velocity.loc["1", "days"] == pytest.approx(4)
+            assert velocity.loc["1", "ratings_per_day"] == pytest.approx(10)
+            assert velocity.loc["1", "reviews_per_day"] == pytest.approx(1)
+            assert velocity.loc["2", "ratings_per_day"] == pytest.approx(0)
+
+            # Snapshots before since are ignored, leaving app '2' a single snapshot.
+            velocity = history.get_velocity(since=t0 + day).set_index("id")
+            assert velocity.index.astype(str).tolist() == ["1"]
+            assert velocity.loc["1", "days"] == pytest.approx(2)
+            assert velocity.loc["1", "ratings_per_day"] == pytest.approx(10)
+            history.delete_all()
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\n\tCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
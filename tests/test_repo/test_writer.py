@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Appstore Ratings & Reviews Analysis                                                 #
+# Version    : 0.1.19                                                                              #
+# Python     : 3.10.11                                                                             #
+# Filename   : /tests/test_repo/test_writer.py                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/appstore                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Sunday October 18th 2026 04:48:12 pm                                                #
+# Modified   : Sunday October 18th 2026 04:48:12 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2023 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import time
+from datetime import datetime
+import pytest
+import logging
+
+import numpy as np
+
+from appstore.data.repo.writer import BackgroundWriter
+from appstore.infrastructure.file.io import IOService
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+# ------------------------------------------------------------------------------------------------ #
+FILEPATH = "tests/data/repo/testdata/rating.pkl"
+
+
+@pytest.mark.repo
+@pytest.mark.writer
+class TestBackgroundWriter:  # pragma: no cover
+    # ============================================================================================ #
+    def test_load_flush(self, container, rating_repo, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        df = IOService.read(filepath=FILEPATH)
+        chunks = np.array_split(df, 10)
+        with BackgroundWriter(uow=container.data.writer_uow(), batch_rows=len(df) // 2) as writer:
+            for chunk in chunks:
+                writer.load(repo="rating_repo", data=chunk)
+            writer.flush()
+            assert writer.rows == len(df)
+            assert writer.batches < len(chunks)
+            assert rating_repo.count() == len(df)
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_error(self, container, rating_repo, caplog):
+        start = datetime.now()
+        logger.info(
+            "\n\nStarted {} {} at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                start.strftime("%I:%M:%S %p"),
+                start.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        df = IOService.read(filepath=FILEPATH)
+        chunks = np.array_split(df, 10)
+        # A column the table does not have fails the first batch.
+        chunks[0] = chunks[0].assign(unknown=1)
+        writer = BackgroundWriter(uow=container.data.writer_uow(), batch_rows=1)
+        writer.start()
+        # Loads raise the exception once the failed batch has been written.
+        with pytest.raises(Exception):
+            for chunk in chunks:
+                writer.load(repo="rating_repo", data=chunk)
+                time.sleep(0.5)
+        # Nothing is committed after the failure, and the failed batch is held, not skipped.
+        assert writer.batches == 0
+        assert rating_repo.count() == 0
+        writer.close(raise_error=False)
+        assert rating_repo.count() == 0
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            "\nCompleted {} {} in {} seconds at {} on {}".format(
+                self.__class__.__name__,
+                inspect.stack()[0][3],
+                duration,
+                end.strftime("%I:%M:%S %p"),
+                end.strftime("%m/%d/%Y"),
+            )
+        )
+        logger.info(single_line)